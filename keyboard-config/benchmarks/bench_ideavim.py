@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the IdeaVim mapping scanner against the previous line-by-line parser.
+
+Generates a synthetic .ideavimrc (comments, settings, leader changes and map
+commands in every mode, some with <silent>/<buffer> flags) and times both
+the original two-pattern ``re.match`` loop and
+``keyboard_config.ideavim.iter_mappings`` over it. The speedup column is
+the legacy time over the scanner time on the same input; on the
+legacy-style input both find the same mappings.
+
+Usage:
+    python benchmarks/bench_ideavim.py [--lines 100000] [--repeat 5]
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.ideavim import iter_mappings
+
+MAP_COMMANDS = ['map', 'nmap', 'vmap', 'xmap', 'omap', 'imap', 'smap',
+                'noremap', 'nnoremap', 'vnoremap', 'xnoremap', 'onoremap', 'inoremap']
+FLAGS = ['', '', '', '<silent> ', '<buffer> ', '<silent><buffer> ']
+# What the previous parser understood: no flags, no x/o/s modes
+LEGACY_MAP_COMMANDS = ['map', 'nmap', 'vmap', 'imap', 'noremap', 'nnoremap', 'vnoremap', 'inoremap']
+KEYS = 'abcdefghijklmnopqrstuvwxyz'
+OTHER_LINES = [
+    '" Comment describing the next mapping',
+    'set incsearch',
+    'set clipboard+=unnamed',
+    'let g:WhichKey_FontSize = 14',
+    '',
+]
+
+def legacy_parse(lines):
+    """The original parse_ideavim_config loop, kept for comparison."""
+    bindings = []
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        mapping_patterns = [
+            r'^(map|nmap|vmap|imap|nnoremap|vnoremap|inoremap)\s+(\S+)\s+(.+)$',
+            r'^(noremap)\s+(\S+)\s+(.+)$'
+        ]
+        for pattern in mapping_patterns:
+            match = re.match(pattern, line)
+            if match:
+                map_type, key_combo, action = match.groups()
+                bindings.append((key_combo.lower(), line_num, action.strip(), map_type))
+                break
+    return bindings
+
+def generate_vimrc(output_file: Path, line_count: int, legacy_only: bool = False,
+                   seed: int = 0) -> None:
+    """Write a synthetic vimrc with roughly half of its lines being mappings."""
+    rng = random.Random(seed)
+    commands = LEGACY_MAP_COMMANDS if legacy_only else MAP_COMMANDS
+    flags = [''] if legacy_only else FLAGS
+    with open(output_file, 'w') as f:
+        f.write("let mapleader = ' '\n")
+        for i in range(1, line_count):
+            if i % 5000 == 0:
+                f.write(rng.choice(["let mapleader = ','\n", "let mapleader = ' '\n"]))
+            elif rng.random() < 0.5:
+                lhs = ''.join(rng.choice(KEYS) for _ in range(rng.randint(1, 3)))
+                if rng.random() < 0.4:
+                    lhs = '<leader>' + lhs
+                f.write(f"{rng.choice(commands)} {rng.choice(flags)}{lhs} :action Action{i}<CR>\n")
+            else:
+                f.write(rng.choice(OTHER_LINES) + '\n')
+
+def best_time(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the IdeaVim mapping scanner')
+    parser.add_argument('--lines', type=int, default=100_000, help='Synthetic vimrc length (default: 100000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per parser; best time is reported')
+    args = parser.parse_args()
+
+    print(f"Synthetic .ideavimrc: {args.lines} lines")
+    print(f"{'Input':<16} {'Parser':<10} {'Mappings':>10} {'Best (s)':>10} {'Speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, legacy_only in (('legacy commands', True), ('all map modes', False)):
+            vimrc = Path(tmp_dir) / '.ideavimrc'
+            generate_vimrc(vimrc, args.lines, legacy_only)
+
+            def run_legacy():
+                with open(vimrc) as f:
+                    return legacy_parse(f.readlines())
+
+            def run_scanner():
+                with open(vimrc) as f:
+                    return list(iter_mappings(f))
+
+            timings = {}
+            for name, func in (('legacy', run_legacy), ('scanner', run_scanner)):
+                count = len(func())
+                timings[name] = best_time(func, args.repeat)
+                speedup = f"{timings['legacy'] / timings[name]:.2f}x" if name != 'legacy' else ''
+                print(f"{label:<16} {name:<10} {count:>10} {timings[name]:>10.3f} {speedup:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark full vs streaming extraction of Karabiner manipulators.
+
+Builds a synthetic karabiner.json of the requested size by repeating the
+rules from configs/karabiner/karabiner.json across many profiles. It then
+runs ``iter_from_keys`` with each loader in a fresh interpreter and reports
+wall time and peak RSS.
+
+Usage:
+    python benchmarks/bench_karabiner_stream.py [--size-mb 50] [--keep FILE]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SOURCE_CONFIG = PROJECT_ROOT.parent / 'configs' / 'karabiner' / 'karabiner.json'
+
+MEASURE_SCRIPT = '''
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+from pathlib import Path
+from keyboard_config.karabiner import iter_from_keys
+
+started = time.perf_counter()
+count = sum(1 for _ in iter_from_keys(Path(sys.argv[2]), streaming=sys.argv[3] == 'streaming'))
+elapsed = time.perf_counter() - started
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in bytes on macOS and kilobytes on Linux
+max_rss_mb = max_rss / (1 << 20) if sys.platform == 'darwin' else max_rss / 1024
+print(json.dumps({'bindings': count, 'seconds': elapsed, 'peak_rss_mb': max_rss_mb}))
+'''
+
+def write_synthetic_config(output_file: Path, size_mb: float) -> int:
+    """Write a karabiner.json of at least size_mb megabytes; return its profile count."""
+    with open(SOURCE_CONFIG, 'r') as f:
+        source = json.load(f)
+    profile = next(p for p in source['profiles'] if p.get('complex_modifications'))
+    profile_text = json.dumps(profile, indent=2)
+
+    target_bytes = int(size_mb * (1 << 20))
+    written = 0
+    profiles = 0
+    with open(output_file, 'w') as f:
+        f.write('{\n  "global": {"check_for_updates_on_startup": false},\n  "profiles": [\n')
+        while written < target_bytes:
+            if profiles:
+                f.write(',\n')
+            f.write(profile_text)
+            written += len(profile_text)
+            profiles += 1
+        f.write('\n  ]\n}\n')
+    return profiles
+
+def measure(config_file: Path, mode: str) -> dict:
+    """Run one extraction in a fresh interpreter and return its measurements."""
+    result = subprocess.run(
+        [sys.executable, '-c', MEASURE_SCRIPT, str(PROJECT_ROOT), str(config_file), mode],
+        check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark full vs streaming Karabiner parsing')
+    parser.add_argument('--size-mb', type=float, default=50, help='Synthetic file size (default: 50)')
+    parser.add_argument('--keep', type=Path, help='Write the synthetic file here and keep it')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_file = args.keep or Path(tmp_dir) / 'karabiner.json'
+        profiles = write_synthetic_config(config_file, args.size_mb)
+        size_mb = config_file.stat().st_size / (1 << 20)
+        print(f"Synthetic karabiner.json: {size_mb:.1f} MB, {profiles} profiles")
+        print(f"{'Loader':<10} {'Bindings':>10} {'Wall (s)':>10} {'Peak RSS (MB)':>15}")
+        for mode in ('full', 'streaming'):
+            stats = measure(config_file, mode)
+            print(f"{mode:<10} {stats['bindings']:>10} {stats['seconds']:>10.2f} {stats['peak_rss_mb']:>15.1f}")
+
+if __name__ == '__main__':
+    main()
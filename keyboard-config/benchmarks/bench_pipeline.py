@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark every pipeline stage on synthetic projects of growing size.
+
+For each size a synthetic project is generated with ``synthetic.py`` and
+the stages run in order:
+
+    load        parse the YAML corpus (no cache, serial)
+    model       build the BindingSet
+    markdown    generate_multi_config_markdown
+    csv         export_bindings (CSV, TSV, summary and pivot in one pass)
+    conflicts   find_conflicts over YAML, karabiner.json and .ideavimrc
+
+Each stage is timed (best of ``--repeat``) without tracing. It then runs
+once more under ``tracemalloc`` to record its peak allocation. Results are
+written as JSON. With ``--baseline``, stage times are compared against an
+earlier results file. The script exits with status 1 when a stage is slower
+than the baseline by more than ``--threshold`` and by more than
+``--min-slowdown`` seconds; the absolute floor keeps timer noise on stages
+that take a few milliseconds from failing the run.
+
+``benchmarks/baseline.json`` is the committed baseline (sizes 1000 and
+10000). Timings only compare on similar machines: regenerate it with
+``--output benchmarks/baseline.json`` on the machine that runs the check
+when that machine changes.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 1000 10000 100000] [--repeat 5]
+        [--output results.json] [--baseline benchmarks/baseline.json] [--threshold 0.2]
+        [--min-slowdown 0.05]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.cache import BindingCache
+from keyboard_config.conflicts import find_conflicts
+from keyboard_config.corpus import discover_yaml_files, load_corpus
+from keyboard_config.csv_export import export_bindings
+from keyboard_config.docs import generate_multi_config_markdown
+from keyboard_config.loader import yaml_backend
+from keyboard_config.model import BindingSet
+
+from synthetic import generate_project
+
+RESULTS_VERSION = 1
+STAGES = ('load', 'model', 'markdown', 'csv', 'conflicts')
+
+def run_stages(project_dir: Path, output_dir: Path) -> Dict[str, Callable[[], Any]]:
+    """Stage callables for one project; later stages use the output of earlier ones."""
+    state: Dict[str, Any] = {}
+    yaml_files = discover_yaml_files(project_dir / 'keyboard-config' / 'data')
+
+    def load():
+        cache = BindingCache(output_dir, enabled=False)
+        state['documents'] = [(item.path, item.data) for item in load_corpus(yaml_files, cache, jobs=1)]
+
+    def model():
+        state['binding_set'] = BindingSet.from_documents(state['documents'])
+
+    def markdown():
+        return generate_multi_config_markdown(state['binding_set'])
+
+    def csv():
+        return export_bindings(state['binding_set'].configs, output_dir / 'bindings.csv',
+                               output_dir / 'bindings.tsv', output_dir / 'bindings-summary.csv',
+                               output_dir / 'bindings-pivot.csv')
+
+    def conflicts():
+        return find_conflicts(project_dir)
+
+    return {'load': load, 'model': model, 'markdown': markdown, 'csv': csv, 'conflicts': conflicts}
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def peak_memory_mb(func: Callable[[], Any]) -> float:
+    """Peak Python allocation while func runs, in MB."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1 << 20)
+
+def benchmark_size(bindings: int, repeat: int, per_file: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        project_dir = Path(tmp_dir) / 'project'
+        output_dir = Path(tmp_dir) / 'out'
+        output_dir.mkdir()
+        generate_project(project_dir, bindings, per_file)
+        # find_conflicts logs under the project it checks
+        os.environ['CLAUDE_PROJECT_DIR'] = str(project_dir)
+
+        stages = run_stages(project_dir, output_dir)
+        results = {}
+        for name in STAGES:
+            seconds = best_time(stages[name], repeat)
+            results[name] = {'seconds': seconds, 'peak_mb': peak_memory_mb(stages[name])}
+        return results
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            min_slowdown: float = 0.05) -> List[str]:
+    """Return a line for every stage slower than the baseline by more than threshold and min_slowdown seconds."""
+    regressions = []
+    for size, stages in results['sizes'].items():
+        for name, stats in stages.items():
+            previous = baseline.get('sizes', {}).get(size, {}).get(name)
+            if not previous or not previous['seconds']:
+                continue
+            ratio = stats['seconds'] / previous['seconds']
+            if ratio > 1 + threshold and stats['seconds'] - previous['seconds'] > min_slowdown:
+                regressions.append(f"{name} @ {size} bindings: {previous['seconds']:.3f}s -> "
+                                   f"{stats['seconds']:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the docs, CSV and conflict pipelines')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='Bindings per source to generate (default: 1000 10000 100000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per stage; best time is reported (default: 5)')
+    parser.add_argument('--per-file', type=int, default=200, help='Bindings per YAML file (default: 200)')
+    parser.add_argument('--output', type=Path, help='Write the JSON results here')
+    parser.add_argument('--baseline', type=Path, help='Earlier results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown over the baseline as a fraction (default: 0.2)')
+    parser.add_argument('--min-slowdown', type=float, default=0.05,
+                        help='Slowdowns up to this many seconds are noise (default: 0.05)')
+    args = parser.parse_args()
+
+    results = {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'yaml_backend': yaml_backend(),
+        'repeat': args.repeat,
+        'sizes': {},
+    }
+    print(f"{'Bindings':>10} {'Stage':<10} {'Best (s)':>10} {'Peak (MB)':>10}")
+    for size in args.sizes:
+        stages = benchmark_size(size, args.repeat, args.per_file)
+        results['sizes'][str(size)] = stages
+        for name, stats in stages.items():
+            print(f"{size:>10} {name:<10} {stats['seconds']:>10.3f} {stats['peak_mb']:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_slowdown)
+        limit = f"{args.threshold:.0%} and {args.min_slowdown * 1000:.0f} ms"
+        if regressions:
+            print(f"\nSlower than {args.baseline} by more than {limit}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo stage slower than {args.baseline} by more than {limit}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline Karabiner event replay.
+
+Generates a synthetic typing stream: keys drawn by English key frequency,
+held 40-140 ms, with Hyper (caps_lock) chords and semicolon-layer presses
+mixed in. It replays the stream through ``Simulator`` with the given
+karabiner.json and with an empty profile (every key passes through). It
+reports events per second, best of ``--repeat``, for the replay alone, for
+loading plus replay of a binary column file and for parsing plus replay of
+the text event file. Before timing, the simultaneous cases in
+``SIMULTANEOUS_CASES`` are replayed and must post what they expect.
+
+The replay and column file cases must reach ``--target`` events per second
+(default: 1,000,000, the rate replaying weeks of typing in CI needs);
+otherwise the script exits with status 1. The text case is informational:
+recordings meant for CI are converted once with
+``simulate-karabiner.py --save-columns``.
+
+Usage:
+    python benchmarks/bench_simulator.py [--events 1000000] [--config FILE] [--repeat 5]
+        [--target 1000000] [--keep FILE]
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.karabiner import select_profile
+from keyboard_config.karabiner_optimizer import DEFAULT_KEY_FREQUENCIES
+from keyboard_config.simulator import (InputEvent, Simulator, event_columns, parse_events, read_event_columns,
+                                       write_event_columns)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SOURCE_CONFIG = PROJECT_ROOT.parent / 'configs' / 'karabiner' / 'karabiner.json'
+
+HYPER_KEYS = ['h', 'j', 'k', 'l', 'u', 'i', 'o', 'n', 'm']
+SEMICOLON_KEYS = ['d', 'f', 'e', 'r', 'c', 'v']
+
+def simultaneous(keys: str, to: str) -> Dict[str, Any]:
+    return {'type': 'basic', 'from': {'simultaneous': [{'key_code': key} for key in keys]},
+            'to': [{'key_code': to}]}
+
+# [s,d,f] is evaluated first, so d,f must wait for s instead of firing [d,f]
+HOME_ROW_RULES = [{'description': 'Home row modifiers',
+                   'manipulators': [simultaneous('sdf', 'left_command'), simultaneous('df', 'left_option')]}]
+
+# (rules, input events, expected (time, kind, value) of the posted events)
+SIMULTANEOUS_CASES = [
+    (HOME_ROW_RULES, [(0, 'down', 'd'), (10, 'down', 'f'), (20, 'down', 's'), (90, 'up', 's')],
+     [(20, 'down', 'left_command'), (90, 'up', 'left_command')]),
+    (HOME_ROW_RULES, [(0, 'down', 'd'), (10, 'down', 'f'), (30, 'down', 'j'), (90, 'up', 'd')],
+     [(30, 'down', 'left_option'), (30, 'down', 'j'), (90, 'up', 'left_option')]),
+    (HOME_ROW_RULES, [(0, 'down', 'd'), (10, 'down', 'f'), (200, 'up', 'f')],
+     [(50, 'down', 'left_option'), (200, 'up', 'left_option')]),
+    (HOME_ROW_RULES, [(0, 'down', 'd'), (100, 'up', 'd')],
+     [(0, 'down', 'd'), (100, 'up', 'd')]),
+]
+
+def check_simultaneous() -> List[str]:
+    """Descriptions of the SIMULTANEOUS_CASES that post something else than expected."""
+    failures = []
+    for rules, events, expected in SIMULTANEOUS_CASES:
+        posted = [event[:3] for event in Simulator(rules).run(InputEvent(*event) for event in events)]
+        if posted != expected:
+            failures.append(f"{events}: expected {expected}, got {posted}")
+    return failures
+
+def generate_events(count: int, seed: int = 0) -> List[InputEvent]:
+    """About ``count`` events of synthetic typing, in time order."""
+    rng = random.Random(seed)
+    keys = list(DEFAULT_KEY_FREQUENCIES)
+    weights = list(DEFAULT_KEY_FREQUENCIES.values())
+    events: List[InputEvent] = []
+    now = 0
+
+    def tap(key: str) -> None:
+        nonlocal now
+        events.append(InputEvent(now, 'down', key))
+        now += rng.randint(40, 140)
+        events.append(InputEvent(now, 'up', key))
+        now += rng.randint(20, 120)
+
+    while len(events) < count:
+        roll = rng.random()
+        if roll < 0.03:
+            layer, layer_keys = ('caps_lock', HYPER_KEYS) if roll < 0.02 else ('semicolon', SEMICOLON_KEYS)
+            events.append(InputEvent(now, 'down', layer))
+            now += rng.randint(60, 150)
+            for _ in range(rng.randint(1, 4)):
+                tap(rng.choice(layer_keys))
+            events.append(InputEvent(now, 'up', layer))
+            now += rng.randint(50, 200)
+        else:
+            tap(rng.choices(keys, weights)[0])
+    return events
+
+def best_rate(func: Callable[[], object], events: int, repeat: int) -> float:
+    """Best input events per second over ``repeat`` runs of func."""
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = max(best, events / (time.perf_counter() - started))
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offline Karabiner event replay')
+    parser.add_argument('--events', type=int, default=1_000_000, help='Input events (default: 1000000)')
+    parser.add_argument('--config', type=Path, default=SOURCE_CONFIG, help='karabiner.json to replay through')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case; the best is reported')
+    parser.add_argument('--target', type=float, default=1_000_000,
+                        help='Events/s the replay and column file cases must reach (default: 1000000)')
+    parser.add_argument('--keep', type=Path, help='Write the synthetic event file here')
+    args = parser.parse_args()
+
+    failures = check_simultaneous()
+    if failures:
+        print('\n'.join(f"Simultaneous check failed: {failure}" for failure in failures), file=sys.stderr)
+        sys.exit(1)
+
+    with open(args.config, 'r') as f:
+        profile = select_profile(json.load(f))
+    events = generate_events(args.events)
+    text = ''.join(f"{event.time} {event.kind} {event.value}\n" for event in events)
+    if args.keep:
+        args.keep.write_text(text)
+
+    columns = event_columns(events)
+    binary = io.BytesIO()
+    write_event_columns(columns, binary)
+    data = binary.getvalue()
+
+    cases = {
+        'passthrough': lambda: Simulator([]).run(columns),
+        'replay': lambda: Simulator.from_profile(profile).run(columns),
+        'columns+replay': lambda: Simulator.from_profile(profile).run(read_event_columns(data)),
+        'parse+replay': lambda: Simulator.from_profile(profile).run(parse_events(io.StringIO(text))),
+    }
+    gated = ('replay', 'columns+replay')
+    posted = len(Simulator.from_profile(profile).run(events))
+    print(f"{len(events)} input events, {posted} posted through {args.config.name}")
+    print(f"{'Case':<16} {'Events/s':>12}")
+    slow = []
+    for name, func in cases.items():
+        rate = best_rate(func, len(events), args.repeat)
+        below = name in gated and rate < args.target
+        print(f"{name:<16} {rate:>12,.0f}{'  below target' if below else ''}")
+        if below:
+            slow.append(name)
+    if slow:
+        print(f"Below the target of {args.target:,.0f} events/s: {', '.join(slow)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic keyboard-config project for benchmarks.
+
+The YAML data files are built from the vocabularies and limits in
+data/schemas/binding-schema.yaml (enums, patterns, lengths, timing range),
+so the files stay schema-valid when the schema changes. The
+tree also gets a karabiner.json with one manipulator per binding and an
+.ideavimrc with about as many mappings, laid out like the real repo so
+``find_conflicts`` discovers them:
+
+    <out>/keyboard-config/data/*.yaml
+    <out>/configs/karabiner/karabiner.json
+    <out>/configs/idea-vim/.ideavimrc
+
+Usage:
+    python benchmarks/synthetic.py OUT_DIR [--bindings 10000] [--per-file 200] [--seed 0]
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.loader import load_yaml
+
+from bench_ideavim import generate_vimrc
+
+DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_FILE = PROJECT_ROOT / 'data' / 'schemas' / 'binding-schema.yaml'
+
+MODIFIERS = ['shift', 'ctrl', 'alt', 'cmd']
+MODIFIER_SYMBOLS = {'shift': '⇧', 'ctrl': '⌃', 'alt': '⌥', 'cmd': '⌘'}
+KARABINER_MODIFIERS = ['left_shift', 'left_control', 'left_option', 'left_command',
+                       'right_command', 'shift', 'command']
+CONFIG_FILES = ['karabiner.json', 'ideavimrc.vim', 'keymap.xml']
+WORDS = ['move', 'select', 'jump', 'scroll', 'toggle', 'split', 'focus', 'expand',
+         'collapse', 'next', 'previous', 'word', 'line', 'block', 'tab', 'window']
+
+class SchemaVocabulary:
+    """The values and limits of binding-schema.yaml that the generator draws from."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        properties = schema['properties']
+        binding = properties['bindings']['additionalProperties']['properties']
+        details = binding['details']['properties']
+
+        self.navigation_types = properties['navigation_type']['enum']
+        self.max_keys = properties['keys']['maxItems']
+        self.description_min = properties['description']['minLength']
+        self.systems = binding['system']['enum']
+        self.statuses = binding['status']['enum']
+        self.categories = binding['category']['enum']
+        self.action_min = binding['action']['minLength']
+        self.sequence_types = details['sequence_type']['enum']
+        self.press_types = details['press_type']['enum']
+        self.timing_range = (details['timing_ms']['minimum'], details['timing_ms']['maximum'])
+
+        key_re = re.compile(properties['keys']['items']['pattern'])
+        keystroke_re = re.compile(binding['keystroke']['pattern'])
+        reference_re = re.compile(details['config_reference']['pattern'])
+        chord_key_re = re.compile(details['chord_keys']['items']['pattern'])
+        # Letters that are valid keys and can be spelled in a keystroke with every modifier symbol
+        self.keys = [
+            letter for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+            if key_re.match(letter) and keystroke_re.match(''.join(MODIFIER_SYMBOLS.values()) + letter)
+        ]
+        self.chord_keys = [letter for letter in self.keys if chord_key_re.match(letter)]
+        if len(self.keys) < 2 or not reference_re.match('karabiner.json:L1'):
+            raise ValueError(f"{SCHEMA_FILE} no longer accepts the synthetic keys or references")
+
+def load_vocabulary(schema_file: Path = SCHEMA_FILE) -> SchemaVocabulary:
+    with open(schema_file, 'rb') as f:
+        return SchemaVocabulary(load_yaml(f))
+
+def modifier_combinations() -> List[List[str]]:
+    """Every modifier subset, smallest first; 'none' is the empty one."""
+    return [list(combo) for size in range(len(MODIFIERS) + 1)
+            for combo in itertools.combinations(MODIFIERS, size)]
+
+def synthetic_document(vocab: SchemaVocabulary, rng: random.Random, file_index: int,
+                       binding_count: int) -> Dict[str, Any]:
+    """One data file: plain modifier chords first, then leader and timed bindings."""
+    keys = rng.sample(vocab.keys, 2)
+    combos = modifier_combinations()
+    bindings = {}
+    for index in range(binding_count):
+        details = {
+            'ide_action_id': f"SyntheticAction{file_index}_{index}",
+            'karabiner_code': '-',
+            'ideavim_command': '-',
+            'config_reference': f"{rng.choice(CONFIG_FILES)}:L{rng.randint(1, 999)}",
+        }
+        if index < len(combos):
+            modifiers = combos[index]
+            binding_key = '_'.join(modifiers) or 'none'
+            symbols = ''.join(MODIFIER_SYMBOLS[name] for name in modifiers)
+            keystroke = f"{symbols}{keys[0]} / {symbols}{keys[1]}"
+            category = rng.choice(['navigation', 'selection', 'window'])
+            details['karabiner_code'] = '+'.join(modifiers + [keys[0].lower()])
+        elif index % 3:
+            binding_key = f"leader_{index}"
+            sequence = ''.join(rng.choice('hjklgd') for _ in range(rng.randint(1, 3)))
+            keystroke = f"Leader {keys[0]}"
+            category = 'leader'
+            details['ideavim_command'] = f"<Leader>{sequence}"
+            details['sequence_type'] = 'leader'
+        else:
+            binding_key = f"timed_{index}"
+            keystroke = f"{keys[0]} {keys[0]}"
+            category = 'timing'
+            details['timing_ms'] = rng.randint(*vocab.timing_range)
+            details['sequence_type'] = rng.choice(vocab.sequence_types)
+            details['press_type'] = rng.choice(vocab.press_types)
+            if vocab.chord_keys:
+                details['chord_keys'] = rng.sample(vocab.chord_keys, 1)
+        if rng.random() < 0.3:
+            details['notes'] = ' '.join(rng.choice(WORDS) for _ in range(6))
+
+        action = ' '.join(rng.choice(WORDS) for _ in range(3))
+        bindings[binding_key] = {
+            'keystroke': keystroke,
+            'system': rng.choice(vocab.systems),
+            'status': rng.choice(vocab.statuses),
+            'category': category if category in vocab.categories else rng.choice(vocab.categories),
+            'action': action.ljust(vocab.action_min, '.'),
+            'details': details,
+        }
+
+    description = f"Synthetic bindings for {keys[0]} and {keys[1]}"
+    return {
+        'navigation_type': rng.choice(vocab.navigation_types),
+        'keys': keys[:vocab.max_keys],
+        'description': description.ljust(vocab.description_min, '.'),
+        'bindings': bindings,
+    }
+
+def write_yaml_corpus(data_dir: Path, bindings: int, per_file: int, seed: int = 0) -> int:
+    """Write schema-valid data files holding `bindings` bindings; return the file count."""
+    vocab = load_vocabulary()
+    rng = random.Random(seed)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    files = 0
+    for start in range(0, bindings, per_file):
+        document = synthetic_document(vocab, rng, files, min(per_file, bindings - start))
+        with open(data_dir / f"synthetic-{files:05d}.yaml", 'w', encoding='utf-8') as f:
+            yaml.dump(document, f, Dumper=DUMPER, allow_unicode=True, sort_keys=False)
+        files += 1
+    return files
+
+def write_karabiner_config(output_file: Path, manipulators: int, per_rule: int = 20, seed: int = 0) -> None:
+    """Write a karabiner.json with one profile holding `manipulators` manipulators."""
+    rng = random.Random(seed)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w') as f:
+        f.write('{\n  "profiles": [{"name": "Synthetic", "complex_modifications": {"rules": [\n')
+        for rule_index, start in enumerate(range(0, manipulators, per_rule)):
+            rule_manipulators = []
+            for _ in range(min(per_rule, manipulators - start)):
+                from_key = {'key_code': rng.choice('abcdefghijklmnopqrstuvwxyz')}
+                modifiers = {'mandatory': rng.sample(KARABINER_MODIFIERS, rng.randint(0, 2))}
+                if rng.random() < 0.05:
+                    modifiers['optional'] = ['any']
+                from_key['modifiers'] = modifiers
+                rule_manipulators.append({
+                    'type': 'basic',
+                    'from': from_key,
+                    'to': [{'key_code': rng.choice(['left_arrow', 'right_arrow', 'up_arrow', 'down_arrow'])}],
+                })
+            if rule_index:
+                f.write(',\n')
+            json.dump({'description': f"Synthetic rule {rule_index}", 'manipulators': rule_manipulators}, f)
+        f.write('\n  ]}}]\n}\n')
+
+def generate_project(out_dir: Path, bindings: int, per_file: int = 200, seed: int = 0) -> Dict[str, Path]:
+    """Write a full synthetic project tree; return the paths of its parts."""
+    paths = {
+        'data': out_dir / 'keyboard-config' / 'data',
+        'karabiner': out_dir / 'configs' / 'karabiner' / 'karabiner.json',
+        'ideavim': out_dir / 'configs' / 'idea-vim' / '.ideavimrc',
+    }
+    write_yaml_corpus(paths['data'], bindings, per_file, seed)
+    write_karabiner_config(paths['karabiner'], bindings, seed=seed)
+    paths['ideavim'].parent.mkdir(parents=True, exist_ok=True)
+    # About half of the generated vimrc lines are mappings
+    generate_vimrc(paths['ideavim'], 2 * bindings, seed=seed)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic keyboard-config project')
+    parser.add_argument('out_dir', type=Path, help='Directory to write the project tree into')
+    parser.add_argument('--bindings', type=int, default=10_000, help='Bindings per source (default: 10000)')
+    parser.add_argument('--per-file', type=int, default=200, help='Bindings per YAML file (default: 200)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    paths = generate_project(args.out_dir, args.bindings, args.per_file, args.seed)
+    for name, path in paths.items():
+        print(f"{name:<10} {path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/bin/bash
+
+# JSON-line logging for the shell hooks, with the same fields and size-based
+# rotation as keyboard_config/hooklog.py. Times have second resolution (the
+# Python writer adds milliseconds). Works with the bash 3.2 macOS ships.
+# Usage: HOOK_LOG_FILE=...; source hooklog.sh; hook_log <level> <message> [duration_ms]
+
+HOOK_LOG_MAX_BYTES=1048576
+HOOK_LOG_BACKUP_COUNT=3
+
+# Sets HOOK_JSON to the escaped string, without a command substitution fork
+hook_json_escape() {
+    local s="$1"
+    s=${s//\\/\\\\}
+    s=${s//\"/\\\"}
+    s=${s//$'\n'/\\n}
+    s=${s//$'\r'/\\r}
+    s=${s//$'\t'/\\t}
+    HOOK_JSON=$s
+}
+
+hook_log_rotate() {
+    local size i
+    [[ -f "$HOOK_LOG_FILE" ]] || return 0
+    size=$(wc -c < "$HOOK_LOG_FILE")
+    if (( size > HOOK_LOG_MAX_BYTES )); then
+        for (( i = HOOK_LOG_BACKUP_COUNT - 1; i > 0; i-- )); do
+            [[ -f "$HOOK_LOG_FILE.$i" ]] && mv -f "$HOOK_LOG_FILE.$i" "$HOOK_LOG_FILE.$((i + 1))"
+        done
+        mv -f "$HOOK_LOG_FILE" "$HOOK_LOG_FILE.1"
+    fi
+}
+
+hook_log() {
+    local level="$1" message="$2" duration_ms="$3" record
+    hook_json_escape "$message"
+    record="{\"time\": \"$(date '+%Y-%m-%dT%H:%M:%S')\", \"message\": \"$HOOK_JSON\", \"level\": \"$level\""
+    if [[ -n "$duration_ms" ]]; then
+        record="$record, \"duration_ms\": $duration_ms"
+    fi
+    printf '%s}\n' "$record" >&9
+}
+
+# Rotate and open the log once per hook run; hook_log writes through fd 9
+mkdir -p "${HOOK_LOG_FILE%/*}"
+hook_log_rotate
+exec 9>>"$HOOK_LOG_FILE"
@@ -1,85 +1,96 @@
 #!/bin/bash
 
 # YAML Validation Hook for Keyboard Config Project
-# Usage: validate-yaml.sh <file_path>
+# Usage: validate-yaml.sh <file_path>...
+#
+# Every file is syntax-checked; files under keyboard-config/data/ (except the
+# schemas) are also validated against data/schemas/binding-schema.yaml. All
+# files are checked in one Python process and every violation is reported.
+#
+# Environment:
+#   YAML_VALIDATION_JOBS   worker processes for large batches (1 = serial)
+#   YAML_VALIDATION_CACHE  set to 0 to re-validate files that passed before
 
 set -e
 
-YAML_FILE="$1"
-# Convert to absolute path if relative
-if [[ ! "$YAML_FILE" == /* ]]; then
-    YAML_FILE="$(pwd)/$YAML_FILE"
-fi
 PROJECT_DIR="${CLAUDE_PROJECT_DIR:-$(cd "$(dirname "$0")/../.." && pwd)}"
-LOG_FILE="$PROJECT_DIR/.claude/hooks/logs/yaml-validation.log"
+HOOK_LOG_FILE="$PROJECT_DIR/.claude/hooks/logs/yaml-validation.log"
+source "$(dirname "$0")/hooklog.sh"
 
-if [[ -z "$YAML_FILE" ]]; then
-    echo "Error: No YAML file provided" | tee -a "$LOG_FILE"
+if [[ $# -eq 0 ]]; then
+    echo "Error: No YAML file provided"
+    hook_log error "No YAML file provided"
     exit 1
 fi
 
-echo "[$(date '+%Y-%m-%d %H:%M:%S')] Validating YAML: $YAML_FILE" >> "$LOG_FILE"
-
-# Check if file exists
-if [[ ! -f "$YAML_FILE" ]]; then
-    echo "Error: File does not exist: $YAML_FILE" | tee -a "$LOG_FILE"
-    exit 1
-fi
+YAML_FILES=()
+for YAML_FILE in "$@"; do
+    # Convert to absolute path if relative
+    if [[ ! "$YAML_FILE" == /* ]]; then
+        YAML_FILE="$(pwd)/$YAML_FILE"
+    fi
+    # Check if file exists
+    if [[ ! -f "$YAML_FILE" ]]; then
+        echo "Error: File does not exist: $YAML_FILE"
+        hook_log error "File does not exist: $YAML_FILE"
+        exit 1
+    fi
+    YAML_FILES+=("$YAML_FILE")
+done
 
-# Activate virtual environment and validate YAML syntax  
+# Activate virtual environment; the whole batch is checked by one Python process
 cd "$(dirname "$0")/.."
 source venv/bin/activate
-python3 -c "
-import yaml
+export CLAUDE_PROJECT_DIR="$PROJECT_DIR"
+python3 - "${YAML_FILES[@]}" << 'PYEOF'
+import os
 import sys
-try:
-    with open('$YAML_FILE', 'r') as f:
-        yaml.safe_load(f)
-    print('✓ YAML syntax valid: $YAML_FILE')
-except yaml.YAMLError as e:
-    print(f'✗ YAML syntax error in $YAML_FILE: {e}', file=sys.stderr)
-    sys.exit(1)
-except Exception as e:
-    print(f'✗ Error reading $YAML_FILE: {e}', file=sys.stderr)
-    sys.exit(1)
-" >> "$LOG_FILE" 2>&1
+import time
+from pathlib import Path
 
-# If we're in the keyboard-config directory, also validate schema
-if [[ "$YAML_FILE" == *"keyboard-config/data"* ]]; then
-    echo "Checking keyboard config schema..." >> "$LOG_FILE"
-    
-    # Check for required fields in keyboard config YAML
-    python3 -c "
-import yaml
-import sys
+from keyboard_config.hooklog import get_logger
+from keyboard_config.loader import yaml_backend
+from keyboard_config.schema import (ValidationError, load_schema, validate_content,
+                                    validate_files, validation_cache_file)
+
+log = get_logger('yaml-validation')
+jobs = int(os.environ['YAML_VALIDATION_JOBS']) if os.environ.get('YAML_VALIDATION_JOBS') else None
+cache_file = None
+if os.environ.get('YAML_VALIDATION_CACHE', '1') != '0':
+    cache_file = validation_cache_file(Path(os.environ['CLAUDE_PROJECT_DIR']) / '.claude' / 'hooks' / 'cache')
+
+def is_data_file(path):
+    return 'keyboard-config/data' in str(path) and 'schema' not in path.name.lower()
 
-required_fields = ['bindings']
-binding_required = ['key', 'action', 'status']
+files = [Path(arg) for arg in sys.argv[1:]]
+data_files = [path for path in files if is_data_file(path)]
+failures = {}
+cached = 0
 
+started = time.perf_counter()
 try:
-    with open('$YAML_FILE', 'r') as f:
-        data = yaml.safe_load(f)
-    
-    # Check top-level structure
-    for field in required_fields:
-        if field not in data:
-            print(f'✗ Missing required field: {field}')
-            sys.exit(1)
-    
-    # Check binding structure
-    if isinstance(data.get('bindings'), list):
-        for i, binding in enumerate(data['bindings']):
-            for field in binding_required:
-                if field not in binding:
-                    print(f'✗ Binding {i}: Missing required field: {field}')
-                    sys.exit(1)
-    
-    print('✓ Schema validation passed')
-    
+    # Other YAML only needs to parse; the schema check reports syntax errors itself
+    for path in files:
+        if not is_data_file(path):
+            errors = validate_content(path.read_bytes())
+            if errors:
+                failures[path] = errors
+    if data_files:
+        for result in validate_files(data_files, load_schema(), cache_file, jobs):
+            cached += result.cached
+            if result.errors:
+                failures[result.path] = result.errors
 except Exception as e:
-    print(f'✗ Schema validation error: {e}', file=sys.stderr)
-    sys.exit(1)
-" >> "$LOG_FILE" 2>&1
-fi
+    failures[Path('-')] = [ValidationError('', f"Error reading files: {e}")]
 
-echo "[$(date '+%Y-%m-%d %H:%M:%S')] Validation completed successfully" >> "$LOG_FILE"
\ No newline at end of file
+for path, errors in failures.items():
+    for error in errors:
+        print(f"✗ {path}: {error}", file=sys.stderr)
+        log.log(str(error), level='error', file=str(path))
+log.log("Validated YAML", duration=time.perf_counter() - started, files=len(files),
+        schema_checked=len(data_files), cached=cached,
+        failed=len(failures), backend=yaml_backend())
+if failures:
+    sys.exit(1)
+print(f"✓ {len(files)} YAML file(s) valid")
+PYEOF
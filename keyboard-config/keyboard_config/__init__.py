@@ -0,0 +1,6 @@
+"""
+Shared helpers for the keyboard configuration scripts.
+
+The scripts in ``scripts/`` and the hooks in ``hooks/`` import from this
+package so that loading, caching and parsing logic lives in one place.
+"""
@@ -0,0 +1,87 @@
+"""
+Single-pass aggregation of binding counts.
+
+``BindingAggregate`` counts every summary facet (status, system,
+category, ...) in one sweep over the bindings. Bindings can also be fed
+one at a time with ``add``. The markdown summaries and
+``bindings-summary.csv`` both render from it. ``group_bindings`` counts
+combinations of arbitrary columns (e.g. status × system), so a new report
+does not need a new counting loop.
+
+Usage:
+    python -m keyboard_config.aggregate status system
+"""
+
+import sys
+from collections import Counter
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Sequence
+
+# Binding attributes counted by every aggregate; None and () are not counted
+FACETS = (
+    'navigation_type', 'status', 'system', 'category',
+    'sequence_type', 'timing_ms', 'press_type', 'chord_keys',
+)
+
+_facet_values = attrgetter(*FACETS)
+
+class BindingAggregate:
+    """Per-facet value counts over a set of bindings."""
+    __slots__ = ('total', 'facets', '_counters')
+
+    def __init__(self, bindings: Iterable[Any] = ()):
+        self.total = 0
+        self.facets: Dict[str, Counter] = {facet: Counter() for facet in FACETS}
+        self._counters = tuple(self.facets[facet] for facet in FACETS)
+        for binding in bindings:
+            self.add(binding)
+
+    def add(self, binding: Any) -> None:
+        """Count one binding into every facet."""
+        self.total += 1
+        for counter, value in zip(self._counters, _facet_values(binding)):
+            if value is not None and value != ():
+                counter[value] += 1
+
+    def __getitem__(self, facet: str) -> Counter:
+        return self.facets[facet]
+
+def aggregate_bindings(bindings: Iterable[Any]) -> BindingAggregate:
+    """Count every facet of the given bindings in one pass."""
+    return BindingAggregate(bindings)
+
+def group_bindings(bindings: Iterable[Any], columns: Sequence[str]) -> Counter:
+    """Count bindings by the tuple of values in the given columns."""
+    if not columns:
+        raise ValueError("group_bindings needs at least one column")
+    # attrgetter returns a bare value for a single column; keep keys uniform
+    key = attrgetter(*columns) if len(columns) > 1 else (lambda b, get=attrgetter(columns[0]): (get(b),))
+    try:
+        return Counter(key(binding) for binding in bindings)
+    except AttributeError as e:
+        raise ValueError(f"Unknown binding column: {e.name}") from None
+
+def main():
+    """Print binding counts grouped by the columns named on the command line."""
+    from .corpus import discover_yaml_files, load_yaml_data
+    from .model import BindingSet
+
+    columns = sys.argv[1:] or ['status', 'system']
+    data_dir = Path(__file__).resolve().parent.parent / 'data'
+    yaml_files = discover_yaml_files(data_dir)
+    binding_set = BindingSet.from_documents((path, load_yaml_data(path)) for path in yaml_files)
+
+    try:
+        groups = binding_set.group_by(*columns)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(' | '.join(columns + ['count']))
+    for values, count in sorted(groups.items(), key=lambda item: tuple(map(str, item[0]))):
+        print(' | '.join([str(value) for value in values] + [str(count)]))
+    print(f"Total bindings: {len(binding_set)}")
+
+if __name__ == '__main__':
+    main()
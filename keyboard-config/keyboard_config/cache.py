@@ -0,0 +1,146 @@
+"""
+On-disk cache of parsed YAML binding files.
+
+Parsed documents are pickled into ``generated/.cache`` keyed by file path and
+validated against the file's size, mtime and SHA-256 digest, so an unchanged
+file is never handed to the YAML parser twice.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .loader import load_yaml
+
+CACHE_VERSION = 1
+CACHE_FILE_NAME = 'bindings.pickle'
+
+def default_cache_dir(project_root: Path) -> Path:
+    """Return the cache directory used by the scripts for a project root."""
+    return project_root / 'generated' / '.cache'
+
+def content_digest(content: bytes) -> str:
+    """Return the hex SHA-256 digest of file content."""
+    return hashlib.sha256(content).hexdigest()
+
+def read_pickle(file_path: Path) -> Any:
+    """Load a pickled cache file, returning None if it is missing or unreadable."""
+    try:
+        with open(file_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+
+def write_pickle(file_path: Path, payload: Any) -> None:
+    """Pickle a payload to a cache file atomically; concurrent writers each use their own temp file."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=file_path.parent, prefix=file_path.name + '.',
+                                     suffix='.tmp', delete=False) as f:
+        tmp_file = f.name
+        try:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            f.close()
+            os.unlink(tmp_file)
+            raise
+    os.replace(tmp_file, file_path)
+
+class PendingParse(NamedTuple):
+    """A changed file read by ``BindingCache.lookup``, waiting for its parse."""
+    key: str
+    size: int
+    mtime_ns: int
+    digest: str
+    content: bytes
+
+class BindingCache:
+    """Cache of parsed YAML documents keyed by path, size, mtime and hash."""
+
+    def __init__(self, cache_dir: Path, enabled: bool = True,
+                 parse: Optional[Callable[[bytes], Any]] = None):
+        self.cache_file = cache_dir / CACHE_FILE_NAME
+        self.enabled = enabled
+        self.parse = parse or load_yaml
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = self._read() if enabled else {}
+        self._digests: Dict[str, str] = {}
+        self._dirty = False
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Read cache entries from disk, discarding unreadable or stale caches."""
+        payload = read_pickle(self.cache_file)
+        if not isinstance(payload, dict) or payload.get('version') != CACHE_VERSION:
+            return {}
+        return payload.get('entries', {})
+
+    def load(self, file_path: Path) -> Any:
+        """Return the parsed document for a file, parsing it only when it changed."""
+        data, pending = self.lookup(file_path)
+        if pending is None:
+            return data
+        data = self.parse(pending.content)
+        self.store(pending, data)
+        return data
+
+    def lookup(self, file_path: Path) -> Tuple[Any, Optional['PendingParse']]:
+        """
+        Return (cached document, None) for an unchanged file, or (None, pending)
+        when the file must be parsed. Hand the parse result to ``store``.
+        """
+        key = str(Path(file_path).resolve())
+        stat = os.stat(key)
+        entry = self._entries.get(key)
+
+        # Fast path: size and mtime unchanged, trust the cached parse
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            self.hits += 1
+            self._digests[key] = entry['digest']
+            return entry['data'], None
+
+        with open(key, 'rb') as f:
+            content = f.read()
+        digest = content_digest(content)
+        self._digests[key] = digest
+
+        # File was touched but content is identical: refresh stat, keep parse
+        if entry and entry['digest'] == digest:
+            self.hits += 1
+            entry['size'] = stat.st_size
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._dirty = True
+            return entry['data'], None
+
+        self.misses += 1
+        return None, PendingParse(key, stat.st_size, stat.st_mtime_ns, digest, content)
+
+    def store(self, pending: 'PendingParse', data: Any) -> None:
+        """Record the parse of a file that ``lookup`` reported as changed."""
+        if self.enabled:
+            self._entries[pending.key] = {
+                'size': pending.size,
+                'mtime_ns': pending.mtime_ns,
+                'digest': pending.digest,
+                'data': data,
+            }
+            self._dirty = True
+
+    def digest(self, file_path: Path) -> Optional[str]:
+        """Return the content digest of a file loaded through this cache."""
+        return self._digests.get(str(Path(file_path).resolve()))
+
+    def save(self) -> None:
+        """Persist the cache atomically, dropping entries for deleted files."""
+        if not self.enabled:
+            return
+        for key in [k for k in self._entries if not os.path.exists(k)]:
+            del self._entries[key]
+            self._dirty = True
+        if not self._dirty:
+            return
+
+        write_pickle(self.cache_file, {'version': CACHE_VERSION, 'entries': self._entries})
+        self._dirty = False
@@ -0,0 +1,306 @@
+"""
+Canonical integer encoding of key chords.
+
+Every config system spells the same chord differently: ``cmd`` + ``H`` in the
+YAML data, ``left_command`` + ``h`` in Karabiner, ``meta H`` in WebStorm and
+``<D-h>`` in IdeaVim. The parsers here turn all of them into one ``int``:
+
+    chord = key_id << 24 | modifier mask
+
+Key names use the Karabiner ``key_code`` vocabulary and are interned to
+small integer ids. The modifier mask has one 4-bit nibble per modifier
+family. Each bit of a nibble is a physical state the chord accepts for that
+family: released, left side only, right side only, or both sides. So:
+
+* a generic ``cmd`` accepts left, right or both (``0b1110``);
+* ``left_command`` accepts only the left side (``0b0010``);
+* an absent modifier accepts only released (``0b0001``);
+* a Karabiner ``optional`` modifier adds the released state, and
+  ``optional: ["any"]`` accepts every state of every family.
+
+Two chords collide when they share a key and, for every family, accept at
+least one common state. ``chords_collide`` checks this on the integers
+directly.
+"""
+
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Modifier families in display order; fn and caps_lock have no sides
+FAMILIES = ('alt', 'caps_lock', 'cmd', 'ctrl', 'fn', 'shift')
+FAMILY_SHIFT = {family: 4 * index for index, family in enumerate(FAMILIES)}
+KEY_SHIFT = 4 * len(FAMILIES)
+MODIFIER_MASK = (1 << KEY_SHIFT) - 1
+
+# Per-family accepted physical states
+RELEASED, LEFT, RIGHT, BOTH = 0b0001, 0b0010, 0b0100, 0b1000
+ANY_SIDE = LEFT | RIGHT | BOTH
+ALL_STATES = RELEASED | ANY_SIDE
+
+# A chord with no modifiers accepts only the released state in each family
+NO_MODIFIERS = sum(RELEASED << shift for shift in FAMILY_SHIFT.values())
+# Bit 0 of every nibble, for testing all families at once
+_NIBBLE_LOW_BITS = NO_MODIFIERS
+
+# Modifier spellings of every supported system -> (family, required state)
+MODIFIER_ALIASES: Dict[str, Tuple[str, int]] = {}
+for _family, _names in (
+    ('shift', ('shift',)),
+    ('ctrl', ('ctrl', 'control')),
+    ('alt', ('alt', 'option', 'opt')),
+    ('cmd', ('cmd', 'command', 'meta', 'super', 'gui')),
+):
+    for _name in _names:
+        MODIFIER_ALIASES[_name] = (_family, ANY_SIDE)
+        MODIFIER_ALIASES['left_' + _name] = (_family, LEFT)
+        MODIFIER_ALIASES['right_' + _name] = (_family, RIGHT)
+MODIFIER_ALIASES.update({
+    'fn': ('fn', ANY_SIDE),
+    'caps_lock': ('caps_lock', ANY_SIDE),
+    'altgraph': ('alt', RIGHT),
+    'hyper': ('hyper', RIGHT),
+})
+# Hyper (caps_lock held, see karabiner.json) is right cmd+ctrl+option+shift
+HYPER_FAMILIES = ('alt', 'cmd', 'ctrl', 'shift')
+
+# Key names of the other systems -> Karabiner key_code
+KEY_ALIASES = {
+    'space': 'spacebar', 'enter': 'return_or_enter', 'return': 'return_or_enter', 'cr': 'return_or_enter',
+    'esc': 'escape', 'escape': 'escape', 'tab': 'tab',
+    'bs': 'delete_or_backspace', 'backspace': 'delete_or_backspace', 'back_space': 'delete_or_backspace',
+    'del': 'delete_forward', 'delete': 'delete_forward',
+    'left': 'left_arrow', 'right': 'right_arrow', 'up': 'up_arrow', 'down': 'down_arrow',
+    'pageup': 'page_up', 'pagedown': 'page_down',
+    'minus': 'hyphen', 'equals': 'equal_sign', 'back_slash': 'backslash', 'bslash': 'backslash',
+    'back_quote': 'grave_accent_and_tilde',
+}
+
+# Characters and the (key_code, shifted) pair that types them on a US layout
+CHARACTER_KEYS: Dict[str, Tuple[str, bool]] = {}
+for _char in 'abcdefghijklmnopqrstuvwxyz':
+    CHARACTER_KEYS[_char] = (_char, False)
+    CHARACTER_KEYS[_char.upper()] = (_char, True)
+for _unshifted, _shifted, _key_code in zip(
+        "1234567890-=[]\\;',./`", '!@#$%^&*()_+{}|:"<>?~',
+        ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0', 'hyphen', 'equal_sign',
+         'open_bracket', 'close_bracket', 'backslash', 'semicolon', 'quote',
+         'comma', 'period', 'slash', 'grave_accent_and_tilde']):
+    CHARACTER_KEYS[_unshifted] = (_key_code, False)
+    CHARACTER_KEYS[_shifted] = (_key_code, True)
+CHARACTER_KEYS[' '] = ('spacebar', False)
+
+_key_ids: Dict[str, int] = {}
+_key_names: List[str] = []
+
+def key_id(name: str) -> int:
+    """Return the interned id of a canonical key name, assigning one if new."""
+    key = _key_ids.get(name)
+    if key is None:
+        key = _key_ids[name] = len(_key_names)
+        _key_names.append(sys.intern(name))
+    return key
+
+def key_name(key: int) -> str:
+    return _key_names[key]
+
+def canonical_key(name: str) -> str:
+    """Normalize a key name from any system to its Karabiner key_code."""
+    if name in CHARACTER_KEYS:
+        return CHARACTER_KEYS[name][0]
+    lowered = name.lower()
+    return KEY_ALIASES.get(lowered, lowered)
+
+def make_chord(key: str, modifiers: Iterable[str] = (), optional: Iterable[str] = ()) -> Optional[int]:
+    """
+    Encode a key with mandatory and optional modifier names.
+
+    Returns None when a modifier name is not recognised.
+    """
+    # Large corpora repeat a small set of spellings; encode each one once
+    return _encode_chord(key, tuple(modifiers), tuple(optional))
+
+@lru_cache(maxsize=None)
+def _encode_chord(key: str, modifiers: Tuple[str, ...], optional: Tuple[str, ...]) -> Optional[int]:
+    required: Dict[str, int] = {}
+    for name in modifiers:
+        states = _modifier_states(name)
+        if states is None:
+            return None
+        for family, state in states:
+            previous = required.get(family, state)
+            # A second modifier of the same family means the other side is held too
+            required[family] = state if previous == state else BOTH
+
+    allowed: Dict[str, int] = {}
+    for name in optional:
+        if name.lower() == 'any':
+            allowed = {family: ANY_SIDE for family in FAMILIES}
+            break
+        states = _modifier_states(name)
+        if states is None:
+            return None
+        for family, state in states:
+            allowed[family] = allowed.get(family, 0) | state
+
+    mask = 0
+    for family, shift in FAMILY_SHIFT.items():
+        mask |= _accepted_states(required.get(family, 0), allowed.get(family, 0)) << shift
+    return key_id(canonical_key(key)) << KEY_SHIFT | mask
+
+def _modifier_states(name: str) -> Optional[Tuple[Tuple[str, int], ...]]:
+    alias = MODIFIER_ALIASES.get(name.lower())
+    if alias is None:
+        return None
+    family, state = alias
+    if family == 'hyper':
+        return tuple((hyper_family, state) for hyper_family in HYPER_FAMILIES)
+    return (alias,)
+
+def _accepted_states(required: int, optional: int) -> int:
+    """Physical states of one family that satisfy a requirement plus optional sides."""
+    # Sides (bit 0 left, bit 1 right) that may be held beyond the required ones
+    optional_sides = (1 if optional & LEFT else 0) | (2 if optional & RIGHT else 0)
+    if required == 0:
+        base = [0]
+    elif required == ANY_SIDE:
+        base = [1, 2, 3]
+    else:
+        base = [{LEFT: 1, RIGHT: 2, BOTH: 3}[required]]
+
+    states = 0
+    for sides in base:
+        for extra in (0, 1, 2, 3):
+            if extra & ~optional_sides:
+                continue
+            states |= 1 << (sides | extra)
+    return states
+
+def chords_collide(a: int, b: int) -> bool:
+    """True when some key press triggers both chords."""
+    if a >> KEY_SHIFT != b >> KEY_SHIFT:
+        return False
+    common = a & b & MODIFIER_MASK
+    # Every nibble must keep at least one accepted state
+    return (common | common >> 1 | common >> 2 | common >> 3) & _NIBBLE_LOW_BITS == _NIBBLE_LOW_BITS
+
+def chord_key(chord: int) -> int:
+    return chord >> KEY_SHIFT
+
+def has_optional(chord: int) -> bool:
+    """True when some family accepts both released and held states."""
+    for shift in FAMILY_SHIFT.values():
+        states = chord >> shift & ALL_STATES
+        if states & RELEASED and states != RELEASED:
+            return True
+    return False
+
+def any_side(chord: int) -> int:
+    """The chord with every held modifier widened to either side, e.g. left_cmd+h -> cmd+h."""
+    for shift in FAMILY_SHIFT.values():
+        if chord >> shift & ALL_STATES != RELEASED:
+            chord = chord & ~(ALL_STATES << shift) | ANY_SIDE << shift
+    return chord
+
+@lru_cache(maxsize=None)
+def format_chord(chord: int) -> str:
+    """Readable form of a chord, e.g. 'cmd+h', 'left_cmd+shift+h' or 'h (any modifiers)'."""
+    parts = []
+    optional = []
+    for family in FAMILIES:
+        states = chord >> FAMILY_SHIFT[family] & ALL_STATES
+        if states == RELEASED:
+            continue
+        if states == ALL_STATES:
+            optional.append(family)
+        elif states == ANY_SIDE:
+            parts.append(family)
+        elif states == LEFT:
+            parts.append(f"left_{family}")
+        elif states == RIGHT:
+            parts.append(f"right_{family}")
+        elif states == BOTH:
+            parts.append(f"left_{family}+right_{family}")
+        else:
+            parts.append(f"{family}[{states:04b}]")
+    parts.append(key_name(chord_key(chord)))
+    text = '+'.join(parts)
+    if len(optional) == len(FAMILIES):
+        return f"{text} (any modifiers)"
+    if optional:
+        return f"{text} (optional {', '.join(optional)})"
+    return text
+
+def parse_vim_keys(lhs: str) -> Optional[List[int]]:
+    """
+    Split a Vim key notation string into chords, e.g. '<C-w>h' -> [ctrl+w, h].
+
+    Returns None for notation that does not describe physical keys
+    (``<Plug>``, ``<SID>``, unknown ``<...>`` names).
+    """
+    chords = []
+    index = 0
+    length = len(lhs)
+    while index < length:
+        char = lhs[index]
+        close = lhs.find('>', index + 2) if char == '<' else -1
+        if close == -1:
+            chord = _vim_character(char, ())
+            index += 1
+        else:
+            chord = _vim_special(lhs[index + 1:close])
+            if chord is None:
+                # '<' that does not start a key name is a literal key
+                if '-' in lhs[index + 1:close] or lhs[index + 1:close].isalnum():
+                    return None
+                chord = _vim_character(char, ())
+                index += 1
+            else:
+                index = close + 1
+        if chord is None:
+            return None
+        chords.append(chord)
+    return chords
+
+VIM_MODIFIERS = {'c': 'ctrl', 's': 'shift', 'a': 'alt', 'm': 'alt', 'd': 'cmd'}
+VIM_SPECIAL_KEYS = {'lt': '<', 'bar': '|', 'space': ' ', 'nl': 'enter', 'ins': 'insert'}
+# Named non-character keys, as Karabiner key_codes
+SPECIAL_KEY_CODES = frozenset(KEY_ALIASES.values()) | {'insert', 'home', 'end', 'page_up', 'page_down'}
+
+def _vim_special(name: str) -> Optional[int]:
+    """Encode the inside of a ``<...>`` key notation."""
+    modifiers = []
+    while len(name) > 2 and name[1] == '-' and name[0].lower() in VIM_MODIFIERS:
+        modifiers.append(VIM_MODIFIERS[name[0].lower()])
+        name = name[2:]
+
+    if len(name) == 1:
+        # Control folds case, so <C-H> is <C-h>; with Alt, Meta or Cmd the letter
+        # keeps its case, so <A-J> is alt+shift+j
+        return _vim_character(name.lower() if 'ctrl' in modifiers and name.isalpha() else name, modifiers)
+
+    lowered = name.lower()
+    special = VIM_SPECIAL_KEYS.get(lowered, lowered)
+    if len(special) == 1:
+        return _vim_character(special, modifiers)
+    special = canonical_key(special)
+    if special in SPECIAL_KEY_CODES or _is_function_key(special):
+        return make_chord(special, modifiers)
+    return None
+
+def _vim_character(char: str, modifiers: Iterable[str]) -> Optional[int]:
+    entry = CHARACTER_KEYS.get(char)
+    if entry is None:
+        return None
+    key_code, shifted = entry
+    return make_chord(key_code, list(modifiers) + (['shift'] if shifted else []))
+
+def _is_function_key(name: str) -> bool:
+    return name[0] == 'f' and name[1:].isdigit()
+
+def parse_keystroke(keystroke: str) -> Optional[int]:
+    """Encode a Java/IntelliJ keystroke such as 'meta H' or 'shift control OPEN_BRACKET'."""
+    tokens = [token for token in keystroke.split() if token not in ('pressed', 'released', 'typed')]
+    if not tokens:
+        return None
+    return make_chord(canonical_key(tokens[-1]), tokens[:-1])
@@ -0,0 +1,272 @@
+"""
+Reading macOS Cocoa text-system key bindings.
+
+``StandardKeyBinding.xml`` (the system defaults) is an XML property list.
+``~/Library/KeyBindings/DefaultKeyBinding.dict`` is usually an old-style
+NeXTSTEP plist: ``{ "^h" = "deleteBackward:"; }``. Both map a key
+specification to a selector, a list of selectors, or a nested dictionary
+for the next key of a multi-key sequence.
+
+A key specification is the key character preceded by modifier prefixes:
+``^`` control, ``~`` option, ``$`` shift, ``@`` command and ``#`` numeric
+keypad. Arrows and function keys are the private-use characters
+U+F700 to U+F747. ``decode_key`` turns a specification into the shared
+chord encoding of ``chords``.
+
+The system file stores control characters such as Enter (U+0003) as raw
+characters, which XML 1.0 does not allow, so they are swapped for
+placeholders before ``plistlib`` parses the file. Parsed entries are
+cached by content hash. Only strings are cached, because chord ids are
+interned per process.
+"""
+
+import plistlib
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .cache import content_digest, read_pickle, write_pickle
+from .chords import CHARACTER_KEYS, make_chord
+
+CACHE_VERSION = 1
+
+MODIFIER_PREFIXES = {'^': 'ctrl', '~': 'alt', '$': 'shift', '@': 'cmd'}
+KEYPAD_PREFIX = '#'
+
+# Non-printing key characters -> (Karabiner key_code, implied modifiers)
+FUNCTION_KEYS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    '\x03': ('keypad_enter', ()),
+    '\x08': ('delete_or_backspace', ()),
+    '\t': ('tab', ()),
+    '\n': ('return_or_enter', ()),
+    '\r': ('return_or_enter', ()),
+    '\x19': ('tab', ('shift',)),  # backtab
+    '\x1b': ('escape', ()),
+    '\x7f': ('delete_or_backspace', ()),
+    '\uf700': ('up_arrow', ()),
+    '\uf701': ('down_arrow', ()),
+    '\uf702': ('left_arrow', ()),
+    '\uf703': ('right_arrow', ()),
+    '\uf727': ('insert', ()),
+    '\uf728': ('delete_forward', ()),
+    '\uf729': ('home', ()),
+    '\uf72b': ('end', ()),
+    '\uf72c': ('page_up', ()),
+    '\uf72d': ('page_down', ()),
+    '\uf72e': ('print_screen', ()),
+    '\uf72f': ('scroll_lock', ()),
+    '\uf730': ('pause', ()),
+    '\uf735': ('application', ()),
+    '\uf746': ('help', ()),
+}
+# NSF1FunctionKey .. NSF35FunctionKey
+FUNCTION_KEYS.update({chr(0xF704 + index): (f"f{index + 1}", ()) for index in range(35)})
+
+KEYPAD_KEYS = {char: f"keypad_{char}" for char in '0123456789'}
+KEYPAD_KEYS.update({'.': 'keypad_period', '*': 'keypad_asterisk', '+': 'keypad_plus',
+                    '-': 'keypad_hyphen', '/': 'keypad_slash', '=': 'keypad_equal_sign',
+                    '\x03': 'keypad_enter'})
+
+# (key specifications of the sequence, selectors)
+class KeyBindingEntry(NamedTuple):
+    keys: Tuple[str, ...]
+    selectors: Tuple[str, ...]
+
+def decode_key(spec: str) -> Optional[int]:
+    """Encode a key specification such as '^~h' or '@$\\uf702'; None if the key is unknown."""
+    modifiers = []
+    keypad = False
+    index = 0
+    # A prefix character is the key itself when nothing follows it ("$" is the dollar key)
+    while index < len(spec) - 1:
+        char = spec[index]
+        if char in MODIFIER_PREFIXES:
+            modifiers.append(MODIFIER_PREFIXES[char])
+        elif char == KEYPAD_PREFIX:
+            keypad = True
+        else:
+            break
+        index += 1
+    if index != len(spec) - 1:
+        return None
+
+    char = spec[index]
+    if keypad and char in KEYPAD_KEYS:
+        return make_chord(KEYPAD_KEYS[char], modifiers)
+    if char in FUNCTION_KEYS:
+        key_code, implied = FUNCTION_KEYS[char]
+        return make_chord(key_code, modifiers + list(implied))
+    entry = CHARACTER_KEYS.get(char)
+    if entry is None:
+        return None
+    key_code, shifted = entry
+    return make_chord(key_code, modifiers + (['shift'] if shifted else []))
+
+def decode_keys(keys: Tuple[str, ...]) -> Optional[List[int]]:
+    """Encode every key of a sequence, or None if one of them is unknown."""
+    chords = []
+    for spec in keys:
+        chord = decode_key(spec)
+        if chord is None:
+            return None
+        chords.append(chord)
+    return chords
+
+def spell_keys(keys: Tuple[str, ...]) -> str:
+    """Printable form of raw key specifications, e.g. '@\\uf702'."""
+    return ' '.join(spec.encode('unicode_escape').decode('ascii') for spec in keys)
+
+def keybinding_cache_file(cache_dir: Path) -> Path:
+    """Cache file for parsed key binding files inside a tool's cache directory."""
+    return cache_dir / 'cocoa-keybindings.pickle'
+
+def load_keybindings(path: Path, cache_file: Optional[Path] = None) -> List[KeyBindingEntry]:
+    """Parse a key binding file, reusing the cached entries when its content is unchanged."""
+    content = Path(path).read_bytes()
+    if cache_file is None:
+        return list(iter_entries(parse_keybindings(content)))
+
+    digest = content_digest(content)
+    cache = read_pickle(cache_file)
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        cache = {'version': CACHE_VERSION, 'files': {}}
+    cached = cache['files'].get(str(path))
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+
+    entries = list(iter_entries(parse_keybindings(content)))
+    cache['files'][str(path)] = (digest, entries)
+    write_pickle(cache_file, cache)
+    return entries
+
+def parse_keybindings(content: bytes) -> Dict[str, Any]:
+    """Parse either file format into nested dictionaries."""
+    head = content.lstrip()[:8]
+    if head.startswith((b'<?xml', b'<!DOC', b'<plist', b'bplist')):
+        return parse_xml_plist(content)
+    return parse_openstep(content.decode('utf-8'))
+
+def iter_entries(tree: Dict[str, Any], prefix: Tuple[str, ...] = ()) -> Iterator[KeyBindingEntry]:
+    """Flatten nested key dictionaries into one entry per complete key sequence."""
+    for spec, value in tree.items():
+        keys = prefix + (spec,)
+        if isinstance(value, dict):
+            yield from iter_entries(value, keys)
+        elif isinstance(value, (list, tuple)):
+            yield KeyBindingEntry(keys, tuple(str(selector) for selector in value))
+        else:
+            yield KeyBindingEntry(keys, (str(value),))
+
+# XML 1.0 forbids most control characters; park them in a private-use range
+_XML_CONTROL_RE = re.compile('[\x00-\x08\x0b-\x1f]')
+_PLACEHOLDER_BASE = 0xE000
+_PLACEHOLDER_RE = re.compile('[\ue000-\ue01f]')
+
+def parse_xml_plist(content: bytes) -> Dict[str, Any]:
+    """Parse an XML (or binary) property list that may contain raw control characters."""
+    if not content.startswith(b'bplist'):
+        text = content.decode('utf-8')
+        text = _XML_CONTROL_RE.sub(lambda match: chr(_PLACEHOLDER_BASE + ord(match.group())), text)
+        content = text.encode('utf-8')
+    return _restore_controls(plistlib.loads(content))
+
+def _restore_controls(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {_restore_text(key): _restore_controls(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_restore_controls(item) for item in value]
+    return _restore_text(value) if isinstance(value, str) else value
+
+def _restore_text(text: str) -> str:
+    return _PLACEHOLDER_RE.sub(lambda match: chr(ord(match.group()) - _PLACEHOLDER_BASE), text)
+
+# Old-style plist tokens: whitespace and comments are skipped
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+  | "(?P<quoted>(?:[^"\\]|\\.)*)"
+  | (?P<bare>[A-Za-z0-9_$+/:.\-]+)
+  | (?P<punct>[{}()=;,])
+''', re.S | re.X)
+_ESCAPE_RE = re.compile(r'\\(U[0-9a-fA-F]{4}|[0-7]{1,3}|.)', re.S)
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v'}
+
+def _unescape(match) -> str:
+    escape = match.group(1)
+    if escape[0] == 'U' and len(escape) == 5:
+        return chr(int(escape[1:], 16))
+    if escape[0].isdigit():
+        return chr(int(escape, 8))
+    return _ESCAPES.get(escape, escape)
+
+def tokenize_openstep(text: str) -> List[Tuple[str, str, int]]:
+    """Split old-style plist text into (kind, value, offset) tokens."""
+    tokens = []
+    position = 0
+    match_token = _TOKEN_RE.match
+    while position < len(text):
+        match = match_token(text, position)
+        if match is None:
+            line = text.count('\n', 0, position) + 1
+            raise ValueError(f"Unexpected character {text[position]!r} on line {line}")
+        kind = match.lastgroup
+        if kind == 'quoted':
+            value = match.group('quoted')
+            tokens.append(('string', _ESCAPE_RE.sub(_unescape, value) if '\\' in value else value, position))
+        elif kind == 'bare':
+            tokens.append(('string', match.group('bare'), position))
+        elif kind == 'punct':
+            tokens.append((match.group('punct'), '', position))
+        position = match.end()
+    return tokens
+
+def parse_openstep(text: str) -> Dict[str, Any]:
+    """Parse an old-style (NeXTSTEP) plist whose root is a dictionary."""
+    tokens = tokenize_openstep(text)
+    value, index = _parse_value(tokens, 0, text)
+    if index != len(tokens):
+        _syntax_error(tokens, index, text, 'end of file')
+    if not isinstance(value, dict):
+        raise ValueError("Key binding file must contain a dictionary")
+    return value
+
+def _parse_value(tokens, index, text):
+    if index >= len(tokens):
+        _syntax_error(tokens, index, text, 'a value')
+    kind, value, _ = tokens[index]
+    if kind == 'string':
+        return value, index + 1
+    if kind == '{':
+        result = {}
+        index += 1
+        while _kind(tokens, index) != '}':
+            if _kind(tokens, index) != 'string':
+                _syntax_error(tokens, index, text, 'a key')
+            key = tokens[index][1]
+            if _kind(tokens, index + 1) != '=':
+                _syntax_error(tokens, index + 1, text, "'='")
+            result[key], index = _parse_value(tokens, index + 2, text)
+            if _kind(tokens, index) != ';':
+                _syntax_error(tokens, index, text, "';'")
+            index += 1
+        return result, index + 1
+    if kind == '(':
+        result = []
+        index += 1
+        while _kind(tokens, index) != ')':
+            item, index = _parse_value(tokens, index, text)
+            result.append(item)
+            if _kind(tokens, index) == ',':
+                index += 1
+            elif _kind(tokens, index) != ')':
+                _syntax_error(tokens, index, text, "',' or ')'")
+        return result, index + 1
+    _syntax_error(tokens, index, text, 'a value')
+
+def _kind(tokens, index) -> Optional[str]:
+    return tokens[index][0] if index < len(tokens) else None
+
+def _syntax_error(tokens, index, text, expected):
+    if index >= len(tokens):
+        raise ValueError(f"Unexpected end of file, expected {expected}")
+    line = text.count('\n', 0, tokens[index][2]) + 1
+    raise ValueError(f"Expected {expected} on line {line}")
@@ -0,0 +1,414 @@
+"""
+Keyboard binding conflict detection.
+
+Parses key combinations from the YAML binding data, Karabiner JSON,
+.ideavimrc files, WebStorm keymaps and macOS Cocoa key bindings and
+reports combinations claimed by more than one config source. Used by
+``hooks/check-conflicts.py`` and the watch mode.
+"""
+
+import itertools
+import json
+from pathlib import Path
+from collections import defaultdict
+
+from .chords import (any_side, chord_key, chords_collide, format_chord, has_optional, make_chord,
+                     parse_keystroke, parse_vim_keys)
+from .cocoa import decode_keys, keybinding_cache_file, load_keybindings, spell_keys
+from .discovery import discover_config_files
+from .ideavim import DEFAULT_LEADER, LEADER_RE, iter_mappings, read_leader
+from .karabiner import iter_from_keys
+from .hooklog import get_logger
+from .loader import load_yaml
+from .manipulators import condition_atom, conditions_hold, describe_condition
+from .metrics import Metrics
+from .model import ConfigFile
+from .sequences import find_sequence_conflicts, format_sequence
+from .webstorm import keymap_cache_file, leaf_keymaps, missing_parent_warning, resolve_keymap
+
+# YAML sequence types whose ideavim_command spells a key sequence
+SEQUENCE_TYPES = ('leader', 'vim_prefix')
+
+def log_message(message, level='info', **fields):
+    """Queue a record for the hook's conflict-check.log (see ``hooklog``)"""
+    get_logger('conflict-check').log(message, level=level, **fields)
+
+def parse_yaml_bindings(yaml_path, config=None, leader=DEFAULT_LEADER):
+    """Extract key combinations from YAML config files (or an already built ConfigFile)"""
+    bindings = []
+    
+    try:
+        if config is None:
+            with open(yaml_path, 'r') as f:
+                config = ConfigFile.from_data(load_yaml(f), yaml_path)
+            
+        for binding in config.bindings:
+            if binding.sequence_type in SEQUENCE_TYPES:
+                bindings.extend(yaml_sequence_bindings(yaml_path, binding, leader))
+                continue
+            
+            # Chords and timed presses are not plain key combinations
+            modifiers = binding.modifiers
+            if modifiers is None:
+                continue
+            
+            for key in config.keys:
+                bindings.append(chord_binding(
+                    make_chord(key, modifiers), '+'.join(sorted(modifiers) + [key]),
+                    str(yaml_path), binding.action, binding.status))
+                
+    except Exception as e:
+        log_message(f"Error parsing YAML {yaml_path}: {e}", level='error')
+        
+    return bindings
+
+def yaml_sequence_bindings(yaml_path, binding, leader):
+    """Normal-mode key sequences of a leader or Vim prefix binding, one per key"""
+    sequences = []
+    # e.g. "<Leader>h/<Leader>l" for the H and L keys
+    for lhs in binding.ideavim_command.split('/'):
+        lhs = LEADER_RE.sub(lambda match: leader, lhs.strip())
+        chords = parse_vim_keys(lhs)
+        if chords and len(chords) > 1:
+            sequences.append(chord_binding(
+                None, format_sequence(chords), str(yaml_path), binding.action, binding.status,
+                sequence=tuple(chords), modes=('normal',)))
+    return sequences
+
+def parse_karabiner_config(json_path):
+    """Extract key combinations from Karabiner JSON config"""
+    bindings = []
+    
+    try:
+        # Streams profiles → complex_modifications.rules → manipulators for large files
+        for key_code, modifiers, optional, description, conditions in iter_from_keys(json_path):
+            bindings.append(chord_binding(
+                make_chord(key_code, modifiers, optional), '+'.join(sorted(modifiers) + [key_code]),
+                str(json_path), description, 'Active', conditions=conditions))
+            
+    except Exception as e:
+        log_message(f"Error parsing Karabiner config {json_path}: {e}", level='error')
+        
+    return bindings
+
+def parse_ideavim_config(ideavimrc_path):
+    """Extract key combinations from .ideavimrc"""
+    bindings = []
+    
+    try:
+        with open(ideavimrc_path, 'r') as f:
+            for mapping in iter_mappings(f):
+                chords = parse_vim_keys(mapping.lhs)
+                source = f"{ideavimrc_path}:{mapping.line_num}"
+                status = f"IdeaVim {mapping.command}"
+                if not chords:
+                    # <Plug> and other non-key notation only clash with the same spelling
+                    bindings.append(chord_binding(None, mapping.lhs, source, mapping.rhs, status))
+                    continue
+                
+                # Single keys also go into the sequence tries, as prefixes of longer mappings
+                chord = chords[0] if len(chords) == 1 else None
+                bindings.append(chord_binding(
+                    chord, format_sequence(chords), source, mapping.rhs, status,
+                    sequence=tuple(chords), modes=mapping.modes))
+                    
+    except Exception as e:
+        log_message(f"Error parsing IdeaVim config {ideavimrc_path}: {e}", level='error')
+        
+    return bindings
+
+def parse_webstorm_keymap(keymap_path, cache_file=None, keymap=None):
+    """Extract keystrokes from a WebStorm keymap merged with its parent keymaps (or its given resolution)"""
+    bindings = []
+    
+    try:
+        if keymap is None:
+            keymap = resolve_keymap(Path(keymap_path), cache_file)
+        warning = missing_parent_warning(keymap_path, keymap)
+        if warning:
+            log_message(warning, level='warning')
+        
+        for shortcut in keymap.shortcuts:
+            chords = [parse_keystroke(shortcut.first_keystroke)]
+            if shortcut.second_keystroke:
+                chords.append(parse_keystroke(shortcut.second_keystroke))
+            status = f"WebStorm {shortcut.keymap}"
+            if None in chords:
+                spelling = ', '.join(filter(None, (shortcut.first_keystroke, shortcut.second_keystroke)))
+                bindings.append(chord_binding(None, spelling, str(keymap_path), shortcut.action_id, status))
+                continue
+            
+            # First keystrokes are prefixes of the two-keystroke shortcuts in the 'ide' trie
+            chord = chords[0] if len(chords) == 1 else None
+            bindings.append(chord_binding(
+                chord, format_sequence(chords), str(keymap_path), shortcut.action_id, status,
+                sequence=tuple(chords), modes=('ide',)))
+            
+    except Exception as e:
+        log_message(f"Error parsing WebStorm keymap {keymap_path}: {e}", level='error')
+        
+    return bindings
+
+def parse_cocoa_keybindings(keybinding_path, cache_file=None):
+    """Extract key combinations from a StandardKeyBinding.xml or DefaultKeyBinding.dict"""
+    bindings = []
+    
+    try:
+        source = str(keybinding_path)
+        status = f"Cocoa {Path(keybinding_path).stem}"
+        for entry in load_keybindings(Path(keybinding_path), cache_file):
+            # noop: only stops the key from being typed; it claims nothing
+            if all(selector == 'noop:' for selector in entry.selectors):
+                continue
+            action = ', '.join(entry.selectors)
+            chords = decode_keys(entry.keys)
+            if not chords:
+                bindings.append(chord_binding(None, spell_keys(entry.keys), source, action, status))
+                continue
+            
+            # Nested dictionaries are key sequences of the text system
+            chord = chords[0] if len(chords) == 1 else None
+            bindings.append(chord_binding(
+                chord, format_sequence(chords), source, action, status,
+                sequence=tuple(chords), modes=('text',)))
+            
+    except Exception as e:
+        log_message(f"Error parsing Cocoa key bindings {keybinding_path}: {e}", level='error')
+        
+    return bindings
+
+def chord_binding(chord, spelling, source, action, status, sequence=None, modes=(), conditions=()):
+    """Build a parsed binding; spelling is the fallback combo when chord is None"""
+    return {
+        'combo': format_chord(chord) if chord is not None else spelling.lower(),
+        'chord': chord,
+        'sequence': sequence,
+        'modes': modes,
+        'source': source,
+        'action': action,
+        'status': status,
+        'conditions': conditions
+    }
+
+def layer_requirement(binding):
+    """
+    (required, excluded, layer) of a binding gated to a layer, else None.
+    
+    A binding is gated when one of its variable conditions fails while every
+    variable is unset (df_modifiers=1): the Karabiner manipulator only acts in
+    that layer or mode, not alongside the other sources' bindings. Conditions
+    that hold by default (semicolon_modifier=0) and application conditions do
+    not gate. required and excluded are the (atom, value) pairs its conditions
+    need and rule out; layer is the gating conditions, as canonical JSON.
+    """
+    required, excluded, layer = set(), set(), []
+    for condition in binding.get('conditions', ()):
+        atom = condition_atom(json.loads(condition))
+        (required if atom[2] else excluded).add(atom[:2])
+        if atom[0].startswith('variable:') and not conditions_hold([atom], {}):
+            layer.append(condition)
+    if not layer:
+        return None
+    return frozenset(required), frozenset(excluded), tuple(sorted(layer))
+
+def requirements_compatible(first, second):
+    """True when the conditions of two layer requirements can all hold at once"""
+    required = {}
+    for atom, value in itertools.chain(first[0], second[0]):
+        if required.setdefault(atom, value) != value:
+            return False
+    return not any(item in first[1] or item in second[1] for item in required.items())
+
+def find_conflicts(project_dir, excludes=(), index_file=None, metrics=None):
+    """Find all keyboard binding conflicts in project"""
+    metrics = metrics or Metrics('find_conflicts')
+    with metrics.phase('discover'):
+        config_files = discover_config_files(Path(project_dir), excludes, index_file)
+    metrics.count('files', sum(len(paths) for paths in config_files.values()))
+    all_bindings = []
+    
+    with metrics.phase('load'):
+        # YAML leader bindings use the leader the (first) .ideavimrc sets
+        leader = DEFAULT_LEADER
+        if config_files['ideavim']:
+            with open(config_files['ideavim'][0], 'r') as f:
+                leader = read_leader(f)
+        
+        for yaml_file in config_files['yaml']:
+            all_bindings.extend(parse_yaml_bindings(yaml_file, leader=leader))
+        
+        for json_file in config_files['karabiner']:
+            all_bindings.extend(parse_karabiner_config(json_file))
+        
+        for ideavim_file in config_files['ideavim']:
+            all_bindings.extend(parse_ideavim_config(ideavim_file))
+        
+        # Parent keymaps are checked through the keymaps that inherit from them
+        keymap_cache = keymap_cache_file(index_file.parent) if index_file else None
+        for keymap_file in leaf_keymaps(config_files['webstorm']):
+            all_bindings.extend(parse_webstorm_keymap(keymap_file, keymap_cache))
+        
+        keybinding_cache = keybinding_cache_file(index_file.parent) if index_file else None
+        for keybinding_file in config_files['cocoa']:
+            all_bindings.extend(parse_cocoa_keybindings(keybinding_file, keybinding_cache))
+    metrics.count('bindings', len(all_bindings))
+    
+    with metrics.phase('aggregate'):
+        conflicts, shadows = group_conflicts(all_bindings)
+    metrics.count('conflicts', len(conflicts))
+    metrics.count('shadows', len(shadows))
+    return conflicts, len(all_bindings), shadows
+
+def source_file(binding):
+    return binding['source'].split(':')[0]
+
+def group_conflicts(all_bindings):
+    """
+    Group parsed bindings by key chord and keep cross-source clashes.
+    
+    Returns (conflicts, shadows). Multi-key sequences are checked per mode
+    in a prefix trie: identical sequences from different sources are added
+    to conflicts, and sequences that are a prefix of a longer one are
+    returned in shadows.
+    
+    Bindings are indexed by their integer chord. Side-specific chords are
+    grouped under their any-side form (left_command+h under cmd+h) and only
+    reported when they can fire on the same key press as a chord from another
+    source. Chords with optional modifiers are listed with every group they
+    overlap. Each distinct chord is compared only with the distinct chords on
+    the same key, so the cost grows with the number of bindings, not pairs.
+    
+    Bindings gated to a layer (see ``layer_requirement``) are only compared
+    with each other, and reported under the chord with the layer's conditions
+    when their conditions can hold together. They are bucketed by key and
+    requirement, so only compatible buckets' distinct chords are compared.
+    """
+    chord_index = defaultdict(list)
+    sequence_index = defaultdict(list)
+    # key -> layer requirement -> chord (combo when unparsed) -> bindings
+    gated_index = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for binding in all_bindings:
+        requirement = layer_requirement(binding) if binding.get('conditions') else None
+        if requirement is not None:
+            chord = binding['chord']
+            key = chord_key(chord) if chord is not None else binding['combo']
+            gated_index[key][requirement][chord if chord is not None else binding['combo']].append(binding)
+        elif binding['chord'] is not None:
+            chord_index[binding['chord']].append(binding)
+        elif binding['sequence'] is None:
+            sequence_index[binding['combo']].append(binding)
+    
+    groups = defaultdict(list)
+    optional_by_key = defaultdict(list)
+    for chord in chord_index:
+        if has_optional(chord):
+            groups[chord].append(chord)
+            optional_by_key[chord_key(chord)].append(chord)
+        else:
+            groups[any_side(chord)].append(chord)
+    chord_sources = {chord: {source_file(b) for b in bindings} for chord, bindings in chord_index.items()}
+    
+    def clashing(chord, others):
+        """Bindings of chord that share a key press with another source's chord in others"""
+        reachable = set()
+        for other in others:
+            if chords_collide(chord, other):
+                reachable |= chord_sources[other]
+        if not reachable or (len(reachable) == 1 and chord_sources[chord] == reachable):
+            return []
+        return [b for b in chord_index[chord] if len(reachable) > 1 or source_file(b) not in reachable]
+    
+    conflicts = {}
+    for group_chord, members in groups.items():
+        extras = [chord for chord in optional_by_key[chord_key(group_chord)] if chord not in members
+                  and any(chords_collide(chord, member) for member in members)]
+        candidates = members + extras
+        reported = [b for chord in members for b in clashing(chord, candidates)]
+        if reported:
+            reported.extend(b for chord in extras for b in clashing(chord, members))
+            conflicts[format_chord(group_chord)] = reported
+    
+    conflicts.update(layer_conflicts(gated_index))
+    
+    collisions, shadows = find_sequence_conflicts(all_bindings, source_file)
+    conflicts.update(collisions)
+    
+    # Notation that is not a key sequence keeps exact matching
+    for combo, bindings in sequence_index.items():
+        if len(bindings) > 1 and len(set(source_file(b) for b in bindings)) > 1:
+            conflicts[combo] = bindings
+    
+    return conflicts, shadows
+
+def layer_conflicts(gated_index):
+    """Cross-source clashes among layer-gated bindings on the same key, keyed by chord and layer"""
+    conflicts = {}
+    reported = set()
+    
+    def report(title, by_source, other_sources):
+        """Add each source's bindings when another source has a chord on the same key press"""
+        for source, bindings in by_source.items():
+            if (len(other_sources) > 1 or source not in other_sources) and (title, id(bindings)) not in reported:
+                reported.add((title, id(bindings)))
+                conflicts.setdefault(title, []).extend(bindings)
+    
+    for buckets in gated_index.values():
+        # Per requirement: (chord, bindings by source file) for each distinct chord
+        grouped = {}
+        for requirement, chords in buckets.items():
+            grouped[requirement] = []
+            for chord, bindings in chords.items():
+                by_source = defaultdict(list)
+                for binding in bindings:
+                    by_source[source_file(binding)].append(binding)
+                if isinstance(chord, str) or has_optional(chord):
+                    title = bindings[0]['combo']
+                else:
+                    title = format_chord(any_side(chord))
+                grouped[requirement].append((chord, title, dict(by_source)))
+        
+        requirements = list(grouped)
+        for position, first in enumerate(requirements):
+            for second in requirements[position:]:
+                if not requirements_compatible(first, second):
+                    continue
+                layer = ', '.join(map(describe_condition, sorted(set(first[2]) | set(second[2]))))
+                for chord, title, by_source in grouped[first]:
+                    for other, other_title, other_by_source in grouped[second]:
+                        if isinstance(chord, str) or isinstance(other, str):
+                            if chord != other:
+                                continue
+                        elif not chords_collide(chord, other):
+                            continue
+                        if len(by_source) == 1 and by_source.keys() == other_by_source.keys():
+                            continue
+                        key = f"{min(title, other_title)} (when {layer})"
+                        report(key, by_source, other_by_source.keys())
+                        report(key, other_by_source, by_source.keys())
+    return conflicts
+
+def format_conflict_report(conflicts, total_bindings, shadows=None):
+    """Format the conflict report printed by the hook"""
+    if not conflicts:
+        lines = [f"✅ No conflicts found! Checked {total_bindings} bindings."]
+    else:
+        lines = [f"🚨 Found {len(conflicts)} potential conflicts:"]
+        for combo, bindings in conflicts.items():
+            lines.append(f"\nKey combination '{combo}' used in:")
+            lines.extend(format_binding_lines(combo, bindings))
+    
+    if shadows:
+        lines.append(f"\n⚠️  Found {len(shadows)} key sequences that are prefixes of longer ones:")
+        for prefix, bindings in shadows.items():
+            lines.append(f"\nKey sequence '{prefix}' shadows:")
+            lines.extend(format_binding_lines(prefix, bindings))
+    return lines
+
+def format_binding_lines(title, bindings):
+    lines = []
+    for binding in bindings:
+        # Name the exact chord or sequence when it differs from the group's
+        combo = binding['combo']
+        spelled = '' if title == combo or title.startswith(f"{combo} (") else f" [{combo}]"
+        lines.append(f"  - {binding['source']}: {binding['action']} ({binding['status']}){spelled}")
+    return lines
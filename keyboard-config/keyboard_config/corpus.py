@@ -0,0 +1,126 @@
+"""
+Discovery and loading of the YAML binding corpus in ``data/``.
+
+``load_corpus`` serves unchanged files from the ``BindingCache`` and parses
+the rest, in a process pool when there is enough YAML to pay for starting
+one. Files are sent to the workers in chunks and the documents come back
+in input order, so output does not depend on the worker count.
+``load_binding_set`` wraps it for the scripts, printing per-file timings
+and recording the load in their ``Metrics``.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .cache import BindingCache
+from .loader import load_yaml, yaml_backend
+from .metrics import Metrics
+from .model import BindingSet
+
+# Below this much YAML to parse, pool startup costs more than it saves
+PARALLEL_THRESHOLD_BYTES = 1 << 20
+# Chunks per worker: enough to balance uneven files, few enough to keep IPC low
+CHUNKS_PER_WORKER = 4
+
+class LoadedFile(NamedTuple):
+    """A corpus file with its parsed document and how long parsing took."""
+    path: Path
+    data: Dict[str, Any]
+    parse_seconds: float  # 0.0 when served from the cache
+    cached: bool
+
+def load_yaml_data(file_path: Path) -> Dict[str, Any]:
+    """Load and parse YAML data from file."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return load_yaml(f)
+
+def discover_yaml_files(data_dir: Path) -> List[Path]:
+    """Discover all YAML configuration files in the data directory."""
+    yaml_files = []
+    for file_path in data_dir.glob('*.yaml'):
+        # Skip schema files
+        if 'schema' not in file_path.name.lower():
+            yaml_files.append(file_path)
+    return sorted(yaml_files)
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+def load_corpus(yaml_files: Sequence[Path], cache: BindingCache, jobs: Optional[int] = None,
+                threshold: int = PARALLEL_THRESHOLD_BYTES) -> List[LoadedFile]:
+    """
+    Load every file through the cache, parsing changed files in parallel.
+
+    ``jobs`` caps the worker processes (default: one per CPU); 1 forces a
+    serial parse. The pool is only started when at least two files and
+    ``threshold`` bytes of YAML need parsing.
+    """
+    results: List[Optional[LoadedFile]] = [None] * len(yaml_files)
+    pending = []
+    for index, yaml_file in enumerate(yaml_files):
+        data, parse = cache.lookup(yaml_file)
+        if parse is None:
+            results[index] = LoadedFile(yaml_file, data, 0.0, True)
+        else:
+            pending.append((index, parse))
+
+    contents = [parse.content for _, parse in pending]
+    jobs = default_jobs() if jobs is None else max(1, jobs)
+    workers = min(jobs, len(contents))
+    if workers > 1 and sum(map(len, contents)) >= threshold:
+        parsed = _parse_parallel(cache.parse, contents, workers)
+    else:
+        parsed = _parse_chunk(cache.parse, contents)
+
+    for (index, parse), (data, seconds) in zip(pending, parsed):
+        cache.store(parse, data)
+        results[index] = LoadedFile(yaml_files[index], data, seconds, False)
+    return results
+
+def _parse_parallel(parse: Callable[[bytes], Any], contents: List[bytes],
+                    workers: int) -> List[Tuple[Any, float]]:
+    chunk_size = max(1, -(-len(contents) // (workers * CHUNKS_PER_WORKER)))
+    chunks = [contents[start:start + chunk_size] for start in range(0, len(contents), chunk_size)]
+    parsed: List[Tuple[Any, float]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() yields chunk results in submission order
+        for chunk_result in executor.map(_parse_chunk, [parse] * len(chunks), chunks):
+            parsed.extend(chunk_result)
+    return parsed
+
+def _parse_chunk(parse: Callable[[bytes], Any], contents: List[bytes]) -> List[Tuple[Any, float]]:
+    """Parse each file content, timing it; runs in a worker process for large corpora."""
+    parsed = []
+    for content in contents:
+        start = time.perf_counter()
+        data = parse(content)
+        parsed.append((data, time.perf_counter() - start))
+    return parsed
+
+def load_binding_set(yaml_files: Sequence[Path], cache: BindingCache, jobs: Optional[int],
+                     metrics: Metrics) -> BindingSet:
+    """Load and flatten the corpus for a script, printing how each file was loaded."""
+    print(f"YAML backend: {yaml_backend()}")
+    with metrics.phase('load'):
+        loaded = load_corpus(yaml_files, cache, jobs)
+        cache.save()
+    metrics.count('files', len(loaded))
+    metrics.count('files_parsed', cache.misses)
+
+    for item in loaded:
+        timing = "cached" if item.cached else f"parsed in {item.parse_seconds * 1000:.1f} ms"
+        print(f"Loading {item.path}... {timing}")
+    if cache.enabled:
+        print(f"YAML cache: {cache.hits} reused, {cache.misses} parsed")
+    parsed = [item for item in loaded if not item.cached]
+    if len(parsed) > 1:
+        slowest = max(parsed, key=lambda item: item.parse_seconds)
+        print(f"Slowest parse: {slowest.path} ({slowest.parse_seconds * 1000:.1f} ms)")
+
+    with metrics.phase('flatten'):
+        binding_set = BindingSet.from_documents([(item.path, item.data) for item in loaded])
+    metrics.count('bindings', len(binding_set))
+    return binding_set
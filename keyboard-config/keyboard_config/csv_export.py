@@ -0,0 +1,204 @@
+"""
+CSV export of keyboard binding data.
+
+Flattens the hierarchical YAML binding data into rows for spreadsheet
+analysis and writes the full, tab-separated, summary and pivot-ready
+exports. Used by ``scripts/export-csv.py`` and the watch mode.
+
+``export_bindings`` writes all four files in one streaming pass: each
+binding is flattened once and handed to every sink, so no file needs a
+list of all rows in memory. Each output is buffered and only written when
+its content changed (``docs.write_if_changed``, as for KEY-MAP.md). ``export_keymap`` writes resolved WebStorm
+keymaps (see ``webstorm.resolve_keymap``) next to them.
+"""
+
+import csv
+import io
+from contextlib import ExitStack, contextmanager
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Any, Set, Tuple
+
+from .aggregate import BindingAggregate
+from .chords import format_chord, parse_keystroke
+from .docs import write_if_changed
+from .model import Binding, ConfigFile
+from .webstorm import ResolvedKeymap
+
+# Column order for consistent output
+FIELDNAMES = [
+    'navigation_type',
+    'keys', 
+    'binding_key',
+    'modifier',
+    'keystroke',
+    'system',
+    'status',
+    'category',
+    'action',
+    'ide_action_id',
+    'karabiner_code',
+    'ideavim_command',
+    'config_reference',
+    'notes',
+    # New optional fields
+    'timing_ms',
+    'sequence_type',
+    'chord_keys',
+    'press_type'
+]
+
+PIVOT_FIELDNAMES = [
+    'Navigation', 'Keys', 'Binding', 'System', 'Status', 'Category',
+    'HasIdeAction', 'HasKarabiner', 'HasIdeaVim', 'IsImplemented', 'ConfigFile'
+]
+
+KEYMAP_FIELDNAMES = [
+    'keymap', 'action_id', 'first_keystroke', 'second_keystroke', 'combo', 'defined_in', 'in_yaml'
+]
+
+def iter_binding_rows(configs: Iterable[ConfigFile]) -> Iterator[Tuple[Binding, Dict[str, Any]]]:
+    """Yield each binding of the configuration files with its flattened row."""
+    for config in configs:
+        for binding in config.bindings:
+            yield binding, binding.as_row()
+
+def pivot_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Reshape a flattened row for pivot table analysis."""
+    return {
+        'Navigation': row['navigation_type'].title(),
+        'Keys': row['keys'],
+        'Binding': row['modifier'],
+        'System': row['system'],
+        'Status': row['status'].title(),
+        'Category': row['category'].title(),
+        'HasIdeAction': 'Yes' if row['ide_action_id'] != 'Custom' and row['ide_action_id'] != '-' else 'No',
+        'HasKarabiner': 'Yes' if row['karabiner_code'] != '-' else 'No', 
+        'HasIdeaVim': 'Yes' if row['ideavim_command'] != '-' else 'No',
+        'IsImplemented': 'Yes' if row['status'] == 'implemented' else 'No',
+        'ConfigFile': row['config_reference'].split(':')[0] if ':' in row['config_reference'] else row['config_reference']
+    }
+
+class CsvSink:
+    """Writes each row it receives to a CSV file, optionally reshaped first."""
+
+    def __init__(self, csvfile, fieldnames: List[str], delimiter: str = ',', transform=None):
+        self.writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=delimiter)
+        self.writer.writeheader()
+        self.transform = transform
+        self.rows = 0
+
+    def write(self, binding: Binding, row: Dict[str, Any]) -> None:
+        self.writer.writerow(self.transform(row) if self.transform else row)
+        self.rows += 1
+
+class SummarySink:
+    """Accumulates facet counts and writes the summary CSV when the pass ends."""
+
+    def __init__(self, output_file: Path):
+        self.output_file = output_file
+        self.counts = BindingAggregate()
+
+    def write(self, binding: Binding, row: Dict[str, Any]) -> None:
+        self.counts.add(binding)
+
+    def close(self) -> None:
+        generate_summary_csv(self.counts, self.output_file)
+
+@contextmanager
+def open_csv(output_file: Path) -> Iterator[io.StringIO]:
+    """Buffer a CSV output and write it with ``write_if_changed``, so an unchanged export keeps its mtime."""
+    buffer = io.StringIO(newline='')
+    yield buffer
+    write_if_changed(output_file, buffer.getvalue())
+
+def export_bindings(configs: Iterable[ConfigFile], main_csv: Path, tsv_file: Path,
+                    summary_csv: Path, pivot_csv: Path) -> BindingAggregate:
+    """Write the CSV, TSV, summary and pivot exports in one pass; return the counts."""
+    rows = iter_binding_rows(configs)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError("No data to write")
+    
+    with ExitStack() as stack:
+        summary = SummarySink(summary_csv)
+        sinks = [
+            CsvSink(stack.enter_context(open_csv(main_csv)), FIELDNAMES),
+            CsvSink(stack.enter_context(open_csv(tsv_file)), FIELDNAMES, delimiter='\t'),
+            CsvSink(stack.enter_context(open_csv(pivot_csv)), PIVOT_FIELDNAMES, transform=pivot_row),
+            summary,
+        ]
+        writes = [sink.write for sink in sinks]
+        
+        for binding, row in chain([first], rows):
+            for write in writes:
+                write(binding, row)
+    
+    summary.close()
+    return summary.counts
+
+# (facet, metric label) rows of the summary CSV, in output order
+SUMMARY_METRICS = [
+    ('status', 'Status'),
+    ('system', 'System'),
+    ('category', 'Category'),
+    ('sequence_type', 'Sequence Type'),
+    ('timing_ms', 'Timing (ms)'),
+    ('press_type', 'Press Type'),
+]
+
+def generate_summary_csv(counts: BindingAggregate, output_file: Path):
+    """Generate summary statistics CSV from aggregated facet counts."""
+    summary_data = []
+    total = counts.total
+    
+    for facet, metric in SUMMARY_METRICS:
+        for value, count in sorted(counts[facet].items()):
+            summary_data.append({
+                'metric': metric,
+                'value': str(value),
+                'count': count,
+                'percentage': round(count / total * 100, 1)
+            })
+    
+    # Write summary CSV
+    with open_csv(output_file) as csvfile:
+        fieldnames = ['metric', 'value', 'count', 'percentage']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        
+        writer.writeheader()
+        for row in summary_data:
+            writer.writerow(row)
+
+def keystroke_combo(keystroke: str) -> str:
+    """Canonical spelling of a keymap keystroke, e.g. 'meta H' -> 'cmd+h'."""
+    chord = parse_keystroke(keystroke)
+    return format_chord(chord) if chord is not None else keystroke
+
+def documented_action_ids(bindings: Iterable[Binding]) -> Set[str]:
+    """IDE action ids referenced by the YAML data ('EditorLeft/EditorRight' counts both)."""
+    return {action_id.strip() for binding in bindings for action_id in binding.ide_action_id.split('/')}
+
+def export_keymap(keymaps: Iterable[ResolvedKeymap], output_file: Path, documented: Set[str] = frozenset()) -> int:
+    """Write every shortcut of the resolved keymaps to a CSV file; return the row count."""
+    rows = 0
+    
+    with open_csv(output_file) as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=KEYMAP_FIELDNAMES)
+        writer.writeheader()
+        for keymap in keymaps:
+            for shortcut in keymap.shortcuts:
+                strokes = [shortcut.first_keystroke]
+                if shortcut.second_keystroke:
+                    strokes.append(shortcut.second_keystroke)
+                writer.writerow({
+                    'keymap': keymap.name,
+                    'action_id': shortcut.action_id,
+                    'first_keystroke': shortcut.first_keystroke,
+                    'second_keystroke': shortcut.second_keystroke or '',
+                    'combo': ' '.join(keystroke_combo(stroke) for stroke in strokes),
+                    'defined_in': shortcut.keymap,
+                    'in_yaml': 'Yes' if shortcut.action_id in documented else 'No',
+                })
+                rows += 1
+    return rows
@@ -0,0 +1,163 @@
+"""
+Single-pass discovery of keyboard config files in a project tree.
+
+Walks the tree once with ``os.scandir``, pruning ignored directories
+(``DEFAULT_EXCLUDES``, extra excludes and the project's root ``.gitignore``),
+and classifies every file against all config patterns in the same pass.
+
+An optional directory index records each directory's mtime together with
+its matching files and subdirectories. A directory's mtime only changes when
+entries are added, removed or renamed, so on later runs an unchanged
+directory costs one ``stat`` instead of a full listing.
+"""
+
+import fnmatch
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import content_digest, read_pickle, write_pickle
+
+INDEX_VERSION = 4
+
+DEFAULT_EXCLUDES = frozenset({
+    '.git', '.hg', '.svn', '.idea', '.claude', 'node_modules', 'venv', '.venv',
+    '__pycache__', '.mypy_cache', '.pytest_cache', 'obsidian-vault',
+})
+
+# macOS text-system key binding files (system defaults and user overrides)
+COCOA_KEYBINDING_FILES = frozenset({'StandardKeyBinding.xml', 'DefaultKeyBinding.dict'})
+
+# Directory mtimes this close to the scan start are not trusted on the next
+# run, since a later change within the same timestamp tick would be missed.
+RACY_WINDOW_NS = 2_000_000_000
+
+GitignorePattern = Tuple[str, bool, bool]
+
+def classify_config_file(dir_path: str, name: str) -> Optional[str]:
+    """Return the config source type for a file name, or None if it is not one."""
+    if name == 'karabiner.json':
+        return 'karabiner'
+    if name == '.ideavimrc':
+        return 'ideavim'
+    if name.endswith(('.yaml', '.yml')) and 'keyboard-config/data' in dir_path.replace(os.sep, '/'):
+        # Schema files describe the data, as in corpus.discover_yaml_files
+        if 'schema' in name.lower() or os.path.basename(dir_path) == 'schemas':
+            return None
+        return 'yaml'
+    if name in COCOA_KEYBINDING_FILES:
+        return 'cocoa'
+    if name.endswith('.xml') and os.path.basename(dir_path) in ('webstorm', 'keymaps'):
+        return 'webstorm'
+    return None
+
+def load_gitignore(root: Path) -> List[GitignorePattern]:
+    """
+    Read the root ``.gitignore`` into (pattern, dir_only, anchored) tuples.
+
+    Negated (``!``) patterns are skipped; they can only re-include paths, so
+    ignoring them at worst walks a directory that git would skip.
+    """
+    try:
+        lines = (root / '.gitignore').read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return []
+
+    patterns = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(('#', '!')):
+            continue
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = line.startswith('/') or '/' in line
+        patterns.append((line.lstrip('/'), dir_only, anchored))
+    return patterns
+
+def is_gitignored(rel_path: str, name: str, is_dir: bool, patterns: List[GitignorePattern]) -> bool:
+    """Check a root-relative path against parsed .gitignore patterns."""
+    for pattern, dir_only, anchored in patterns:
+        if dir_only and not is_dir:
+            continue
+        if fnmatch.fnmatchcase(rel_path if anchored else name, pattern):
+            return True
+    return False
+
+def default_index_file(project_dir: Path) -> Path:
+    """Return the discovery index location used by the conflict hook."""
+    return project_dir / '.claude' / 'hooks' / 'cache' / 'conflict-discovery.pickle'
+
+def discover_config_files(project_dir: Path, excludes: Iterable[str] = (),
+                          index_file: Optional[Path] = None) -> Dict[str, List[Path]]:
+    """
+    Find YAML binding data and the Karabiner, IdeaVim, WebStorm and Cocoa
+    configs in one traversal.
+
+    Returns sorted paths grouped by source type ('yaml', 'karabiner',
+    'ideavim', 'webstorm', 'cocoa'). When ``index_file`` is given, unchanged
+    directories are served from the index and the refreshed index is written
+    back.
+    """
+    root = Path(project_dir).resolve()
+    excluded = DEFAULT_EXCLUDES | frozenset(excludes)
+    gitignore = load_gitignore(root)
+    signature = content_digest(repr((sorted(excluded), gitignore)).encode('utf-8'))
+
+    previous: Dict[str, Tuple[int, List[Tuple[str, str]], List[str]]] = {}
+    if index_file is not None:
+        payload = read_pickle(index_file)
+        if (isinstance(payload, dict) and payload.get('version') == INDEX_VERSION
+                and payload.get('root') == str(root) and payload.get('signature') == signature):
+            previous = payload['dirs']
+
+    scan_started_ns = time.time_ns()
+    index = {}
+    found: Dict[str, List[Path]] = {'yaml': [], 'karabiner': [], 'ideavim': [], 'webstorm': [], 'cocoa': []}
+    stack = ['']
+
+    while stack:
+        rel_dir = stack.pop()
+        dir_path = os.path.join(root, rel_dir) if rel_dir else str(root)
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            continue
+
+        cached = previous.get(rel_dir)
+        if cached is not None and cached[0] == mtime_ns:
+            _, files, subdirs = cached
+        else:
+            files, subdirs = [], []
+            try:
+                entries = os.scandir(dir_path)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in excluded and not is_gitignored(rel_path, name, True, gitignore):
+                            subdirs.append(name)
+                    elif entry.is_file():
+                        source_type = classify_config_file(dir_path, name)
+                        if source_type and not is_gitignored(rel_path, name, False, gitignore):
+                            files.append((name, source_type))
+
+        index[rel_dir] = (mtime_ns, files, subdirs)
+        for name, source_type in files:
+            found[source_type].append(Path(dir_path) / name)
+        stack.extend(f"{rel_dir}/{name}" if rel_dir else name for name in subdirs)
+
+    if index_file is not None:
+        trusted = {rel_dir: entry for rel_dir, entry in index.items()
+                   if entry[0] < scan_started_ns - RACY_WINDOW_NS}
+        write_pickle(index_file, {
+            'version': INDEX_VERSION,
+            'root': str(root),
+            'signature': signature,
+            'dirs': trusted,
+        })
+
+    return {source_type: sorted(paths) for source_type, paths in found.items()}
@@ -0,0 +1,389 @@
+"""
+Markdown rendering of keyboard binding data.
+
+Converts the structured YAML binding data into formatted markdown tables
+that are both human-readable and LLM-friendly. Used by
+``scripts/generate-docs.py`` and the watch mode.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from .cache import content_digest, read_pickle
+from .aggregate import FACETS, aggregate_bindings
+from .model import Binding, BindingSet, ConfigFile
+
+def status_to_emoji(status: str) -> str:
+    """Convert status string to emoji representation."""
+    status_map = {
+        'implemented': '✅',
+        'planned': '📋', 
+        'needs_attention': '⚠️',
+        'disabled': '❌',
+        'conflict': '⚡'
+    }
+    return status_map.get(status, '❓')
+
+def category_to_emoji(category: str) -> str:
+    """Convert category string to emoji representation."""
+    category_map = {
+        'timing': '⏱️',
+        'chord': '🎹',
+        'leader': '👑',
+        'sequence': '🔗',
+        'navigation': '🧭',
+        'selection': '✏️',
+        'text_edit': '📝',
+        'window': '🪟',
+        'desktop': '🖥️',
+        'action': '⚙️',
+        'custom': '🎛️',
+        'mouse': '🖱️'
+    }
+    return category_map.get(category, '📂')
+
+def format_table_row(binding: Binding) -> str:
+    """Format a single binding as a markdown table row."""
+    # Format each column with proper escaping
+    status = status_to_emoji(binding.status)
+    category = binding.category.replace('_', ' ').title()
+    category_icon = category_to_emoji(binding.category)
+    ide_action = f"`{binding.ide_action_id}`"
+    karabiner = f"`{binding.karabiner_code}`"
+    ideavim = f"`{binding.ideavim_command}`" if binding.ideavim_command != '-' else '-'
+    
+    # Add optional field indicators
+    optional_info = []
+    if binding.timing_ms is not None:
+        optional_info.append(f"⏱️{binding.timing_ms}ms")
+    if binding.sequence_type is not None:
+        optional_info.append(f"🔗{binding.sequence_type}")
+    if binding.chord_keys:
+        chord_str = '+'.join(binding.chord_keys)
+        optional_info.append(f"🎹{chord_str}")
+    if binding.press_type is not None:
+        optional_info.append(f"👆{binding.press_type}")
+    
+    optional_suffix = f" {' '.join(optional_info)}" if optional_info else ""
+    
+    return f"| {binding.modifier} | {binding.keystroke} | {binding.system} | {status} | {category_icon} {category} | {binding.action}{optional_suffix} | {ide_action} | {karabiner} | {ideavim} | {binding.config_reference} |"
+
+def generate_navigation_table(config: ConfigFile) -> List[str]:
+    """Generate markdown table for navigation bindings."""
+    lines = []
+    
+    # Table header
+    lines.append("| Modifier | Keystroke | System | Status | Category | Action | **IDE Action ID** | Karabiner Code | IdeaVim Command | Config Reference |")
+    lines.append("|----------|-----------|---------|---------|----------|---------|-------------------|----------------|-----------------|------------------|")
+    
+    # Sort bindings for consistent output
+    binding_order = [
+        # Standard modifier combinations
+        'none', 'shift', 'ctrl', 'alt', 'cmd',
+        'shift_ctrl', 'shift_alt', 'shift_cmd', 'ctrl_alt', 'ctrl_cmd', 'alt_cmd',
+        'shift_ctrl_alt', 'shift_ctrl_cmd', 'shift_alt_cmd', 'ctrl_alt_cmd',
+        'shift_ctrl_alt_cmd',
+        # Hyper key combinations
+        'hyper', 'hyper_shift', 'hyper_ctrl', 'hyper_alt', 'hyper_cmd',
+        # Double tap combinations
+        'double_tap', 'shift_double_tap', 'ctrl_double_tap', 'alt_double_tap', 'cmd_double_tap',
+        # Leader key sequences
+        'leader', 'leader_shift', 'leader_ctrl', 'leader_alt', 'leader_cmd', 'double_leader',
+        # Long press variations
+        'long_press', 'tap_hold',
+        # Chord combinations
+        'chord_vertical', 'chord_horizontal', 'chord_mouse', 'chord_scroll',
+        # Vim-specific bindings
+        'g_prefix', 'change_camel', 'delete_camel', 'inner_camel', 'scroll_horizontal', 'scroll_vertical',
+        # Additional Vim sequences
+        'yank_horizontal', 'yank_vertical', 'visual_horizontal', 'visual_vertical',
+        'mark_horizontal', 'mark_vertical', 'jump_mark', 'jump_mark_vertical',
+        'register_horizontal', 'register_vertical', 'backslash_leader', 'backslash_leader_vertical',
+        'bracket_prev', 'bracket_next'
+    ]
+    
+    # Add bindings in order, then any remaining ones
+    bindings = {binding.binding_key: binding for binding in config.bindings}
+    added_keys = set()
+    for key in binding_order:
+        if key in bindings:
+            lines.append(format_table_row(bindings[key]))
+            added_keys.add(key)
+    
+    # Add any remaining bindings not in the predefined order
+    for key in sorted(bindings.keys()):
+        if key not in added_keys:
+            lines.append(format_table_row(bindings[key]))
+    
+    return lines
+
+MULTI_CONFIG_HEADER = [
+    "# Keyboard Configuration System",
+    "",
+    "Generated from YAML configuration data. **DO NOT EDIT MANUALLY** - changes will be overwritten.",
+    "",
+    "This document provides comprehensive keyboard binding documentation for all configured keys in the unified productivity system.",
+    "",
+    "## Legend",
+    "",
+    "### Systems",
+    "- **I**: IdeaVim (editor-level vim emulation)",
+    "- **W**: WebStorm (IDE-level keymaps)", 
+    "- **K**: Karabiner Elements (system-wide key modifications)",
+    "- Combinations indicate multi-system bindings",
+    "",
+    "### Status Icons",
+    "- ✅ **Implemented**: Fully configured and working",
+    "- 📋 **Planned**: Identified for future implementation",
+    "- ⚠️ **Needs Attention**: Requires fixes or remapping",
+    "- ❌ **Disabled**: Intentionally disabled",
+    "- ⚡ **Conflict**: Conflicts with other bindings",
+    "",
+    "### Category Icons",
+    "- ⏱️ **Timing**: Double tap, long press, tap/hold patterns",
+    "- 🎹 **Chord**: Multiple keys pressed simultaneously",
+    "- 👑 **Leader**: Leader key prefix sequences",
+    "- 🔗 **Sequence**: Multi-step key sequences",
+    "- 🧭 **Navigation**: Movement and positioning",
+    "- ✏️ **Selection**: Text and object selection",
+    "- 📝 **Text Edit**: Text manipulation and editing",
+    "- 🪟 **Window**: Window and pane management",
+    "- 🖥️ **Desktop**: Desktop and workspace control",
+    "- ⚙️ **Action**: IDE actions and commands",
+    "- 🎛️ **Custom**: Custom or unspecified actions",
+    "- 🖱️ **Mouse**: Mouse-related operations",
+    "",
+    "### Field Indicators",
+    "- ⏱️500ms: Timing window (double tap/long press)",
+    "- 🔗double_tap: Sequence type",
+    "- 🎹H+J: Chord keys combination",
+    "- 👆hold: Press type requirement",
+    "",
+    "---",
+    ""
+]
+
+RENDER_STATE_FILE_NAME = 'keymap-sections.pickle'
+
+def config_section_title(config: ConfigFile) -> str:
+    """Create a friendly section title based on navigation type and keys."""
+    nav_type = config.navigation_type
+    keys_str = ', '.join(config.keys)
+    
+    if nav_type == 'horizontal':
+        return f"Horizontal Navigation Key Bindings ({keys_str})"
+    elif nav_type == 'vertical':
+        return f"Vertical Navigation Key Bindings ({keys_str})"
+    elif nav_type == 'bracket':
+        return f"Bracket Navigation Key Bindings ({keys_str})"
+    elif nav_type == 'individual':
+        return f"Individual Key Bindings ({keys_str})"
+    else:
+        return f"{nav_type.title()} Key Bindings ({keys_str})"
+
+def config_source_name(config: ConfigFile) -> str:
+    """Return the source file label listed in the document footer."""
+    return f"{config.navigation_type}-navigation.yaml"
+
+def generate_config_section(config: ConfigFile) -> List[str]:
+    """Generate the markdown section for a single configuration file."""
+    lines = [
+        f"## {config_section_title(config)}",
+        "",
+        f"**Navigation Type**: {config.navigation_type.title()}  ",
+        f"**Keys**: {', '.join(config.keys)}  ",
+        f"**Description**: {config.description}",
+        ""
+    ]
+    lines.extend(generate_navigation_table(config))
+    lines.append("")
+    return lines
+
+def collect_config_counters(config: ConfigFile) -> Dict[str, Counter]:
+    """Count a configuration file's bindings for each summary facet."""
+    return aggregate_bindings(config.bindings).facets
+
+def generate_multi_config_markdown(binding_set: BindingSet) -> str:
+    """Generate markdown document for multiple configuration files."""
+    configs = binding_set.configs
+    sections = ['\n'.join(generate_config_section(config)) for config in configs]
+    source_files = [config_source_name(config) for config in configs]
+    return assemble_multi_config_markdown(
+        generate_multi_config_summary_stats(binding_set), sections, source_files)
+
+def assemble_multi_config_markdown(summary_lines: List[str], sections: List[str],
+                                   source_files: List[str]) -> str:
+    """Join the header, summary, rendered sections and footer into one document."""
+    lines = list(MULTI_CONFIG_HEADER)
+    lines.extend(summary_lines)
+    lines.extend(sections)
+    lines.extend([
+        "---",
+        "",
+        "*Generated automatically from YAML configuration data.*",
+        f"*Source files: {', '.join(f'`{f}`' for f in source_files)}*"
+    ])
+    
+    return '\n'.join(lines)
+
+def generate_multi_config_summary_stats(binding_set: BindingSet) -> List[str]:
+    """Generate summary statistics for multiple configuration files."""
+    return render_multi_config_summary(binding_set.aggregate().facets)
+
+def render_multi_config_summary(totals: Dict[str, Counter]) -> List[str]:
+    """Render the summary statistics section from aggregated facet counters."""
+    lines = []
+    
+    lines.append("## Implementation Summary")
+    lines.append("")
+    
+    # Configuration overview
+    lines.append("### Configuration Overview")
+    lines.append("| Navigation Type | Bindings | Description |")
+    lines.append("|----------------|----------|-------------|")
+    
+    type_descriptions = {
+        'horizontal': 'Left/right navigation (H/L keys)',
+        'vertical': 'Up/down navigation (J/K keys)', 
+        'bracket': 'Previous/next navigation with brackets',
+        'individual': 'Single key bindings',
+        'custom': 'Custom key pair combinations',
+        'pair': 'Two-key combinations'
+    }
+    
+    for nav_type, count in sorted(totals['navigation_type'].items()):
+        desc = type_descriptions.get(nav_type, 'Custom navigation type')
+        lines.append(f"| {nav_type.title()} | {count} | {desc} |")
+    
+    lines.append("")
+    
+    # Status breakdown
+    lines.append("### Status Overview")
+    lines.append("| Status | Count | Percentage |")
+    lines.append("|--------|-------|------------|")
+    
+    total = sum(totals['status'].values())
+    for status, count in sorted(totals['status'].items()):
+        emoji = status_to_emoji(status)
+        percentage = round(count / total * 100, 1)
+        lines.append(f"| {emoji} {status.title()} | {count} | {percentage}% |")
+    
+    lines.append("")
+    
+    # System breakdown
+    lines.append("### System Distribution")
+    lines.append("| System | Count | Description |")
+    lines.append("|--------|-------|-------------|")
+    
+    system_names = {
+        'I': 'IdeaVim only',
+        'W': 'WebStorm only', 
+        'K': 'Karabiner only',
+        'W+I': 'WebStorm + IdeaVim',
+        'K+W': 'Karabiner + WebStorm',
+        'K+I': 'Karabiner + IdeaVim',
+        'K+W+I': 'All systems',
+        '-': 'Not implemented'
+    }
+    
+    for system, count in sorted(totals['system'].items()):
+        desc = system_names.get(system, 'Unknown')
+        lines.append(f"| {system} | {count} | {desc} |")
+    
+    # Additional statistics similar to the original function
+    if totals['sequence_type']:
+        lines.append("")
+        lines.append("### Sequence Types")
+        lines.append("| Type | Count | Description |")
+        lines.append("|------|-------|-------------|")
+        
+        type_descriptions = {
+            'double_tap': 'Double key press within timeout',
+            'long_press': 'Hold key for extended period',
+            'tap_hold': 'Different actions for tap vs hold',
+            'leader': 'Leader key prefix sequences',
+            'vim_prefix': 'Vim-style prefix commands',
+            'text_object': 'Vim text object operations',
+            'chord': 'Multiple keys pressed together'
+        }
+        
+        for seq_type, count in sorted(totals['sequence_type'].items()):
+            desc = type_descriptions.get(seq_type, 'Custom sequence type')
+            lines.append(f"| {seq_type} | {count} | {desc} |")
+
+    lines.append("")
+    return lines
+
+def generate_incremental_markdown(configs: List[ConfigFile], digests: List[str],
+                                  state: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Generate the multi-config document, re-rendering only changed files.
+    
+    ``state`` holds the rendered section and facet counters of every file from
+    the previous run, keyed by source path, plus the running facet totals. Sections
+    of files whose content digest is unchanged are reused as-is; the totals
+    are updated by subtracting the old counters of changed or removed files
+    and adding their new ones. ``state`` is updated in place.
+    
+    Returns the markdown and the number of sections that were re-rendered.
+    """
+    files = state.setdefault('files', {})
+    totals = state.setdefault('totals', {facet: Counter() for facet in FACETS})
+    current_keys = [config.source for config in configs]
+    rerendered = 0
+    
+    # Drop files that no longer exist from the totals
+    for key in set(files) - set(current_keys):
+        for facet in FACETS:
+            totals[facet] -= files[key]['counters'][facet]
+        del files[key]
+    
+    sections = []
+    for key, config, digest in zip(current_keys, configs, digests):
+        entry = files.get(key)
+        if entry is None or entry['digest'] != digest:
+            counters = collect_config_counters(config)
+            for facet in FACETS:
+                if entry is not None:
+                    totals[facet] -= entry['counters'][facet]
+                totals[facet] += counters[facet]
+            entry = files[key] = {
+                'digest': digest,
+                'section': '\n'.join(generate_config_section(config)),
+                'source_name': config_source_name(config),
+                'counters': counters
+            }
+            rerendered += 1
+        sections.append(entry['section'])
+    
+    source_files = [files[key]['source_name'] for key in current_keys]
+    markdown = assemble_multi_config_markdown(
+        render_multi_config_summary(totals), sections, source_files)
+    return markdown, rerendered
+
+def renderer_digest() -> str:
+    """Digest of the rendering code, so stored fragments are dropped when it changes."""
+    package_dir = Path(__file__).parent
+    return content_digest(b''.join(
+        (package_dir / name).read_bytes() for name in ('docs.py', 'model.py', 'aggregate.py')))
+
+def load_render_state(state_file: Path) -> Dict[str, Any]:
+    """Load persisted section fragments, or start fresh if they are stale."""
+    state = read_pickle(state_file)
+    if not isinstance(state, dict) or state.get('renderer') != renderer_digest():
+        return {'renderer': renderer_digest()}
+    return state
+
+def write_if_changed(output_file: Path, content: str) -> bool:
+    """Write content only if it differs from the file on disk."""
+    encoded = content.encode('utf-8')
+    try:
+        if output_file.read_bytes() == encoded:
+            return False
+    except FileNotFoundError:
+        pass
+    
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_bytes(encoded)
+    return True
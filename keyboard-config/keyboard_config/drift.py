@@ -0,0 +1,180 @@
+"""
+Drift between ``hjkl-actionid-mapping.yaml`` and the YAML binding data.
+
+The mapping file lists the intended IDE action of each modifier combination
+(``horizontal_navigation.<modifier>.actionid``). The data files record what
+is configured (``bindings.<modifier>.details.ide_action_id``). Both sides
+are read into dicts keyed by (navigation_type, modifier), with
+``'EditorLeft/EditorRight'`` pairs split into one action per key.
+
+``reconcile`` walks the union of keys once, a hash join with no nested
+scans, and classifies each (navigation_type, modifier, key):
+
+    match     both sides name the same action
+    swapped   the action is configured on the other key of the pair
+    mismatch  the sides name different actions
+    missing   the mapping names an action the data leaves unset
+    extra     the data configures an action the mapping does not list
+
+Mismatched actions are looked up in an action id index of the other side.
+``data_location`` tells where the data uses the mapping's action, and
+``mapping_location`` where the mapping lists the data's action.
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+
+from .loader import load_yaml
+from .model import ConfigFile
+
+DRIFT_FIELDNAMES = [
+    'navigation_type', 'modifier', 'key', 'status', 'mapping_action_id', 'data_action_id',
+    'data_location', 'mapping_location',
+]
+
+# Values meaning "no action" in either file
+UNSET = frozenset({'', '-'})
+
+PairKey = Tuple[str, str]  # (navigation_type, modifier)
+Side = Dict[PairKey, Tuple[str, ...]]
+
+class DriftRow(NamedTuple):
+    navigation_type: str
+    modifier: str
+    key: str
+    status: str
+    mapping_action_id: str
+    data_action_id: str
+    data_location: str
+    mapping_location: str
+
+def split_action_ids(value: str) -> Tuple[str, ...]:
+    """'EditorLeft/EditorRight' -> ('EditorLeft', 'EditorRight'); unset halves become ''."""
+    parts = tuple(part.strip() for part in str(value).split('/'))
+    return tuple('' if part in UNSET else part for part in parts)
+
+def load_action_mapping(mapping_file: Path) -> Side:
+    """Read the ``<type>_navigation`` sections of the mapping file."""
+    with open(mapping_file, 'rb') as f:
+        document = load_yaml(f) or {}
+    mapping: Side = {}
+    for section, entries in document.items():
+        if not section.endswith('_navigation') or not isinstance(entries, dict):
+            continue
+        navigation_type = section[:-len('_navigation')]
+        for modifier, entry in entries.items():
+            mapping[(navigation_type, modifier)] = split_action_ids(entry.get('actionid', ''))
+    return mapping
+
+def data_action_ids(configs: Iterable[ConfigFile],
+                    navigation_types: Optional[Iterable[str]] = None) -> Tuple[Side, Dict[str, Tuple[str, ...]]]:
+    """
+    The ide_action_id of every plain modifier binding, and the keys of each navigation type.
+
+    Leader, sequence and chord bindings have no modifier combination to
+    compare against and are left out.
+    """
+    wanted = set(navigation_types) if navigation_types is not None else None
+    data: Side = {}
+    keys: Dict[str, Tuple[str, ...]] = {}
+    for config in configs:
+        if wanted is not None and config.navigation_type not in wanted:
+            continue
+        keys.setdefault(config.navigation_type, config.keys)
+        for binding in config.bindings:
+            if binding.modifiers is None or binding.sequence_type:
+                continue
+            data[(config.navigation_type, binding.binding_key)] = split_action_ids(binding.ide_action_id)
+    return data, keys
+
+def index_action_ids(side: Side) -> Dict[str, List[Tuple[str, str, int]]]:
+    """Action id -> every (navigation_type, modifier, position) that names it."""
+    index: Dict[str, List[Tuple[str, str, int]]] = {}
+    for (navigation_type, modifier), action_ids in side.items():
+        for position, action_id in enumerate(action_ids):
+            # A data value like 'PreviousTab|ChangesView.ShelveSilently' lists alternatives
+            for alternative in action_id.split('|'):
+                if alternative:
+                    index.setdefault(alternative, []).append((navigation_type, modifier, position))
+    return index
+
+def _pair_value(action_ids: Tuple[str, ...], position: int, width: int) -> str:
+    if not action_ids:
+        return ''
+    # A single unsplit value covers every key of the pair
+    if len(action_ids) == 1 and width > 1:
+        return action_ids[0]
+    return action_ids[position] if position < len(action_ids) else ''
+
+def _same_action(mapping_id: str, data_id: str) -> bool:
+    return mapping_id == data_id or mapping_id in data_id.split('|')
+
+def reconcile(mapping: Side, data: Side, keys: Dict[str, Sequence[str]]) -> List[DriftRow]:
+    """Join both sides on (navigation_type, modifier) and classify every key of every pair."""
+    mapping_index = index_action_ids(mapping)
+    data_index = index_action_ids(data)
+
+    def key_name(navigation_type: str, position: int) -> str:
+        names = keys.get(navigation_type, ())
+        return names[position] if position < len(names) else str(position + 1)
+
+    def locations(index, action_id, exclude):
+        found = []
+        for alternative in action_id.split('|'):
+            for navigation_type, modifier, position in index.get(alternative, ()):
+                if (navigation_type, modifier, position) != exclude:
+                    found.append(f"{navigation_type}.{modifier}:{key_name(navigation_type, position)}")
+        return ' '.join(dict.fromkeys(found))
+
+    rows = []
+    # Mapping order first, then pairs only the data has
+    for pair in dict.fromkeys(list(mapping) + list(data)):
+        navigation_type, modifier = pair
+        mapping_ids = mapping.get(pair, ())
+        data_ids = data.get(pair, ())
+        width = max(len(mapping_ids), len(data_ids))
+        for position in range(width):
+            mapping_id = _pair_value(mapping_ids, position, width)
+            data_id = _pair_value(data_ids, position, width)
+            if not mapping_id and not data_id:
+                continue
+            data_location = mapping_location = ''
+            if mapping_id and data_id and _same_action(mapping_id, data_id):
+                status = 'match'
+            elif not data_id:
+                status = 'missing'
+            elif not mapping_id:
+                status = 'extra'
+            elif any(_same_action(mapping_id, _pair_value(data_ids, other, width))
+                     for other in range(width) if other != position):
+                status = 'swapped'
+            else:
+                status = 'mismatch'
+            if status != 'match':
+                here = (navigation_type, modifier, position)
+                if mapping_id:
+                    data_location = locations(data_index, mapping_id, here)
+                if data_id:
+                    mapping_location = locations(mapping_index, data_id, here)
+            # An unsplit value names one action for the whole pair
+            key = '/'.join(keys.get(navigation_type, ())) if width == 1 else key_name(navigation_type, position)
+            rows.append(DriftRow(navigation_type, modifier, key or key_name(navigation_type, position), status,
+                                 mapping_id, data_id, data_location, mapping_location))
+    return rows
+
+def write_drift_csv(rows: Iterable[DriftRow], output: TextIO) -> None:
+    writer = csv.writer(output)
+    writer.writerow(DRIFT_FIELDNAMES)
+    writer.writerows(rows)
+
+def write_drift_json(rows: Iterable[DriftRow], output: TextIO) -> None:
+    json.dump([row._asdict() for row in rows], output, indent=2)
+    output.write('\n')
+
+def count_statuses(rows: Iterable[DriftRow]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for row in rows:
+        counts[row.status] = counts.get(row.status, 0) + 1
+    return counts
@@ -0,0 +1,203 @@
+"""
+Buffered JSON-line logging for the hooks.
+
+Each log under ``.claude/hooks/logs/`` gets one ``HookLogger``. Callers
+only enqueue a record, and a background thread writes them in batches
+through a single open handle. A parse error reported a thousand times
+therefore costs a thousand queue puts, not a thousand ``open`` calls.
+A log that would grow past ``max_bytes`` is rotated to ``name.log.1``
+(older copies shift up to ``backup_count``).
+
+Records are JSON objects, one per line:
+
+    {"time": "2025-01-01T12:00:00.123", "level": "info", "message": "...", "duration_ms": 12.5}
+
+Shell hooks write the same fields without starting Python (see
+``hooks/hooklog.sh``), with times to the second. From the command line:
+
+    python -m keyboard_config.hooklog NAME MESSAGE [--level error] [--duration-ms 12.5]
+"""
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_MAX_BYTES = 1 << 20
+DEFAULT_BACKUP_COUNT = 3
+# Records written per batch before the handle is flushed
+BATCH_SIZE = 256
+
+_CLOSE = object()
+
+class HookLogger:
+    """Queue-fed writer of JSON-line records to one rotating log file."""
+
+    def __init__(self, log_file: Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT):
+        self.log_file = Path(log_file)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._handle = None
+        self._size = 0
+
+    def log(self, message: str, level: str = 'info', duration: Optional[float] = None,
+            **fields: Any) -> None:
+        """Queue a record; ``duration`` is in seconds and written as duration_ms."""
+        record: Dict[str, Any] = {'message': message, 'level': level}
+        if duration is not None:
+            record['duration_ms'] = round(duration * 1000, 3)
+        record.update(fields)
+        # Timestamps are formatted on the writer thread
+        self._queue.put((time.time(), record))
+        if self._thread is None:
+            self._start()
+
+    @contextmanager
+    def timed(self, message: str, **fields: Any) -> Iterator[None]:
+        """Log message with the duration of the enclosed block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.log(message, duration=time.perf_counter() - started, **fields)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every queued record is on disk."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the remaining records and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_CLOSE)
+        thread.join(timeout)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"hooklog-{self.log_file.stem}",
+                                                daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = False
+            waiters = []
+            # Drain whatever else is already queued into the same write
+            while True:
+                if item is _CLOSE:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+                return
+
+    def _write(self, batch) -> None:
+        lines = []
+        for timestamp, record in batch:
+            stamped = {'time': datetime.fromtimestamp(timestamp).isoformat(timespec='milliseconds')}
+            stamped.update(record)
+            lines.append(json.dumps(stamped, ensure_ascii=False, default=str) + '\n')
+        data = ''.join(lines).encode('utf-8')
+
+        try:
+            if self._handle is None:
+                self._open()
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._handle.write(data)
+            self._handle.flush()
+            self._size += len(data)
+        except OSError:
+            # Logging must never take a hook down
+            pass
+
+    def _open(self) -> None:
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.log_file, 'ab')
+        self._size = self._handle.tell()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            older = self.log_file.with_name(f"{self.log_file.name}.{index}")
+            if older.exists():
+                os.replace(older, self.log_file.with_name(f"{self.log_file.name}.{index + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.log_file, self.log_file.with_name(f"{self.log_file.name}.1"))
+        else:
+            self.log_file.unlink()
+        self._open()
+
+_loggers: Dict[Path, HookLogger] = {}
+_loggers_lock = threading.Lock()
+
+def default_log_dir(project_dir: Optional[Path] = None) -> Path:
+    """The hook log directory of a project (default: $CLAUDE_PROJECT_DIR or the cwd)."""
+    project_dir = Path(project_dir or os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+    return project_dir / '.claude' / 'hooks' / 'logs'
+
+def get_logger(name: str, project_dir: Optional[Path] = None) -> HookLogger:
+    """Return the shared logger for ``<log dir>/<name>.log``."""
+    log_file = default_log_dir(project_dir) / f"{name}.log"
+    with _loggers_lock:
+        logger = _loggers.get(log_file)
+        if logger is None:
+            logger = _loggers[log_file] = HookLogger(log_file)
+        return logger
+
+@atexit.register
+def close_all() -> None:
+    """Write out every logger's queue; runs at interpreter exit."""
+    with _loggers_lock:
+        loggers = list(_loggers.values())
+    for logger in loggers:
+        logger.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Append a JSON-line record to a hook log')
+    parser.add_argument('name', help="Log name, e.g. 'yaml-validation' for yaml-validation.log")
+    parser.add_argument('message')
+    parser.add_argument('--level', default='info')
+    parser.add_argument('--duration-ms', type=float)
+    args = parser.parse_args()
+
+    duration = args.duration_ms / 1000 if args.duration_ms is not None else None
+    get_logger(args.name).log(args.message, level=args.level, duration=duration)
+
+if __name__ == '__main__':
+    main()
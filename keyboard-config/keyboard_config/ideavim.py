@@ -0,0 +1,120 @@
+"""
+Scanning key mappings out of .ideavimrc files.
+
+A single precompiled pattern recognises every map command form
+(``map``/``noremap`` with any of the ``n v x s o i c l t`` mode prefixes,
+``map!``/``noremap!``), the ``<silent>``/``<buffer>``/... flags, and
+``let mapleader``/``let maplocalleader`` assignments. Lines are consumed
+one at a time, so the whole file is never held in memory.
+
+``<leader>`` and ``<localleader>`` in a mapping's left-hand side are
+expanded with the leader that is in effect at that line, matching Vim's
+behaviour of resolving the leader when the mapping is defined.
+"""
+
+import re
+from typing import Iterable, Iterator, NamedTuple, Tuple
+
+DEFAULT_LEADER = '\\'
+
+MAPPING_LINE_RE = re.compile(r'''
+    ^\s*(?:
+        let\s+(?:g:)?(?P<leader_kind>map(?:local)?leader)\s*=\s*
+            (?P<leader_value>"(?:[^"\\]|\\.)*"|'(?:[^']|'')*')
+      |
+        (?P<command>(?P<mode>[nvxsoilct]?)(?:nore)?map)(?P<bang>!)?
+        (?P<flags>(?:\s*<(?i:silent|buffer|nowait|expr|unique|special|script)>)*)
+        \s+(?P<lhs>\S+)\s+(?P<rhs>\S(?:.*\S)?)
+    )''', re.VERBOSE)
+
+LEADER_RE = re.compile(r'<(local)?leader>', re.IGNORECASE)
+FLAG_RE = re.compile(r'<(\w+)>')
+
+# Modes covered by each map command prefix (see :help map-overview)
+MAP_MODES = {
+    '': ('normal', 'visual', 'select', 'operator'),
+    'n': ('normal',),
+    'v': ('visual', 'select'),
+    'x': ('visual',),
+    's': ('select',),
+    'o': ('operator',),
+    'i': ('insert',),
+    'c': ('cmdline',),
+    'l': ('insert', 'cmdline', 'lang'),
+    't': ('terminal',),
+}
+BANG_MODES = ('insert', 'cmdline')
+
+class VimMapping(NamedTuple):
+    """A single key mapping defined in a vimrc."""
+    line_num: int
+    command: str
+    modes: Tuple[str, ...]
+    flags: Tuple[str, ...]
+    lhs: str
+    rhs: str
+
+def decode_leader(value: str) -> str:
+    """Decode a quoted ``let mapleader`` value into the key notation it stands for."""
+    inner = value[1:-1]
+    if value.startswith('"'):
+        if inner.startswith('\\<') and inner.endswith('>'):
+            inner = inner[1:]
+        else:
+            inner = re.sub(r'\\(.)', r'\1', inner)
+    else:
+        inner = inner.replace("''", "'")
+    return '<Space>' if inner == ' ' else inner
+
+def read_leader(lines: Iterable[str]) -> str:
+    """Return the mapleader in effect at the end of a vimrc."""
+    leader = DEFAULT_LEADER
+    for line in lines:
+        if 'mapleader' in line:
+            match = MAPPING_LINE_RE.match(line)
+            if match and match.group('leader_kind') == 'mapleader':
+                leader = decode_leader(match.group('leader_value'))
+    return leader
+
+def iter_mappings(lines: Iterable[str]) -> Iterator[VimMapping]:
+    """Yield the mappings defined by an iterable of vimrc lines."""
+    leaders = {'leader': DEFAULT_LEADER, 'localleader': DEFAULT_LEADER}
+    expand_leader = lambda m: leaders['localleader' if m.group(1) else 'leader']
+    expanded = {}  # lhs -> lhs with the current leaders
+    match_line = MAPPING_LINE_RE.match
+    expand_leaders = LEADER_RE.sub
+    new_mapping = tuple.__new__
+
+    for line_num, line in enumerate(lines, 1):
+        # Every recognised line contains 'map'; skip the rest without the regex
+        if 'map' not in line:
+            continue
+        match = match_line(line)
+        if match is None:
+            continue
+
+        leader_kind, leader_value, command, mode, bang, flags, lhs, rhs = match.groups()
+        if leader_kind:
+            kind = 'localleader' if leader_kind == 'maplocalleader' else 'leader'
+            leaders[kind] = decode_leader(leader_value)
+            expanded.clear()
+            continue
+
+        if '<' in lhs:
+            expansion = expanded.get(lhs)
+            if expansion is None:
+                expansion = expanded[lhs] = expand_leaders(expand_leader, lhs)
+            lhs = expansion
+
+        if bang:
+            # Only the bare map!/noremap! forms take a bang
+            if mode:
+                continue
+            command += '!'
+            modes = BANG_MODES
+        else:
+            modes = MAP_MODES[mode]
+        flags = tuple(FLAG_RE.findall(flags.lower())) if flags else ()
+
+        # tuple.__new__ skips the Python-level NamedTuple constructor
+        yield new_mapping(VimMapping, (line_num, command, modes, flags, lhs, rhs))
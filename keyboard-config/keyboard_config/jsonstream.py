@@ -0,0 +1,127 @@
+"""
+Minimal pull reader for walking large JSON documents with bounded memory.
+
+The reader buffers a file in chunks and lets the caller step through
+objects and arrays member by member. Only the values the caller asks for are
+decoded, each one with ``json.JSONDecoder.raw_decode`` (the C scanner).
+Values the caller skips are decoded and dropped straight away. Memory use is
+therefore bounded by the largest single value requested or skipped, not by
+the document size.
+"""
+
+import json
+from typing import Any, IO, Iterator
+
+WHITESPACE = ' \t\n\r'
+
+class JsonStreamError(ValueError):
+    """Raised when the stream does not have the expected JSON structure."""
+
+class JsonStream:
+    """Chunked pull reader over a JSON text file."""
+
+    def __init__(self, f: IO[str], chunk_size: int = 1 << 16):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Drop consumed input and read another chunk; return False at EOF."""
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        chunk = self._file.read(max(self._chunk_size, min_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be ``char``."""
+        found = self.peek()
+        if found != char:
+            raise JsonStreamError(f"expected '{char}' but found '{found or 'EOF'}'")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decode and return the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Value is cut off by the chunk boundary; read more and retry
+                if not self._fill(len(self._buf)):
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buf) and not self._eof and self._fill(len(self._buf)):
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Consume the next JSON value without keeping it."""
+        self.read_value()
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the next JSON object.
+
+        After each key is yielded the caller must consume its value with
+        ``read_value``, ``skip_value`` or a nested iterator.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise JsonStreamError(f"expected object key but found {key!r}")
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise JsonStreamError(f"expected ',' or '}}' but found '{separator or 'EOF'}'")
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Iterate over the elements of the next JSON array.
+
+        Yields each element's index; the caller must consume the element.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            separator = self.peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise JsonStreamError(f"expected ',' or ']' but found '{separator or 'EOF'}'")
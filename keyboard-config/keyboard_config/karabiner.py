@@ -0,0 +1,104 @@
+"""
+Reading Karabiner-Elements configuration files.
+
+``iter_manipulators`` walks ``profiles → complex_modifications.rules →
+manipulators`` and yields each manipulator with the rule it belongs to.
+Small files are loaded whole with ``json.load``. Files of at least
+``STREAMING_THRESHOLD_BYTES`` are read through ``JsonStream``, so only one
+rule is held in memory at a time. This matters for generated configs with
+many profiles that run past 100k lines.
+
+``load_profile_rules`` returns the rules of one profile, in evaluation
+order, for the tools that analyze or rewrite them.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .jsonstream import JsonStream
+from .manipulators import canonical_json
+
+STREAMING_THRESHOLD_BYTES = 1 << 20
+
+Manipulator = Tuple[Dict[str, Any], Dict[str, Any]]
+
+def iter_manipulators(json_path: Path, streaming: Optional[bool] = None) -> Iterator[Manipulator]:
+    """
+    Yield (rule, manipulator) pairs from every profile of a karabiner.json.
+
+    ``streaming`` forces the streaming (True) or full (False) loader; by
+    default streaming is used for files of at least STREAMING_THRESHOLD_BYTES.
+    """
+    if streaming is None:
+        streaming = os.path.getsize(json_path) >= STREAMING_THRESHOLD_BYTES
+    if streaming:
+        yield from _iter_manipulators_streaming(json_path)
+    else:
+        yield from _iter_manipulators_full(json_path)
+
+FromKey = Tuple[str, Tuple[str, ...], Tuple[str, ...], str, Tuple[str, ...]]
+
+def iter_from_keys(json_path: Path, streaming: Optional[bool] = None) -> Iterator[FromKey]:
+    """
+    Yield (from.key_code, mandatory modifiers, optional modifiers, rule description, conditions) per manipulator.
+
+    Conditions are canonical JSON strings, as in ``manipulators``.
+    """
+    for rule, manip in iter_manipulators(json_path, streaming):
+        from_key = manip.get('from', {})
+        key_code = from_key.get('key_code', '')
+        if key_code:
+            modifiers = from_key.get('modifiers', {})
+            conditions = tuple(canonical_json(condition) for condition in manip.get('conditions', []))
+            yield (key_code, tuple(modifiers.get('mandatory', [])), tuple(modifiers.get('optional', [])),
+                   rule.get('description', 'Karabiner rule'), conditions)
+
+def select_profile(data: Dict[str, Any], profile: Optional[str] = None) -> Dict[str, Any]:
+    """The named profile of a loaded karabiner.json, or the selected (else first) one."""
+    profiles = data.get('profiles', [])
+    if profile is not None:
+        for candidate in profiles:
+            if candidate.get('name') == profile:
+                return candidate
+        raise ValueError(f"No Karabiner profile named '{profile}'")
+    if not profiles:
+        raise ValueError("karabiner.json has no profiles")
+    return next((candidate for candidate in profiles if candidate.get('selected')), profiles[0])
+
+def load_profile_rules(json_path: Path, profile: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """Return (profile name, complex_modifications rules) of one profile (see ``select_profile``)."""
+    with open(json_path, 'r') as f:
+        selected = select_profile(json.load(f), profile)
+    return selected.get('name', ''), selected.get('complex_modifications', {}).get('rules', [])
+
+def _iter_manipulators_full(json_path: Path) -> Iterator[Manipulator]:
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    for profile in data.get('profiles', []):
+        for rule in profile.get('complex_modifications', {}).get('rules', []):
+            for manip in rule.get('manipulators', []):
+                yield rule, manip
+
+def _iter_manipulators_streaming(json_path: Path) -> Iterator[Manipulator]:
+    with open(json_path, 'r') as f:
+        stream = JsonStream(f)
+        for key in stream.iter_object():
+            if key != 'profiles':
+                stream.skip_value()
+                continue
+            for _ in stream.iter_array():
+                for profile_key in stream.iter_object():
+                    if profile_key != 'complex_modifications':
+                        stream.skip_value()
+                        continue
+                    for modifications_key in stream.iter_object():
+                        if modifications_key != 'rules':
+                            stream.skip_value()
+                            continue
+                        for _ in stream.iter_array():
+                            rule = stream.read_value()
+                            for manip in rule.get('manipulators', []):
+                                yield rule, manip
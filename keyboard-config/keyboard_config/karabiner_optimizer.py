@@ -0,0 +1,405 @@
+"""
+Rewriting a Karabiner profile so key events scan fewer manipulators.
+
+``optimize_rules`` takes the rules of one profile (see
+``karabiner.load_profile_rules``) and returns equivalent rules:
+
+    dead        manipulators shadowed by an earlier one, or whose conditions
+                contradict each other, are removed; rules left empty go too
+    conditions  a condition listed twice in one manipulator is kept once
+    order       manipulators within each rule, then whole rules, are sorted
+                so the most frequently pressed trigger keys come first
+
+Only manipulators that can never compete for an event change their
+relative order. Two manipulators interact when they share a trigger key,
+some modifier state is accepted by both and their conditions can hold at
+the same time. A manipulator of a type other than basic, or triggered by
+``from.any``, interacts with everything. Each reorder is a topological
+sort of the original order over interacting pairs that takes the most
+frequent ready trigger first.
+
+``verify_equivalent`` is the proof. For every trigger key it replays all
+1024 physical modifier states, under every assignment of the condition
+atoms, against both rule lists. Each variable takes every value it is
+compared with plus one other value, and every other condition is true or
+false. It then compares which manipulators take the event: the
+simultaneous ones that wait for their other keys, then the one that fires.
+"""
+
+import heapq
+import itertools
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .chords import ALL_STATES, BOTH, FAMILIES, FAMILY_SHIFT, LEFT, MODIFIER_MASK, RELEASED, RIGHT, chords_collide
+from .manipulators import (PHYSICAL_STATES, UNSIDED_FAMILIES, CompiledManipulator, ManipulatorIndex, canonical_json,
+                           compile_manipulators, condition_atom, conditions_hold, contradictory, find_shadowed)
+
+# Relative key press frequencies: English letters per 100, plus common editing keys
+DEFAULT_KEY_FREQUENCIES: Dict[str, float] = {
+    'spacebar': 18.0, 'e': 12.7, 't': 9.1, 'a': 8.2, 'o': 7.5, 'i': 7.0, 'n': 6.7, 's': 6.3, 'h': 6.1,
+    'r': 6.0, 'delete_or_backspace': 5.0, 'd': 4.3, 'l': 4.0, 'left_shift': 3.0, 'c': 2.8, 'u': 2.8,
+    'm': 2.4, 'w': 2.4, 'f': 2.2, 'return_or_enter': 2.0, 'g': 2.0, 'y': 2.0, 'p': 1.9,
+    'left_command': 1.5, 'b': 1.5, 'period': 1.2, 'comma': 1.2, 'right_shift': 1.0, 'v': 1.0,
+    'tab': 0.8, 'k': 0.8, 'escape': 0.6, 'down_arrow': 0.5, 'up_arrow': 0.5, 'left_arrow': 0.5,
+    'right_arrow': 0.5, 'semicolon': 0.4, 'slash': 0.4, 'hyphen': 0.4, 'quote': 0.4,
+    'left_control': 0.3, 'left_option': 0.3, 'right_command': 0.3, 'open_bracket': 0.2,
+    'close_bracket': 0.2, 'equal_sign': 0.2, 'j': 0.15, 'x': 0.15, 'q': 0.1, 'z': 0.07,
+}
+
+# Condition assignments replayed per trigger key before it is reported as unverified
+MAX_ENVIRONMENTS = 1 << 16
+
+# Mismatches kept in a proof; one is enough to reject a rewrite
+MAX_MISMATCHES = 20
+
+class _OtherValue:
+    """A variable value no condition compares with."""
+
+    def __repr__(self) -> str:
+        return '<other>'
+
+OTHER_VALUE = _OtherValue()
+
+class RemovedManipulator(NamedTuple):
+    manipulator: CompiledManipulator
+    reason: str
+
+class Optimization(NamedTuple):
+    """Rewritten rules and what changed to get them."""
+    rules: List[Dict[str, Any]]
+    removed: List[RemovedManipulator]
+    removed_rules: List[str]                            # descriptions of rules left empty
+    merged_conditions: List[Tuple[CompiledManipulator, int]]  # (manipulator, duplicates dropped)
+    moved_rules: int
+    moved_manipulators: int                             # within their rule
+    scans_before: float                                 # see expected_scans
+    scans_after: float
+
+class Mismatch(NamedTuple):
+    trigger: str
+    state: str        # held modifiers
+    environment: str  # condition atom values
+    before: Tuple[str, ...]
+    after: Tuple[str, ...]
+
+class Proof(NamedTuple):
+    """Result of replaying every (trigger, modifier state, condition environment) event."""
+    triggers: int
+    environments: int  # summed over triggers
+    events: int
+    mismatches: List[Mismatch]
+    unverified: List[str]  # triggers with more than MAX_ENVIRONMENTS environments
+
+    @property
+    def equivalent(self) -> bool:
+        return not self.mismatches and not self.unverified
+
+def is_barrier(manipulator: CompiledManipulator) -> bool:
+    """True for manipulators that may take any event and so keep their place."""
+    data = manipulator.manipulator
+    return data.get('type', 'basic') != 'basic' or 'any' in data.get('from', {})
+
+@lru_cache(maxsize=None)
+def _exclusive(a: Tuple[str, ...], b: Tuple[str, ...]) -> bool:
+    return contradictory(a + b)
+
+def interacts(a: CompiledManipulator, b: CompiledManipulator) -> bool:
+    """True when some event could be taken by both manipulators."""
+    if is_barrier(a) or is_barrier(b):
+        return True
+    if not set(a.triggers) & set(b.triggers):
+        return False
+    return chords_collide(a.accepts, b.accepts) and not (a.conditions and b.conditions
+                                                         and _exclusive(a.conditions, b.conditions))
+
+def trigger_frequency(manipulator: CompiledManipulator, frequencies: Dict[str, float]) -> float:
+    """How often the manipulator is tried first; simultaneous keys count as the rarest one."""
+    return min(frequencies.get(trigger, 0.0) for trigger in manipulator.triggers)
+
+def priority_order(count: int, edges: Dict[int, Set[int]], priority: Sequence[float]) -> List[int]:
+    """
+    Order range(count) so every edge i -> j keeps i first, highest priority first.
+
+    Edges always point forwards, so the original order is one solution.
+    Ties go to the earlier item.
+    """
+    indegree = [0] * count
+    for targets in edges.values():
+        for target in targets:
+            indegree[target] += 1
+    ready = [(-priority[item], item) for item in range(count) if not indegree[item]]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, item = heapq.heappop(ready)
+        order.append(item)
+        for target in edges.get(item, ()):
+            indegree[target] -= 1
+            if not indegree[target]:
+                heapq.heappush(ready, (-priority[target], target))
+    return order
+
+def expected_scans(manipulators: Sequence[CompiledManipulator], frequencies: Dict[str, float]) -> float:
+    """
+    Mean manipulators scanned before the first candidate of a key event, weighted by key frequency.
+
+    Only modifier states some candidate accepts are counted: events nothing
+    accepts scan the whole profile whatever the order.
+    """
+    index = ManipulatorIndex(manipulators)
+    total = weight = 0.0
+    for trigger, candidates in index.by_trigger.items():
+        frequency = frequencies.get(trigger, 0.0)
+        if not frequency:
+            continue
+        reached = []
+        for state in PHYSICAL_STATES:
+            scans = next((candidate.index + 1 for candidate in candidates if candidate.accepts_state(state)), None)
+            if scans is not None:
+                reached.append(scans)
+        if reached:
+            total += frequency * sum(reached) / len(reached)
+            weight += frequency
+    return total / weight if weight else 0.0
+
+def find_dead(index: ManipulatorIndex) -> Dict[int, str]:
+    """Manipulator index -> why it can never fire."""
+    dead = {}
+    for manipulator in index.manipulators:
+        if manipulator.conditions and contradictory(manipulator.conditions):
+            dead[manipulator.index] = 'conditions contradict each other'
+    for later, earlier in find_shadowed(index):
+        if not is_barrier(later) and not is_barrier(earlier):
+            dead.setdefault(later.index, f"shadowed by #{earlier.index} [{earlier.rule}]")
+    return dead
+
+def merge_conditions(manipulator: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """The manipulator with repeated conditions dropped, and how many were dropped."""
+    conditions = manipulator.get('conditions', [])
+    unique = list({canonical_json(condition): condition for condition in reversed(conditions)}.values())[::-1]
+    if len(unique) == len(conditions):
+        return manipulator, 0
+    return dict(manipulator, conditions=unique), len(conditions) - len(unique)
+
+def _rule_edges(rules: List[List[CompiledManipulator]]) -> Dict[int, Set[int]]:
+    """Edges between positions in ``rules`` whose manipulators interact."""
+    edges: Dict[int, Set[int]] = defaultdict(set)
+    barriers = [position for position, manipulators in enumerate(rules)
+                if any(is_barrier(manipulator) for manipulator in manipulators)]
+    for barrier in barriers:
+        for other in range(len(rules)):
+            if other < barrier:
+                edges[other].add(barrier)
+            elif other > barrier:
+                edges[barrier].add(other)
+
+    by_trigger: Dict[str, List[Tuple[int, CompiledManipulator]]] = defaultdict(list)
+    for position, manipulators in enumerate(rules):
+        for manipulator in manipulators:
+            for trigger in dict.fromkeys(manipulator.triggers):
+                by_trigger[trigger].append((position, manipulator))
+    for candidates in by_trigger.values():
+        for (first, earlier), (second, later) in itertools.combinations(candidates, 2):
+            if first != second and second not in edges[first] and interacts(earlier, later):
+                edges[first].add(second)
+    return edges
+
+def optimize_rules(rules: Sequence[Dict[str, Any]],
+                   frequencies: Optional[Dict[str, float]] = None) -> Optimization:
+    """Remove dead manipulators, merge repeated conditions and put frequent triggers first."""
+    frequencies = DEFAULT_KEY_FREQUENCIES if frequencies is None else frequencies
+    index = ManipulatorIndex.from_rules(rules)
+    dead = find_dead(index)
+    removed = [RemovedManipulator(manipulator, dead[manipulator.index])
+               for manipulator in index.manipulators if manipulator.index in dead]
+
+    kept: List[List[CompiledManipulator]] = [[] for _ in rules]
+    for manipulator in index.manipulators:
+        if manipulator.index not in dead:
+            kept[manipulator.rule_index].append(manipulator)
+    removed_rules = [rule.get('description', f"Rule {rule_index + 1}")
+                     for rule_index, rule in enumerate(rules) if not kept[rule_index] and rule.get('manipulators')]
+    rule_indexes = [rule_index for rule_index in range(len(rules))
+                    if kept[rule_index] or not rules[rule_index].get('manipulators')]
+
+    merged = []
+    moved_manipulators = 0
+    ordered_rules = []
+    for rule_index in rule_indexes:
+        manipulators = kept[rule_index]
+        edges: Dict[int, Set[int]] = defaultdict(set)
+        for first, second in itertools.combinations(range(len(manipulators)), 2):
+            if interacts(manipulators[first], manipulators[second]):
+                edges[first].add(second)
+        order = priority_order(len(manipulators), edges,
+                               [trigger_frequency(manipulator, frequencies) for manipulator in manipulators])
+        moved_manipulators += sum(1 for position, item in enumerate(order) if position != item)
+
+        rewritten = []
+        for item in order:
+            manipulator, dropped = merge_conditions(manipulators[item].manipulator)
+            if dropped:
+                merged.append((manipulators[item], dropped))
+            rewritten.append(manipulator)
+        ordered_rules.append((manipulators, dict(rules[rule_index], manipulators=rewritten)))
+
+    rule_manipulators = [manipulators for manipulators, _ in ordered_rules]
+    priority = []
+    for manipulators in rule_manipulators:
+        triggers = {trigger for manipulator in manipulators for trigger in manipulator.triggers}
+        # Frequent keys per manipulator scanned, so a short rule of hot keys goes first
+        priority.append(sum(frequencies.get(trigger, 0.0) for trigger in triggers) / max(len(manipulators), 1))
+    order = priority_order(len(ordered_rules), _rule_edges(rule_manipulators), priority)
+    new_rules = [ordered_rules[position][1] for position in order]
+
+    merged.sort(key=lambda item: item[0].index)
+    return Optimization(
+        new_rules, removed, removed_rules, merged,
+        sum(1 for position, item in enumerate(order) if position != item), moved_manipulators,
+        expected_scans(index.manipulators, frequencies),
+        expected_scans(compile_manipulators(new_rules), frequencies))
+
+class _Candidate(NamedTuple):
+    manipulator: CompiledManipulator
+    outcome: str                          # canonical JSON without conditions
+    atoms: Tuple[Tuple[str, Any, bool], ...]
+
+def _candidates(index: ManipulatorIndex, trigger: str,
+                barriers: List[CompiledManipulator]) -> List[_Candidate]:
+    by_position = {manipulator.index: manipulator for manipulator in index.candidates(trigger) + barriers}
+    manipulators = [by_position[position] for position in sorted(by_position)]
+    candidates = []
+    for manipulator in manipulators:
+        data = manipulator.manipulator
+        outcome = canonical_json({key: value for key, value in data.items() if key != 'conditions'})
+        atoms = tuple(condition_atom(condition) for condition in data.get('conditions', []))
+        candidates.append(_Candidate(manipulator, outcome, atoms))
+    return candidates
+
+def _outcome(candidates: Iterable[_Candidate], state: int, environment: Dict[str, Any]) -> Tuple[str, ...]:
+    """Manipulators taking the event: waiting simultaneous ones, then the one that fires."""
+    taken = []
+    for candidate in candidates:
+        if candidate.manipulator.accepts_state(state) and conditions_hold(candidate.atoms, environment):
+            taken.append(candidate.outcome)
+            if not candidate.manipulator.simultaneous:
+                break
+    return tuple(taken)
+
+def _environments(candidates: Iterable[_Candidate]) -> Tuple[List[str], List[List[Any]]]:
+    """Atoms of the candidates' conditions and the values each is replayed with."""
+    values: Dict[str, List[Any]] = {}
+    for candidate in candidates:
+        for atom, value, _ in candidate.atoms:
+            seen = values.setdefault(atom, [])
+            if value not in seen:
+                seen.append(value)
+    atoms = sorted(values)
+    domains = [values[atom] + [OTHER_VALUE] if atom.startswith('variable:') else [True, False] for atom in atoms]
+    return atoms, domains
+
+SIDE_PREFIXES = {LEFT: ('left_',), RIGHT: ('right_',), BOTH: ('left_', 'right_')}
+
+def describe_state(state: int) -> str:
+    """Held modifiers of a physical state, e.g. 'left_cmd+right_shift'; 'none' when nothing is held."""
+    held = []
+    for family in FAMILIES:
+        nibble = state >> FAMILY_SHIFT[family] & ALL_STATES
+        if nibble == RELEASED:
+            continue
+        if family in UNSIDED_FAMILIES:
+            held.append(family)
+        else:
+            held.extend(prefix + family for prefix in SIDE_PREFIXES[nibble])
+    return '+'.join(held) or 'none'
+
+def verify_equivalent(before: Sequence[Dict[str, Any]], after: Sequence[Dict[str, Any]],
+                      max_environments: int = MAX_ENVIRONMENTS) -> Proof:
+    """Replay every trigger key in every modifier state and condition environment against both rule lists."""
+    before_index = ManipulatorIndex.from_rules(before)
+    after_index = ManipulatorIndex.from_rules(after)
+    before_barriers = [manipulator for manipulator in before_index.manipulators if is_barrier(manipulator)]
+    after_barriers = [manipulator for manipulator in after_index.manipulators if is_barrier(manipulator)]
+    triggers = sorted(set(before_index.by_trigger) | set(after_index.by_trigger))
+
+    environments = events = 0
+    mismatches: List[Mismatch] = []
+    unverified = []
+    for trigger in triggers:
+        old = _candidates(before_index, trigger, before_barriers)
+        new = _candidates(after_index, trigger, after_barriers)
+        atoms, domains = _environments(old + new)
+        count = 1
+        for domain in domains:
+            count *= len(domain)
+        if count > max_environments:
+            unverified.append(trigger)
+            continue
+
+        # States accepted by the same candidates replay identically; one per class covers all 1024
+        masks = sorted({candidate.manipulator.accepts for candidate in old + new})
+        classes: Dict[Tuple[bool, ...], int] = {}
+        for state in PHYSICAL_STATES:
+            signature = tuple(not state & ~mask & MODIFIER_MASK for mask in masks)
+            classes.setdefault(signature, state)
+
+        for values in itertools.product(*domains):
+            environment = dict(zip(atoms, values))
+            for state in classes.values():
+                before_outcome = _outcome(old, state, environment)
+                after_outcome = _outcome(new, state, environment)
+                if before_outcome != after_outcome and len(mismatches) < MAX_MISMATCHES:
+                    described = ', '.join(f"{atom}={value!r}" for atom, value in environment.items())
+                    mismatches.append(Mismatch(trigger, describe_state(state), described or 'none',
+                                               before_outcome, after_outcome))
+        environments += count
+        events += count * len(PHYSICAL_STATES)
+    return Proof(len(triggers), environments, events, mismatches, unverified)
+
+def format_report(optimization: Optimization, proof: Proof, source: str, profile: str) -> str:
+    """Markdown report of a rewrite and its equivalence proof."""
+    lines = [
+        f"# Karabiner optimization: {source}, profile '{profile}'",
+        '',
+        f"- Manipulators removed: {len(optimization.removed)}",
+        f"- Rules removed (left empty): {len(optimization.removed_rules)}",
+        f"- Manipulators with repeated conditions merged: {len(optimization.merged_conditions)}",
+        f"- Rules moved: {optimization.moved_rules}",
+        f"- Manipulators moved within their rule: {optimization.moved_manipulators}",
+        f"- Expected scans per accepted key event: {optimization.scans_before:.1f} -> {optimization.scans_after:.1f}",
+        '',
+        '## Equivalence proof',
+        '',
+        f"Replayed {proof.triggers} trigger keys x {len(PHYSICAL_STATES)} modifier states x their condition "
+        f"environments ({proof.environments} in total): {proof.events} events.",
+        '',
+    ]
+    if proof.equivalent:
+        lines.append('Result: **equivalent**. Every event is taken by the same manipulators before and after.')
+    else:
+        lines.append('Result: **not proven**.')
+        for trigger in proof.unverified:
+            lines.append(f"- `{trigger}`: more than {MAX_ENVIRONMENTS} condition environments, not replayed")
+        for mismatch in proof.mismatches:
+            lines.append(f"- `{mismatch.trigger}` with {mismatch.state}, conditions {mismatch.environment}: "
+                         f"{len(mismatch.before)} manipulator(s) before, {len(mismatch.after)} after")
+            for label, outcome in (('before', mismatch.before), ('after', mismatch.after)):
+                for manipulator in outcome:
+                    lines.append(f"  - {label}: `{manipulator}`")
+
+    if optimization.removed:
+        lines += ['', '## Removed manipulators', '']
+        lines += [f"- {item.manipulator.describe()}: {item.reason}" for item in optimization.removed]
+    if optimization.removed_rules:
+        lines += ['', '## Removed rules', '']
+        lines += [f"- {description}" for description in optimization.removed_rules]
+    if optimization.merged_conditions:
+        lines += ['', '## Merged conditions', '']
+        lines += [f"- {manipulator.describe()}: {dropped} repeated condition(s) dropped"
+                  for manipulator, dropped in optimization.merged_conditions]
+    lines += ['', '## Rule order', '']
+    lines += [f"{position}. {rule.get('description', '')}"
+              for position, rule in enumerate(optimization.rules, 1)]
+    return '\n'.join(lines) + '\n'
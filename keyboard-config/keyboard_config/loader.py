@@ -0,0 +1,84 @@
+"""
+YAML loading with the libyaml C backend when it is available.
+
+PyYAML's ``yaml.safe_load`` always uses the pure-Python scanner. This module
+picks ``yaml.CSafeLoader`` when PyYAML was built against libyaml and falls
+back to ``yaml.SafeLoader`` otherwise. Set ``KEYBOARD_CONFIG_YAML_BACKEND`` to
+``python`` to force the pure-Python loader.
+
+Run ``python -m keyboard_config.loader [files...]`` to print the active
+backend and check that both backends parse the given files (default: every
+file in ``data/``) into identical documents.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import yaml
+
+BACKEND_ENV_VAR = 'KEYBOARD_CONFIG_YAML_BACKEND'
+
+LOADERS: Dict[str, Type[yaml.SafeLoader]] = {'python': yaml.SafeLoader}
+if getattr(yaml, '__with_libyaml__', False) and hasattr(yaml, 'CSafeLoader'):
+    LOADERS['libyaml'] = yaml.CSafeLoader
+
+def yaml_backend() -> str:
+    """Return the name of the backend used by default ('libyaml' or 'python')."""
+    requested = os.environ.get(BACKEND_ENV_VAR, '').strip().lower()
+    if requested in LOADERS:
+        return requested
+    return 'libyaml' if 'libyaml' in LOADERS else 'python'
+
+def get_loader(backend: Optional[str] = None) -> Tuple[str, Type[yaml.SafeLoader]]:
+    """Return the (backend name, loader class) pair for a backend."""
+    name = backend or yaml_backend()
+    if name not in LOADERS:
+        raise ValueError(f"YAML backend '{name}' is not available (have: {', '.join(sorted(LOADERS))})")
+    return name, LOADERS[name]
+
+def load_yaml(stream: Any, backend: Optional[str] = None) -> Any:
+    """Parse a YAML document from a string, bytes or file object."""
+    _, loader = get_loader(backend)
+    return yaml.load(stream, Loader=loader)
+
+def load_yaml_file(file_path: Path, backend: Optional[str] = None) -> Any:
+    """Load and parse a YAML file."""
+    with open(file_path, 'rb') as f:
+        return load_yaml(f, backend)
+
+def check_backend_parity(files: List[Path]) -> List[str]:
+    """Parse files with every available backend and describe any differences."""
+    problems = []
+    names = sorted(LOADERS)
+    for file_path in files:
+        results = {name: load_yaml_file(file_path, name) for name in names}
+        reference = results[names[0]]
+        for name in names[1:]:
+            if results[name] != reference:
+                problems.append(f"{file_path}: '{name}' differs from '{names[0]}'")
+    return problems
+
+def main():
+    """Report the YAML backend and check backend parity on data files."""
+    if len(sys.argv) > 1:
+        files = [Path(arg) for arg in sys.argv[1:]]
+    else:
+        data_dir = Path(__file__).resolve().parent.parent / 'data'
+        files = sorted(p for p in data_dir.glob('*.yaml') if 'schema' not in p.name.lower())
+
+    print(f"YAML backend: {yaml_backend()} (available: {', '.join(sorted(LOADERS))})")
+    if len(LOADERS) < 2:
+        print("libyaml is not available; parity check skipped.")
+        return
+
+    problems = check_backend_parity(files)
+    for problem in problems:
+        print(f"✗ {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print(f"✓ Backends agree on {len(files)} files")
+
+if __name__ == '__main__':
+    main()
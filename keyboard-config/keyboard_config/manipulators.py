@@ -0,0 +1,275 @@
+"""
+Compiled Karabiner manipulators and what each key event costs to dispatch.
+
+Karabiner-Elements offers every key event to the manipulators of the active
+profile in order (rules first to last, manipulators within a rule) until
+one of them matches. ``compile_manipulators`` flattens the rules into
+``CompiledManipulator`` records. Each record has its trigger keys
+(``from.key_code`` or the ``from.simultaneous`` keys), the modifier states
+it accepts as a ``chords`` modifier mask, and its conditions as canonical
+JSON. ``ManipulatorIndex`` groups them by trigger key.
+
+A physical modifier state is a mask with exactly one bit per family
+(released, left, right or both sides held; fn and caps_lock are released or
+held), so a manipulator accepts a state when ``state & ~accepts`` has no
+modifier bits. ``PHYSICAL_STATES`` lists all 1024 of them. ``key_costs``
+replays every state against every key's candidates. ``find_shadowed`` and
+``repeated_conditions`` find manipulators that can never fire and
+conditions that are evaluated over and over.
+
+Conditions reduce to atoms (see ``condition_atom``): a variable compared
+with a value, or a boolean such as "frontmost application is WebStorm"
+that the ``_unless`` form negates. ``conditions_hold`` evaluates them
+against an environment of atom values and ``contradictory`` spots lists
+that can never all hold.
+"""
+
+import itertools
+import json
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .chords import (BOTH, FAMILIES, FAMILY_SHIFT, LEFT, MODIFIER_MASK, NO_MODIFIERS, RELEASED, RIGHT,
+                     format_chord, make_chord)
+
+# Families without sides are either released or held (encoded as the left bit)
+UNSIDED_FAMILIES = ('caps_lock', 'fn')
+
+def _physical_states() -> Tuple[int, ...]:
+    choices = []
+    for family in FAMILIES:
+        states = (RELEASED, LEFT) if family in UNSIDED_FAMILIES else (RELEASED, LEFT, RIGHT, BOTH)
+        choices.append([state << FAMILY_SHIFT[family] for state in states])
+    return tuple(sum(combination) for combination in itertools.product(*choices))
+
+PHYSICAL_STATES = _physical_states()
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+class CompiledManipulator(NamedTuple):
+    """A manipulator with its trigger and modifier constraints resolved."""
+    index: int                  # position in evaluation order across all rules
+    rule_index: int
+    rule: str                   # rule description
+    triggers: Tuple[str, ...]   # key codes; several for simultaneous
+    simultaneous: bool
+    accepts: int                # accepted modifier states (see chords)
+    exact: bool                 # False when a modifier name was not recognised
+    conditions: Tuple[str, ...]  # canonical JSON of each condition, in order
+    manipulator: Dict[str, Any]
+
+    def accepts_state(self, state: int) -> bool:
+        return not state & ~self.accepts & MODIFIER_MASK
+
+    def describe(self) -> str:
+        if self.simultaneous:
+            trigger = f"simultaneous({', '.join(self.triggers)})"
+        else:
+            chord = make_chord(self.triggers[0], self._mandatory(), self._optional()) if self.exact else None
+            trigger = format_chord(chord) if chord is not None else self.triggers[0]
+        return f"#{self.index} [{self.rule}] {trigger}"
+
+    def _mandatory(self) -> List[str]:
+        return self.manipulator.get('from', {}).get('modifiers', {}).get('mandatory', [])
+
+    def _optional(self) -> List[str]:
+        return self.manipulator.get('from', {}).get('modifiers', {}).get('optional', [])
+
+def manipulator_triggers(from_event: Dict[str, Any]) -> Tuple[Tuple[str, ...], bool]:
+    """(trigger keys, simultaneous) of a manipulator's ``from``."""
+    if 'simultaneous' in from_event:
+        keys = tuple(key.get('key_code') or canonical_json(key) for key in from_event['simultaneous'])
+        return keys, True
+    if 'key_code' in from_event:
+        return (from_event['key_code'],), False
+    # pointing_button, consumer_key_code, any: kept in their own namespace
+    return (canonical_json({key: value for key, value in from_event.items() if key != 'modifiers'}),), False
+
+def modifier_mask(modifiers: Dict[str, Any]) -> Tuple[int, bool]:
+    """(accepted modifier states, exact) of a ``from.modifiers`` object."""
+    chord = make_chord('a', modifiers.get('mandatory', []), modifiers.get('optional', []))
+    if chord is None:
+        # Unknown modifier name: assume it may match anything so nothing is claimed dead
+        return MODIFIER_MASK, False
+    return chord & MODIFIER_MASK, True
+
+def compile_manipulators(rules: Sequence[Dict[str, Any]]) -> List[CompiledManipulator]:
+    """Flatten a profile's rules into compiled manipulators in evaluation order."""
+    compiled = []
+    for rule_index, rule in enumerate(rules):
+        description = rule.get('description', f"Rule {rule_index + 1}")
+        for manipulator in rule.get('manipulators', []):
+            from_event = manipulator.get('from', {})
+            triggers, simultaneous = manipulator_triggers(from_event)
+            accepts, exact = modifier_mask(from_event.get('modifiers', {}))
+            conditions = tuple(canonical_json(condition) for condition in manipulator.get('conditions', []))
+            compiled.append(CompiledManipulator(len(compiled), rule_index, description, triggers,
+                                                simultaneous, accepts, exact, conditions, manipulator))
+    return compiled
+
+class ManipulatorIndex:
+    """Compiled manipulators grouped by trigger key, each group in evaluation order."""
+
+    def __init__(self, manipulators: Sequence[CompiledManipulator]):
+        self.manipulators = list(manipulators)
+        self.by_trigger: Dict[str, List[CompiledManipulator]] = defaultdict(list)
+        for manipulator in self.manipulators:
+            for trigger in dict.fromkeys(manipulator.triggers):
+                self.by_trigger[trigger].append(manipulator)
+
+    @classmethod
+    def from_rules(cls, rules: Sequence[Dict[str, Any]]) -> 'ManipulatorIndex':
+        return cls(compile_manipulators(rules))
+
+    def triggers(self) -> List[str]:
+        return sorted(self.by_trigger)
+
+    def candidates(self, trigger: str) -> List[CompiledManipulator]:
+        return self.by_trigger.get(trigger, [])
+
+def first_unconditional_match(candidates: Iterable[CompiledManipulator], state: int) -> Optional[CompiledManipulator]:
+    """The first candidate that fires on a single key press in this state whatever the conditions."""
+    for manipulator in candidates:
+        if not manipulator.simultaneous and not manipulator.conditions and manipulator.accepts_state(state):
+            return manipulator
+    return None
+
+def shadows(earlier: CompiledManipulator, later: CompiledManipulator) -> bool:
+    """
+    True when ``earlier`` fires on every event ``later`` would fire on.
+
+    That needs the same trigger, every modifier state of ``later`` accepted
+    by ``earlier`` and no condition on ``earlier`` that ``later`` lacks.
+    Simultaneous manipulators are never treated as shadowing or shadowed,
+    since which one fires depends on key timing.
+    """
+    return (earlier.index < later.index
+            and not earlier.simultaneous and not later.simultaneous
+            and earlier.exact and later.exact
+            and earlier.triggers == later.triggers
+            and not later.accepts & ~earlier.accepts
+            and set(earlier.conditions) <= set(later.conditions))
+
+def find_shadowed(index: ManipulatorIndex) -> List[Tuple[CompiledManipulator, CompiledManipulator]]:
+    """(unreachable manipulator, the earlier manipulator that shadows it) pairs."""
+    shadowed = []
+    for candidates in index.by_trigger.values():
+        for position, later in enumerate(candidates):
+            if later.simultaneous:
+                continue
+            for earlier in candidates[:position]:
+                if shadows(earlier, later):
+                    shadowed.append((later, earlier))
+                    break
+    return sorted(shadowed, key=lambda pair: pair[0].index)
+
+class KeyCost(NamedTuple):
+    """Dispatch cost of one trigger key over every physical modifier state."""
+    trigger: str
+    candidates: int              # manipulators with this trigger
+    conditional: int             # ... of which have conditions
+    plain_scans: int             # manipulators scanned for the key alone, no modifiers held
+    mean_scans: float            # mean over all modifier states
+    mean_candidate_scans: float  # candidates of this key examined, mean over all states
+    worst_candidate_scans: int
+    unmatched_states: int        # modifier states no unconditional manipulator takes
+
+def key_costs(index: ManipulatorIndex) -> List[KeyCost]:
+    """
+    Manipulators scanned per event of each trigger key, costliest chain first.
+
+    Karabiner scans the whole profile in order, so ``*_scans`` count every
+    manipulator up to the match. ``*_candidate_scans`` count only the key's
+    own candidates, which is the chain left once dispatch is keyed by trigger.
+    A scan ends at the first unconditional manipulator that accepts the
+    state. Conditional manipulators count as scanned but not matched, which
+    is the cost while their conditions are false. Events nothing matches
+    scan everything.
+    """
+    total = len(index.manipulators)
+    costs = []
+    for trigger, candidates in index.by_trigger.items():
+        scans = []
+        chain_scans = []
+        unmatched = 0
+        for state in PHYSICAL_STATES:
+            match = first_unconditional_match(candidates, state)
+            if match is None:
+                unmatched += 1
+                scans.append(total)
+                chain_scans.append(len(candidates))
+            else:
+                scans.append(match.index + 1)
+                chain_scans.append(candidates.index(match) + 1)
+        plain = first_unconditional_match(candidates, NO_MODIFIERS)
+        costs.append(KeyCost(
+            trigger, len(candidates), sum(1 for manipulator in candidates if manipulator.conditions),
+            plain.index + 1 if plain is not None else total, sum(scans) / len(scans),
+            sum(chain_scans) / len(chain_scans), max(chain_scans), unmatched))
+    return sorted(costs, key=lambda cost: (-cost.mean_candidate_scans, -cost.mean_scans, cost.trigger))
+
+class RepeatedCondition(NamedTuple):
+    condition: str                      # canonical JSON
+    manipulators: List[CompiledManipulator]
+    duplicated_within: List[CompiledManipulator]  # manipulators listing it more than once
+
+def repeated_conditions(manipulators: Iterable[CompiledManipulator]) -> List[RepeatedCondition]:
+    """Conditions used by more than one manipulator (or twice by one), most used first."""
+    users: Dict[str, List[CompiledManipulator]] = defaultdict(list)
+    duplicated: Dict[str, List[CompiledManipulator]] = defaultdict(list)
+    for manipulator in manipulators:
+        seen = set()
+        for condition in manipulator.conditions:
+            if condition in seen:
+                duplicated[condition].append(manipulator)
+                continue
+            seen.add(condition)
+            users[condition].append(manipulator)
+    repeated = [RepeatedCondition(condition, used, duplicated.get(condition, []))
+                for condition, used in users.items() if len(used) > 1 or condition in duplicated]
+    return sorted(repeated, key=lambda item: (-len(item.manipulators), item.condition))
+
+def condition_atom(condition: Dict[str, Any]) -> Tuple[str, Any, bool]:
+    """
+    (atom, value, expected) of a condition.
+
+    ``variable_if``/``variable_unless`` compare the atom ``variable:<name>``
+    with their value. Any other ``*_if`` condition is a boolean atom, its
+    canonical JSON, with value True; the matching ``*_unless`` condition
+    maps to the same atom. ``expected`` is False for the ``_unless`` forms.
+    """
+    kind = condition.get('type', '')
+    expected = not kind.endswith('_unless')
+    if kind in ('variable_if', 'variable_unless'):
+        return f"variable:{condition.get('name')}", condition.get('value'), expected
+    if not expected:
+        condition = dict(condition, type=kind[:-len('_unless')] + '_if')
+    return canonical_json(condition), True, expected
+
+def conditions_hold(conditions: Iterable[Tuple[str, Any, bool]], environment: Dict[str, Any]) -> bool:
+    """True when every (atom, value, expected) holds; unset atoms are 0, as unset variables are."""
+    return all((environment.get(atom, 0) == value) == expected for atom, value, expected in conditions)
+
+def contradictory(conditions: Iterable[str]) -> bool:
+    """True when canonical conditions can never all hold, e.g. mode=1 and mode=0."""
+    required: Dict[str, Any] = {}
+    excluded = set()
+    for condition in conditions:
+        atom, value, expected = condition_atom(json.loads(condition))
+        if expected:
+            if atom in required and required[atom] != value:
+                return True
+            required[atom] = value
+        else:
+            excluded.add((atom, value))
+    return any((atom, value) in excluded for atom, value in required.items())
+
+def describe_condition(condition: str) -> str:
+    """Short form of a canonical condition, e.g. 'variable_if semicolon_modifier=0'."""
+    data = json.loads(condition)
+    kind = data.get('type', '?')
+    if kind.startswith('variable_'):
+        return f"{kind} {data.get('name')}={data.get('value')}"
+    details = ', '.join(f"{key}={value}" for key, value in data.items() if key != 'type')
+    return f"{kind} {details}"
@@ -0,0 +1,196 @@
+"""
+Typed binding model shared by the doc generator, CSV exporter and hooks.
+
+Each YAML data file becomes a ``ConfigFile`` holding immutable, slotted
+``Binding`` records. A ``BindingSet`` holds all of them in file order.
+Derived values such as the display modifier and the flattened CSV row are
+computed once, when the record is built. The small vocabularies
+(status, system, category, ...) are interned, so thousands of bindings
+share one string object per value.
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .aggregate import BindingAggregate, group_bindings
+from .chords import format_chord, make_chord
+
+# Binding keys made only of these parts describe a plain modifier chord
+MODIFIER_NAMES = ('shift', 'ctrl', 'alt', 'cmd', 'hyper')
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+def modifier_label(binding_key: str) -> str:
+    """Return the display name of a binding key, e.g. 'shift_ctrl' -> 'Shift Ctrl'."""
+    return binding_key.replace('_', ' ').title() if binding_key != 'none' else 'None'
+
+@dataclass(frozen=True)
+class Binding:
+    """A single keyboard binding from a YAML data file."""
+    __slots__ = (
+        'source', 'navigation_type', 'keys', 'binding_key', 'modifier', 'keystroke',
+        'system', 'status', 'category', 'action', 'ide_action_id', 'karabiner_code',
+        'ideavim_command', 'config_reference', 'notes', 'timing_ms', 'sequence_type',
+        'chord_keys', 'press_type',
+    )
+
+    source: str
+    navigation_type: str
+    keys: str
+    binding_key: str
+    modifier: str
+    keystroke: str
+    system: str
+    status: str
+    category: str
+    action: str
+    ide_action_id: str
+    karabiner_code: str
+    ideavim_command: str
+    config_reference: str
+    notes: str
+    timing_ms: Optional[int]
+    sequence_type: Optional[str]
+    chord_keys: Tuple[str, ...]
+    press_type: Optional[str]
+
+    def __reduce__(self):
+        # Frozen slotted instances cannot be restored attribute by attribute
+        return (self.__class__, self.as_tuple())
+
+    def as_tuple(self) -> tuple:
+        """Field values in ``__slots__`` (constructor) order; ``Binding(*values)`` rebuilds the binding."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_yaml(cls, binding_key: str, binding: Dict[str, Any], navigation_type: str,
+                  keys: str, source: str = '') -> 'Binding':
+        """Build a binding from its YAML mapping."""
+        details = binding['details']
+        return cls(
+            source=source,
+            navigation_type=navigation_type,
+            keys=keys,
+            binding_key=sys.intern(binding_key),
+            modifier=sys.intern(modifier_label(binding_key)),
+            keystroke=binding['keystroke'],
+            system=sys.intern(binding['system']),
+            status=sys.intern(binding['status']),
+            category=sys.intern(binding['category']),
+            action=binding['action'],
+            ide_action_id=details['ide_action_id'],
+            karabiner_code=details['karabiner_code'],
+            ideavim_command=details['ideavim_command'],
+            config_reference=details['config_reference'],
+            notes=details.get('notes', ''),
+            timing_ms=details.get('timing_ms'),
+            sequence_type=_intern(details.get('sequence_type')),
+            chord_keys=tuple(details.get('chord_keys') or ()),
+            press_type=_intern(details.get('press_type')),
+        )
+
+    @property
+    def modifiers(self) -> Optional[Tuple[str, ...]]:
+        """Modifiers of a plain chord binding ('none' -> ()), or None for sequences etc."""
+        if self.binding_key == 'none':
+            return ()
+        parts = tuple(self.binding_key.split('_'))
+        return parts if all(part in MODIFIER_NAMES for part in parts) else None
+
+    def as_row(self) -> Dict[str, Any]:
+        """Return the flat CSV-ready row for this binding."""
+        return {
+            'navigation_type': self.navigation_type,
+            'keys': self.keys,
+            'binding_key': self.binding_key,
+            'modifier': self.modifier,
+            'keystroke': self.keystroke,
+            'system': self.system,
+            'status': self.status,
+            'category': self.category,
+            'action': self.action,
+            'ide_action_id': self.ide_action_id,
+            'karabiner_code': self.karabiner_code,
+            'ideavim_command': self.ideavim_command,
+            'config_reference': self.config_reference,
+            'notes': self.notes,
+            'timing_ms': '' if self.timing_ms is None else self.timing_ms,
+            'sequence_type': self.sequence_type or '',
+            'chord_keys': ', '.join(self.chord_keys),
+            'press_type': self.press_type or '',
+        }
+
+@dataclass(frozen=True)
+class ConfigFile:
+    """The bindings and metadata of one YAML data file."""
+    __slots__ = ('source', 'navigation_type', 'keys', 'description', 'bindings')
+
+    source: str
+    navigation_type: str
+    keys: Tuple[str, ...]
+    description: str
+    bindings: Tuple[Binding, ...]
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], source: Union[str, Path] = '') -> 'ConfigFile':
+        """Build a config file model from a parsed YAML document."""
+        source = str(source)
+        navigation_type = sys.intern(data['navigation_type'])
+        keys_label = ', '.join(data['keys'])
+        bindings = tuple(
+            Binding.from_yaml(binding_key, binding, navigation_type, keys_label, source)
+            for binding_key, binding in data['bindings'].items()
+        )
+        return cls(source, navigation_type, tuple(data['keys']), data['description'], bindings)
+
+def binding_combos(config: ConfigFile, binding: Binding) -> List[str]:
+    """Canonical chord of a plain modifier binding for each of the file's keys."""
+    modifiers = binding.modifiers
+    if modifiers is None or binding.sequence_type:
+        return []
+    combos = []
+    for key in config.keys:
+        chord = make_chord(key, modifiers)
+        combos.append(format_chord(chord) if chord is not None else '+'.join(sorted(modifiers) + [key]).lower())
+    return combos
+
+class BindingSet:
+    """All bindings of a corpus, grouped by the config file they came from."""
+    __slots__ = ('configs', 'bindings', '_aggregate', '_groups')
+
+    def __init__(self, configs: Iterable[ConfigFile]):
+        self.configs: Tuple[ConfigFile, ...] = tuple(configs)
+        self.bindings: Tuple[Binding, ...] = tuple(
+            binding for config in self.configs for binding in config.bindings)
+        self._aggregate: Optional[BindingAggregate] = None
+        self._groups: Dict[Tuple[str, ...], Counter] = {}
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Tuple[Union[str, Path], Dict[str, Any]]]) -> 'BindingSet':
+        """Build a binding set from (source path, parsed YAML document) pairs."""
+        return cls(ConfigFile.from_data(data, source) for source, data in documents)
+
+    def aggregate(self) -> BindingAggregate:
+        """Facet counts over all bindings, computed once per binding set."""
+        if self._aggregate is None:
+            self._aggregate = BindingAggregate(self.bindings)
+        return self._aggregate
+
+    def group_by(self, *columns: str) -> Counter:
+        """Count bindings by a combination of columns, e.g. group_by('status', 'system')."""
+        if columns not in self._groups:
+            self._groups[columns] = group_bindings(self.bindings, columns)
+        return self._groups[columns]
+
+    def __iter__(self) -> Iterator[Binding]:
+        return iter(self.bindings)
+
+    def __len__(self) -> int:
+        return len(self.bindings)
@@ -0,0 +1,170 @@
+"""
+Indexed lookups over the binding corpus.
+
+``BindingIndex`` answers "what is bound to ⌥⌘J?" and "where is
+EditorPreviousWord used?" without scanning every binding. It keeps
+inverted indexes from a lookup key to binding positions:
+
+    chords      canonical chord ('alt+cmd+j') -> bindings, one entry per key
+    action_ids  ide_action_id ('EditorLeft/EditorRight' counts both)
+    commands    karabiner_code and ideavim_command spellings, case-sensitive
+    tokens      lowercased words of the action text
+
+Keys are strings, so the index holds no chord ints and can be reused by any
+process. Action ids and words are lowercased; commands keep their case,
+since <Leader>h and <Leader>H are different mappings. ``load_index`` keeps it pickled in
+``generated/.cache`` along with each data file's size and mtime, so a
+lookup on an unchanged corpus reads one pickle and no YAML.
+"""
+
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import BindingCache, default_cache_dir, read_pickle, write_pickle
+from .chords import format_chord, make_chord, parse_keystroke
+from .corpus import discover_yaml_files, load_corpus
+from .model import Binding, BindingSet, binding_combos
+
+INDEX_VERSION = 2
+INDEX_FILE_NAME = 'query-index.pickle'
+
+# Keystroke symbols of the YAML data -> modifier names
+SYMBOL_MODIFIERS = {'⇧': 'shift', '⌃': 'ctrl', '⌥': 'alt', '⌘': 'cmd', '✱': 'hyper'}
+TOKEN_RE = re.compile(r'\w+')
+
+Postings = Dict[str, Tuple[int, ...]]
+
+def parse_chord_query(text: str) -> Optional[str]:
+    """
+    Canonical chord of a query such as '⌥⌘J', 'alt+cmd+j' or 'meta alt J'.
+
+    Returns None when the text names an unknown modifier.
+    """
+    text = text.strip()
+    modifiers = []
+    while len(text) > 1 and text[0] in SYMBOL_MODIFIERS:
+        modifiers.append(SYMBOL_MODIFIERS[text[0]])
+        text = text[1:]
+    if modifiers:
+        chord = make_chord(text, modifiers)
+    elif '+' in text[:-1]:
+        *modifiers, key = text.split('+')
+        chord = make_chord(key, [modifier.strip() for modifier in modifiers])
+    else:
+        chord = parse_keystroke(text)
+    return format_chord(chord) if chord is not None else None
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+def _split_values(value: str, fold_case: bool = True) -> List[str]:
+    """'EditorLeft/EditorRight' -> ['editorleft', 'editorright']; '-' means none."""
+    parts = [part.strip() for part in value.split('/') if part.strip() not in ('', '-')]
+    return [part.lower() for part in parts] if fold_case else parts
+
+class BindingIndex:
+    """Bindings with inverted indexes for chord, action id, command and word lookups."""
+
+    def __init__(self, rows: List[tuple], chords: Postings, action_ids: Postings,
+                 commands: Postings, tokens: Postings):
+        self.rows = rows
+        self.chords = chords
+        self.action_ids = action_ids
+        self.commands = commands
+        self.tokens = tokens
+
+    @classmethod
+    def build(cls, binding_set: BindingSet) -> 'BindingIndex':
+        chords = defaultdict(list)
+        action_ids = defaultdict(list)
+        commands = defaultdict(list)
+        tokens = defaultdict(list)
+        rows = []
+        for config in binding_set.configs:
+            for binding in config.bindings:
+                position = len(rows)
+                # Rows are the constructor arguments, so only matches are rebuilt as Bindings
+                rows.append(binding.as_tuple())
+                for combo in set(binding_combos(config, binding)):
+                    chords[combo].append(position)
+                for action_id in set(_split_values(binding.ide_action_id)):
+                    action_ids[action_id].append(position)
+                for command in set(_split_values(binding.karabiner_code, fold_case=False) +
+                                   _split_values(binding.ideavim_command, fold_case=False)):
+                    commands[command].append(position)
+                for token in set(tokenize(binding.action)):
+                    tokens[token].append(position)
+
+        def freeze(postings):
+            return {key: tuple(positions) for key, positions in postings.items()}
+        return cls(rows, freeze(chords), freeze(action_ids), freeze(commands), freeze(tokens))
+
+    def bindings(self, positions: Iterable[int]) -> List[Binding]:
+        return [Binding(*self.rows[position]) for position in sorted(positions)]
+
+    def by_chord(self, query: str) -> List[Binding]:
+        """Bindings of a chord, e.g. '⌥⌘J' or 'alt+cmd+j'."""
+        combo = parse_chord_query(query)
+        return self.bindings(self.chords.get(combo, ())) if combo else []
+
+    def by_action_id(self, action_id: str) -> List[Binding]:
+        return self.bindings(self.action_ids.get(action_id.strip().lower(), ()))
+
+    def by_command(self, command: str) -> List[Binding]:
+        """Bindings whose karabiner_code or ideavim_command is the given spelling (case-sensitive)."""
+        return self.bindings(self.commands.get(command.strip(), ()))
+
+    def search(self, text: str) -> List[Binding]:
+        """Bindings whose action contains every word of the text."""
+        words = tokenize(text)
+        if not words:
+            return []
+        postings = sorted((set(self.tokens.get(word, ())) for word in words), key=len)
+        return self.bindings(set.intersection(*postings))
+
+    def as_payload(self) -> Dict[str, object]:
+        return {'rows': self.rows, 'chords': self.chords, 'action_ids': self.action_ids,
+                'commands': self.commands, 'tokens': self.tokens}
+
+def filter_bindings(bindings: Iterable[Binding], system: Optional[str] = None,
+                    status: Optional[str] = None) -> List[Binding]:
+    """Keep bindings handled by a system ('W' matches 'K+W') and/or with a status."""
+    return [binding for binding in bindings
+            if (system is None or system in binding.system.split('+'))
+            and (status is None or binding.status == status)]
+
+def index_file_path(project_root: Path) -> Path:
+    return default_cache_dir(project_root) / INDEX_FILE_NAME
+
+def _file_stamps(yaml_files: List[Path]) -> Dict[str, Tuple[int, int]]:
+    stamps = {}
+    for yaml_file in yaml_files:
+        stat = yaml_file.stat()
+        stamps[str(yaml_file)] = (stat.st_size, stat.st_mtime_ns)
+    return stamps
+
+def load_index(project_root: Path, rebuild: bool = False, jobs: Optional[int] = None) -> BindingIndex:
+    """
+    Return the index of a project's data files, rebuilding it only when one changed.
+
+    Changed files are re-parsed through the shared ``BindingCache``, so even
+    a rebuild parses only the files that changed since the last run.
+    """
+    yaml_files = discover_yaml_files(project_root / 'data')
+    stamps = _file_stamps(yaml_files)
+    index_file = index_file_path(project_root)
+
+    payload = None if rebuild else read_pickle(index_file)
+    if (isinstance(payload, dict) and payload.get('version') == INDEX_VERSION
+            and payload.get('files') == stamps):
+        return BindingIndex(payload['rows'], payload['chords'], payload['action_ids'],
+                            payload['commands'], payload['tokens'])
+
+    cache = BindingCache(default_cache_dir(project_root))
+    loaded = load_corpus(yaml_files, cache, jobs)
+    cache.save()
+    index = BindingIndex.build(BindingSet.from_documents((item.path, item.data) for item in loaded))
+    write_pickle(index_file, {'version': INDEX_VERSION, 'files': stamps, **index.as_payload()})
+    return index
@@ -0,0 +1,261 @@
+"""
+Validation of the binding data files against ``data/schemas/binding-schema.yaml``.
+
+The schema is compiled once into a tree of check functions: ``pattern``
+regexes are compiled up front, ``enum`` lists become sets, and ``required``
+and ``properties`` are resolved to plain tuples and dicts. Validating a
+document is then a walk of that tree with no schema lookups. Every
+violation is collected, so one run reports all problems in a file rather
+than the first.
+
+Supported keywords are the subset the binding schema uses: ``type``,
+``enum``, ``pattern``, ``minLength``, ``minimum``, ``maximum``,
+``required``, ``properties``, ``additionalProperties``, ``items``,
+``minItems`` and ``maxItems``. Messages under ``errorMessage.properties``
+replace the default message for enum and pattern failures of that
+property.
+
+``validate_files`` checks a batch of files in one process, in a process
+pool when there is enough YAML, and remembers the digests of files that
+passed so an unchanged valid file is not parsed again.
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import yaml
+
+from .cache import content_digest, read_pickle, write_pickle
+from .corpus import CHUNKS_PER_WORKER, PARALLEL_THRESHOLD_BYTES, default_jobs
+from .loader import load_yaml
+
+SCHEMA_FILE = Path(__file__).resolve().parent.parent / 'data' / 'schemas' / 'binding-schema.yaml'
+VALIDATION_CACHE_VERSION = 1
+
+TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+}
+
+class ValidationError(NamedTuple):
+    """One schema violation; path is dotted, e.g. 'bindings.shift.details.timing_ms'."""
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}" if self.path else self.message
+
+class FileResult(NamedTuple):
+    """The outcome of validating one file."""
+    path: Path
+    errors: List[ValidationError]
+    cached: bool  # True when the file passed before with the same content and schema
+
+Check = Callable[[Any, str, List[ValidationError]], None]
+
+def _join(path: str, key: Any) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+def _is_type(value: Any, expected: Any) -> bool:
+    # bool is an int subclass, but YAML true is not an integer
+    return isinstance(value, expected) and not (isinstance(value, bool) and expected is not bool)
+
+def compile_schema(node: Dict[str, Any], messages: Optional[Dict[str, str]] = None,
+                   name: Optional[str] = None) -> Check:
+    """Compile a schema node into a function that appends violations to a list."""
+    messages = messages or {}
+    checks: List[Check] = []
+    custom = messages.get(name) if name else None
+
+    type_name = node.get('type')
+    expected = TYPES.get(type_name) if type_name else None
+    if type_name and expected is None:
+        raise ValueError(f"Unsupported schema type '{type_name}'")
+
+    if 'enum' in node:
+        allowed = frozenset(node['enum'])
+        listing = ', '.join(map(str, node['enum']))
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                message = f"{custom} (got '{value}')" if custom else f"'{value}' is not one of: {listing}"
+                errors.append(ValidationError(path, message))
+        checks.append(check_enum)
+
+    if 'pattern' in node:
+        search = re.compile(node['pattern']).search
+        def check_pattern(value, path, errors):
+            if not search(value):
+                message = f"{custom} (got '{value}')" if custom else f"'{value}' does not match {node['pattern']}"
+                errors.append(ValidationError(path, message))
+        checks.append(check_pattern)
+
+    if 'minLength' in node:
+        min_length = node['minLength']
+        def check_min_length(value, path, errors):
+            if len(value) < min_length:
+                errors.append(ValidationError(path, f"shorter than {min_length} characters"))
+        checks.append(check_min_length)
+
+    if 'minimum' in node or 'maximum' in node:
+        minimum, maximum = node.get('minimum'), node.get('maximum')
+        def check_range(value, path, errors):
+            if minimum is not None and value < minimum:
+                errors.append(ValidationError(path, f"{value} is below the minimum {minimum}"))
+            if maximum is not None and value > maximum:
+                errors.append(ValidationError(path, f"{value} is above the maximum {maximum}"))
+        checks.append(check_range)
+
+    if 'minItems' in node or 'maxItems' in node:
+        min_items, max_items = node.get('minItems'), node.get('maxItems')
+        def check_length(value, path, errors):
+            if min_items is not None and len(value) < min_items:
+                errors.append(ValidationError(path, f"needs at least {min_items} items"))
+            if max_items is not None and len(value) > max_items:
+                errors.append(ValidationError(path, f"has more than {max_items} items"))
+        checks.append(check_length)
+
+    if 'items' in node:
+        check_item = compile_schema(node['items'], messages, name)
+        def check_items(value, path, errors):
+            for index, item in enumerate(value):
+                check_item(item, f"{path}[{index}]", errors)
+        checks.append(check_items)
+
+    if 'required' in node:
+        required = tuple(node['required'])
+        def check_required(value, path, errors):
+            for key in required:
+                if key not in value:
+                    errors.append(ValidationError(path, f"missing required field '{key}'"))
+        checks.append(check_required)
+
+    properties = {key: compile_schema(child, messages, key)
+                  for key, child in node.get('properties', {}).items()}
+    additional = node.get('additionalProperties', True)
+    if properties or additional is not True:
+        check_additional = compile_schema(additional, messages) if isinstance(additional, dict) else None
+        def check_properties(value, path, errors):
+            for key, item in value.items():
+                check = properties.get(key)
+                if check is not None:
+                    check(item, _join(path, key), errors)
+                elif check_additional is not None:
+                    check_additional(item, _join(path, key), errors)
+                elif additional is False:
+                    errors.append(ValidationError(path, f"unexpected field '{key}'"))
+        checks.append(check_properties)
+
+    def check_node(value, path, errors):
+        if expected is not None and not _is_type(value, expected):
+            errors.append(ValidationError(path, f"expected {type_name}, got {type(value).__name__}"))
+            return
+        for check in checks:
+            check(value, path, errors)
+    return check_node
+
+class SchemaValidator:
+    """A binding schema compiled for repeated validation."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        messages = schema.get('errorMessage', {}).get('properties', {})
+        # errorMessage is an annotation for validators, not a property of the documents
+        body = {key: value for key, value in schema.items() if key != 'errorMessage'}
+        self._check = compile_schema(body, messages)
+
+    def validate(self, data: Any) -> List[ValidationError]:
+        errors: List[ValidationError] = []
+        self._check(data, '', errors)
+        return errors
+
+def load_schema(schema_file: Path = SCHEMA_FILE) -> Dict[str, Any]:
+    with open(schema_file, 'rb') as f:
+        return load_yaml(f)
+
+def validation_cache_file(cache_dir: Path) -> Path:
+    return cache_dir / 'schema-validation.pickle'
+
+def validate_content(content: bytes, validator: Optional[SchemaValidator] = None) -> List[ValidationError]:
+    """Parse and validate one file's content; without a validator only the syntax is checked."""
+    try:
+        data = load_yaml(content)
+    except yaml.YAMLError as e:
+        return [ValidationError('', f"YAML syntax error: {e}")]
+    return validator.validate(data) if validator is not None else []
+
+def validate_files(files: Sequence[Path], schema: Optional[Dict[str, Any]] = None,
+                   cache_file: Optional[Path] = None, jobs: Optional[int] = None,
+                   threshold: int = PARALLEL_THRESHOLD_BYTES) -> List[FileResult]:
+    """
+    Validate every file against the schema, returning results in input order.
+
+    Files whose digest passed before under the same schema are skipped when
+    ``cache_file`` is given. ``jobs`` caps the worker processes (default: one
+    per CPU); the pool is only started for ``threshold`` bytes of YAML.
+    """
+    schema = load_schema() if schema is None else schema
+    schema_digest = content_digest(repr(schema).encode('utf-8'))
+    passed = set()
+    if cache_file is not None:
+        payload = read_pickle(cache_file)
+        if (isinstance(payload, dict) and payload.get('version') == VALIDATION_CACHE_VERSION
+                and payload.get('schema') == schema_digest):
+            passed = payload['passed']
+
+    results: List[Optional[FileResult]] = [None] * len(files)
+    pending = []
+    for index, file_path in enumerate(files):
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        digest = content_digest(content)
+        if digest in passed:
+            results[index] = FileResult(file_path, [], True)
+        else:
+            pending.append((index, digest, content))
+
+    contents = [content for _, _, content in pending]
+    jobs = default_jobs() if jobs is None else max(1, jobs)
+    workers = min(jobs, len(contents))
+    if workers > 1 and sum(map(len, contents)) >= threshold:
+        checked = _validate_parallel(schema, contents, workers)
+    else:
+        checked = _validate_chunk(contents, SchemaValidator(schema))
+
+    for (index, digest, _), errors in zip(pending, checked):
+        if not errors:
+            passed.add(digest)
+        results[index] = FileResult(files[index], errors, False)
+
+    if cache_file is not None and pending:
+        write_pickle(cache_file, {'version': VALIDATION_CACHE_VERSION, 'schema': schema_digest,
+                                  'passed': passed})
+    return results
+
+_worker_validator: Optional[SchemaValidator] = None
+
+def _init_worker(schema: Dict[str, Any]) -> None:
+    """Compile the schema once per worker process."""
+    global _worker_validator
+    _worker_validator = SchemaValidator(schema)
+
+def _validate_parallel(schema: Dict[str, Any], contents: List[bytes],
+                       workers: int) -> List[List[ValidationError]]:
+    chunk_size = max(1, -(-len(contents) // (workers * CHUNKS_PER_WORKER)))
+    chunks = [contents[start:start + chunk_size] for start in range(0, len(contents), chunk_size)]
+    checked: List[List[ValidationError]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(schema,)) as executor:
+        for chunk_result in executor.map(_validate_chunk, chunks):
+            checked.extend(chunk_result)
+    return checked
+
+def _validate_chunk(contents: List[bytes],
+                    validator: Optional[SchemaValidator] = None) -> List[List[ValidationError]]:
+    validator = validator or _worker_validator
+    return [validate_content(content, validator) for content in contents]
@@ -0,0 +1,121 @@
+"""
+Prefix-trie detection of multi-keystroke sequence conflicts.
+
+Vim mappings (``<leader>gd``, ``[m``), the YAML leader and prefix bindings,
+WebStorm two-keystroke shortcuts and nested Cocoa key binding dictionaries
+are sequences of chords. Two kinds of
+problems are reported:
+
+* exact collisions: the same sequence bound by more than one source;
+* prefix shadowing: a sequence that is also the start of a longer one
+  (``<leader>g`` vs ``<leader>gd``), so Vim or the IDE has to wait for a
+  timeout before it can run the shorter one.
+
+Each mode gets its own trie keyed by chord integers (see ``chords``).
+Both kinds are found in one depth-first walk. Every terminal node is
+reported only under its nearest terminal ancestor, so the walk visits
+each trie node once instead of comparing sequences pairwise.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .chords import format_chord
+
+# Modes that get their own trie; bindings in other modes are not checked
+TRIE_MODES = ('normal', 'visual', 'insert', 'ide', 'text')
+
+Binding = Dict[str, Any]
+
+class SequenceTrie:
+    """Keystroke sequences of one mode, stored as nested chord -> node dicts."""
+    __slots__ = ('root', 'size')
+
+    def __init__(self):
+        # A node is [children, bindings ending here]
+        self.root = [{}, []]
+        self.size = 0
+
+    def insert(self, sequence: Sequence[int], binding: Binding) -> None:
+        node = self.root
+        for chord in sequence:
+            children = node[0]
+            child = children.get(chord)
+            if child is None:
+                child = children[chord] = [{}, []]
+            node = child
+        node[1].append(binding)
+        self.size += 1
+
+    def scan(self) -> Tuple[List[Tuple[Tuple[int, ...], List[Binding]]],
+                            List[Tuple[Tuple[int, ...], List[Binding], List[Binding]]]]:
+        """
+        Walk the trie once.
+
+        Returns (exact, shadows). ``exact`` holds (sequence, bindings) for
+        sequences bound more than once. ``shadows`` holds (prefix, prefix
+        bindings, longer bindings), one entry per shadowing prefix.
+        """
+        exact = []
+        terminals = {}
+        shadowed_by = {}
+        shadow_order = []
+        # (node, sequence so far, nearest terminal ancestor's sequence)
+        stack = [(self.root, (), None)]
+        while stack:
+            (children, bindings), sequence, ancestor = stack.pop()
+            if bindings:
+                if len(bindings) > 1:
+                    exact.append((sequence, bindings))
+                if ancestor is not None:
+                    if ancestor not in shadowed_by:
+                        shadowed_by[ancestor] = []
+                        shadow_order.append(ancestor)
+                    shadowed_by[ancestor].extend(bindings)
+                ancestor = sequence
+                terminals[sequence] = bindings
+            # Reverse so children pop in insertion order
+            for chord, child in reversed(list(children.items())):
+                stack.append((child, sequence + (chord,), ancestor))
+
+        shadows = [(prefix, terminals[prefix], shadowed_by[prefix]) for prefix in shadow_order]
+        return exact, shadows
+
+def format_sequence(sequence: Iterable[int]) -> str:
+    """Readable form of a keystroke sequence, e.g. 'spacebar g d'."""
+    return ' '.join(format_chord(chord) for chord in sequence)
+
+def build_tries(bindings: Iterable[Binding]) -> Dict[str, SequenceTrie]:
+    """Insert every binding with a 'sequence' into the trie of each of its modes."""
+    tries: Dict[str, SequenceTrie] = defaultdict(SequenceTrie)
+    for binding in bindings:
+        sequence = binding.get('sequence')
+        if not sequence:
+            continue
+        for mode in binding['modes']:
+            if mode in TRIE_MODES:
+                tries[mode].insert(sequence, binding)
+    return tries
+
+def find_sequence_conflicts(bindings: Iterable[Binding], source_of) -> Tuple[Dict[str, List[Binding]],
+                                                                           Dict[str, List[Binding]]]:
+    """
+    Return (collisions, shadows) keyed by a title such as "g d (normal)".
+
+    Collisions only count sequences bound by more than one source (as given
+    by ``source_of``); shadows are reported within a single source too.
+    """
+    collisions = {}
+    shadows = {}
+    tries = build_tries(bindings)
+    for mode in TRIE_MODES:
+        if mode not in tries:
+            continue
+        exact, shadowing = tries[mode].scan()
+        for sequence, matches in exact:
+            # Single keys are already compared as chords
+            if len(sequence) > 1 and len(set(map(source_of, matches))) > 1:
+                collisions[f"{format_sequence(sequence)} ({mode})"] = matches
+        for prefix, prefix_bindings, longer in shadowing:
+            shadows[f"{format_sequence(prefix)} ({mode})"] = prefix_bindings + longer
+    return collisions, shadows
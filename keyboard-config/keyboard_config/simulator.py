@@ -0,0 +1,735 @@
+"""
+Offline replay of key events through a Karabiner profile.
+
+``Simulator`` compiles the basic manipulators of a profile's rules (see
+``karabiner.load_profile_rules``) and turns a stream of key events into the
+events Karabiner-Elements would post. Dispatch goes through a table keyed by
+(modifier mask, variables, application, key_code). Each entry holds the
+manipulators with that trigger whose ``from.modifiers`` accept the state and
+whose conditions hold, in evaluation order. A row is built for every trigger
+the first time its modifier state and environment are seen. ``run`` replays
+``EventColumns``: runs of events no manipulator can take are posted in
+bulk, and a tap of a key the row takes is replayed once per modifier
+state, environment and duration, then copied (see ``_replay_columns``).
+
+The modifier state is the one of the output. It covers modifier keys that
+pass through and modifier keys posted by ``to`` while their from key is
+held; caps_lock posting right_shift with right_command, right_control and
+right_option is what makes Hyper. Events a manipulator posts leave out the
+held modifiers its ``from.modifiers.mandatory`` consumed.
+
+    to               posted on key down; the last key event is held until key up
+    to_if_alone      posted on key up if no other key went down and the key was
+                     released within basic.to_if_alone_timeout_milliseconds
+    to_if_held_down  posted once the key is held for
+                     basic.to_if_held_down_threshold_milliseconds with no other
+                     key pressed; held until key up; cancels to_if_alone
+    to_after_key_up  posted on key up
+    simultaneous     later keys must go down within
+                     basic.simultaneous_threshold_milliseconds of the first. The
+                     first manipulator in evaluation order still waiting fires
+                     once its keys are all down; when the wait ends (threshold,
+                     another key, a key up) the first complete one fires. It is
+                     released when any of its keys goes up. Without a complete
+                     one the buffered keys go on to the manipulators after them
+
+``set_variable`` (with ``key_up_value``), ``variable_if``/``variable_unless``
+and ``frontmost_application_if``/``_unless`` are evaluated. Other conditions
+read ``atoms`` (canonical JSON of the ``_if`` form -> bool, default False).
+Not modelled: to_delayed_action, lazy, repeat, halt, key_down_order and
+manipulator types other than basic. Parameters set on a manipulator
+override the profile's.
+
+Event files have one event per line, with blank lines and ``#`` comments
+ignored:
+
+    <time_ms> down <key_code>
+    <time_ms> up <key_code>
+    <time_ms> app <bundle_identifier>
+
+For long recordings ``write_event_columns`` stores the same events as a
+binary column file, which ``read_event_columns`` loads without parsing a
+line per event: the ``COLUMNS_MAGIC`` line, the event count and the byte size of the values
+(two little-endian uint32), the distinct values joined by newlines, then
+the times (int64), kinds (one byte: 0 down, 1 up, 2 app) and value indexes
+(uint32), one per event.
+
+Output events are written as ``<time_ms> <kind> <value> [modifier+...]``.
+"""
+
+import gc
+import re
+import struct
+import sys
+from array import array
+from itertools import chain, repeat
+from typing import (Any, BinaryIO, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Pattern,
+                    Sequence, TextIO, Tuple, Union)
+
+from .chords import ANY_SIDE, BOTH, FAMILY_SHIFT, HYPER_FAMILIES, LEFT, MODIFIER_ALIASES, RELEASED, RIGHT
+from .manipulators import CompiledManipulator, canonical_json, compile_manipulators, condition_atom
+
+DEFAULT_PARAMETERS = {
+    'basic.simultaneous_threshold_milliseconds': 50,
+    'basic.to_if_alone_timeout_milliseconds': 1000,
+    'basic.to_if_held_down_threshold_milliseconds': 500,
+}
+
+# Modifier key codes -> (family, side); fn has no sides and counts as left
+MODIFIER_KEYS: Dict[str, Tuple[str, int]] = {
+    name: alias for name, alias in MODIFIER_ALIASES.items()
+    if alias[1] in (LEFT, RIGHT) and alias[0] != 'hyper'
+}
+MODIFIER_KEYS['fn'] = ('fn', LEFT)
+
+def modifier_key(name: str) -> Optional[str]:
+    """Key code posted for a ``to.modifiers`` name: 'command' -> 'left_command'."""
+    if name in MODIFIER_KEYS:
+        return name
+    alias = MODIFIER_ALIASES.get(name)
+    if alias and alias[1] == ANY_SIDE and alias[0] not in ('caps_lock', 'hyper'):
+        return f"left_{name}"
+    return None
+
+class InputEvent(NamedTuple):
+    time: int    # milliseconds
+    kind: str    # 'down', 'up' or 'app'
+    value: str   # key_code, or bundle identifier for 'app'
+
+class EventColumns(NamedTuple):
+    """Input events as parallel lists, the form ``Simulator.run`` replays."""
+    times: List[int]
+    kinds: List[str]
+    values: List[str]
+
+def event_columns(events: Iterable[InputEvent]) -> EventColumns:
+    columns = [list(column) for column in zip(*events)]
+    return EventColumns(*columns) if columns else EventColumns([], [], [])
+
+class OutputEvent(NamedTuple):
+    time: int
+    kind: str                   # 'down', 'up', 'shell_command', 'mouse_key', ...
+    value: str
+    modifiers: Tuple[str, ...]  # modifier keys held, for key events
+
+class ToEvent(NamedTuple):
+    """One compiled ``to`` event."""
+    kind: str                   # 'key', 'variable' or an output kind
+    value: Any                  # key name, (name, value, key_up_value) or command
+    modifiers: Tuple[str, ...]  # modifier keys to hold around a key event
+
+class Action(NamedTuple):
+    """A manipulator compiled for replay."""
+    manipulator: CompiledManipulator
+    conditions: Tuple[Tuple[str, Any, Any, bool], ...]  # (kind, name, value, expected)
+    to: Tuple[ToEvent, ...]
+    to_if_alone: Tuple[ToEvent, ...]
+    to_if_held_down: Tuple[ToEvent, ...]
+    to_after_key_up: Tuple[ToEvent, ...]
+    lifted: FrozenSet[str]      # families consumed by from.modifiers.mandatory
+    alone_timeout: int
+    held_threshold: int
+    simultaneous_threshold: int
+
+_UNSET = object()
+
+# tuple.__new__ skips the Python-level NamedTuple constructor on the hot paths
+_new_event = tuple.__new__
+
+def compile_to_events(events: Sequence[Dict[str, Any]]) -> Tuple[ToEvent, ...]:
+    compiled = []
+    for event in events:
+        modifiers = event.get('modifiers', [])
+        if isinstance(modifiers, str):
+            modifiers = [modifiers]
+        held = tuple(dict.fromkeys(key for key in map(modifier_key, modifiers) if key))
+        if 'set_variable' in event:
+            variable = event['set_variable']
+            compiled.append(ToEvent('variable', (variable.get('name'), variable.get('value'),
+                                                 variable.get('key_up_value', _UNSET)), ()))
+        elif 'key_code' in event:
+            compiled.append(ToEvent('key', event['key_code'], held))
+        elif 'consumer_key_code' in event:
+            compiled.append(ToEvent('key', event['consumer_key_code'], held))
+        elif 'pointing_button' in event:
+            compiled.append(ToEvent('key', event['pointing_button'], held))
+        elif 'shell_command' in event:
+            compiled.append(ToEvent('shell_command', event['shell_command'], ()))
+        else:
+            kind = next(iter(event), 'unknown')
+            compiled.append(ToEvent(kind, canonical_json(event[kind]) if kind in event else '', ()))
+    return tuple(compiled)
+
+def compile_conditions(conditions: Sequence[Dict[str, Any]]) -> Tuple[Tuple[str, Any, Any, bool], ...]:
+    compiled = []
+    for condition in conditions:
+        kind = condition.get('type', '')
+        expected = not kind.endswith('_unless')
+        if kind in ('variable_if', 'variable_unless'):
+            compiled.append(('variable', condition.get('name'), condition.get('value'), expected))
+        elif kind in ('frontmost_application_if', 'frontmost_application_unless'):
+            patterns = tuple(re.compile(pattern) for pattern in condition.get('bundle_identifiers', []))
+            compiled.append(('application', None, patterns, expected))
+        else:
+            atom, _, expected = condition_atom(condition)
+            compiled.append(('atom', atom, True, expected))
+    return tuple(compiled)
+
+def compile_action(manipulator: CompiledManipulator, parameters: Dict[str, Any]) -> Action:
+    data = manipulator.manipulator
+    parameters = {**parameters, **data.get('parameters', {})}
+    lifted = set()
+    for name in data.get('from', {}).get('modifiers', {}).get('mandatory', []):
+        family = MODIFIER_ALIASES.get(name, ('', 0))[0]
+        lifted.update(HYPER_FAMILIES if family == 'hyper' else (family,))
+    lifted.discard('')
+    return Action(
+        manipulator, compile_conditions(data.get('conditions', [])),
+        compile_to_events(data.get('to', [])), compile_to_events(data.get('to_if_alone', [])),
+        compile_to_events(data.get('to_if_held_down', [])), compile_to_events(data.get('to_after_key_up', [])),
+        frozenset(lifted),
+        parameters['basic.to_if_alone_timeout_milliseconds'],
+        parameters['basic.to_if_held_down_threshold_milliseconds'],
+        parameters['basic.simultaneous_threshold_milliseconds'])
+
+class Press:
+    """A key (or simultaneous keys) taken by a manipulator, until released."""
+    __slots__ = ('action', 'time', 'keys', 'held', 'released')
+
+    def __init__(self, action: Action, time: int, keys: Tuple[str, ...]):
+        self.action = action
+        self.time = time
+        self.keys = keys
+        self.held: List[ToEvent] = []  # key events posted down and not yet up
+        self.released = False
+
+class Pending:
+    """Key downs buffered while simultaneous manipulators wait for their other keys."""
+    __slots__ = ('time', 'keys', 'downs', 'candidates')
+
+    def __init__(self, time: int, key: str, candidates: List[Action]):
+        self.time = time
+        self.keys = {key}
+        self.downs = [(time, key)]
+        self.candidates = candidates
+
+class Simulator:
+    """Replays key events through compiled manipulators."""
+
+    def __init__(self, rules: Sequence[Dict[str, Any]], parameters: Optional[Dict[str, Any]] = None,
+                 atoms: Optional[Dict[str, bool]] = None):
+        parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+        self.by_trigger: Dict[str, List[Action]] = {}
+        for manipulator in compile_manipulators(rules):
+            if manipulator.manipulator.get('type', 'basic') != 'basic':
+                continue
+            action = compile_action(manipulator, parameters)
+            for trigger in dict.fromkeys(manipulator.triggers):
+                self.by_trigger.setdefault(trigger, []).append(action)
+        # (modifier mask, environment) -> key_code -> candidate actions
+        self.table: Dict[Tuple[int, Any], Dict[str, Tuple[Action, ...]]] = {}
+        # held modifier keys -> (state, sorted modifiers)
+        self.states: Dict[FrozenSet[str], Tuple[int, Tuple[str, ...]]] = {}
+        self.atoms = dict(atoms or {})
+        self.variables: Dict[str, Any] = {}
+        self.application = ''
+        self.output: List[OutputEvent] = []
+        self.held_modifiers: Dict[str, int] = {}
+        self.modifiers: Tuple[str, ...] = ()
+        self.state = 0
+        self.row: Dict[str, Tuple[Action, ...]] = {}
+        self.environment: Any = None  # variables and application the row was built for
+        self.pressed: Dict[str, Press] = {}            # keys taken by a manipulator, until key up
+        self.armed: Optional[Press] = None             # waiting for to_if_alone / to_if_held_down
+        self.pending: Optional[Pending] = None
+        # Trigger and modifier keys -> byte code for _replay_columns; None when there are too many
+        keys = dict.fromkeys(chain(self.by_trigger, MODIFIER_KEYS))
+        self.key_codes: Optional[Dict[str, int]] = (
+            {key: code for code, key in enumerate(keys, 1)} if len(keys) < 255 else None)
+        self.patterns: Dict[Tuple[int, Any, FrozenSet[str]], Pattern[bytes]] = {}
+        self.taps: Dict[Tuple[Tuple[str, ...], Any, str, int], Any] = {}
+        self._update_state()
+
+    @classmethod
+    def from_profile(cls, profile: Dict[str, Any], atoms: Optional[Dict[str, bool]] = None) -> 'Simulator':
+        """Simulator for a karabiner.json profile, with its complex_modifications parameters."""
+        modifications = profile.get('complex_modifications', {})
+        return cls(modifications.get('rules', []), modifications.get('parameters', {}), atoms)
+
+    def run(self, events: Union[EventColumns, Iterable[InputEvent]]) -> List[OutputEvent]:
+        """Replay events, then ``finish``; return everything posted."""
+        if not isinstance(events, EventColumns):
+            events = event_columns(events)
+        # Replay creates no reference cycles; collections triggered by the
+        # growing output list would only rescan it
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            if self.key_codes is None:
+                self._replay(zip(*events))
+            else:
+                self._replay_columns(events)
+        finally:
+            if collecting:
+                gc.enable()
+        self.finish()
+        return self.output
+
+    def _replay_columns(self, events: EventColumns) -> None:
+        """
+        Replay columns, passing runs of events nothing can take through in bulk.
+
+        Each event is coded by its key (0 for keys no manipulator triggers on,
+        255 for events other than key downs and ups). While nothing waits, a
+        regular expression over the codes finds the next event the current row,
+        a held modifier or a taken key cares about, and the events before it are
+        posted without a Python-level step each. A tap of a key the row takes
+        (its down directly followed by its up) is replayed once per modifier
+        state, environment, key and duration; later identical taps post a copy.
+        """
+        times, kinds, values = events
+        count = len(times)
+        codes = bytes(map(self.key_codes.get, values, repeat(0, count)))
+        if kinds.count('down') + kinds.count('up') != count:
+            codes = bytearray(codes)
+            for position, kind in enumerate(kinds):
+                if kind != 'down' and kind != 'up':
+                    codes[position] = 255
+        key_down = self.key_down
+        key_up = self.key_up
+        output = self.output
+        append = output.append
+        pressed = self.pressed
+        taps = self.taps
+        # Variables may have been set since the last replay
+        self._update_environment()
+        position = 0
+        stale = True  # the slow path ran: the row, modifiers or presses may have changed
+        while position < count:
+            if stale and self.pending is None and self.armed is None:
+                search = self._takes(pressed).search
+                modifiers = self.modifiers
+                environment = self.environment
+                stale = False
+            if not stale:
+                match = search(codes, position)
+                end = match.start() if match else count
+                if end > position:
+                    output.extend(map(_new_event, repeat(OutputEvent, end - position),
+                                      zip(times[position:end], kinds[position:end], values[position:end],
+                                          repeat(modifiers))))
+                    position = end
+                    if end == count:
+                        break
+                value = values[position]
+                following = position + 1
+                if (following < count and kinds[position] == 'down' and kinds[following] == 'up'
+                        and values[following] == value and value not in pressed):
+                    time = times[position]
+                    duration = times[following] - time
+                    tap = (modifiers, environment, value, duration)
+                    template = taps.get(tap, _UNSET)
+                    if template is None or template is _UNSET:
+                        recorded = self._replay_tap(time, value, duration)
+                        if template is _UNSET:
+                            taps[tap] = recorded
+                        stale = True
+                    else:
+                        for offset, kind, posted, held in template:
+                            append(_new_event(OutputEvent, (time + offset, kind, posted, held)))
+                    position += 2
+                    continue
+            time, kind, value = times[position], kinds[position], values[position]
+            if kind == 'down':
+                key_down(time, value)
+            elif kind == 'up':
+                key_up(time, value)
+            elif kind == 'app':
+                self.application = value
+                self._update_environment()
+            position += 1
+            stale = True
+
+    def _takes(self, pressed: Dict[str, Press]) -> Pattern[bytes]:
+        """Pattern matching the codes of events the slow path must see in the current row."""
+        cache_key = (self.state, self.environment, frozenset(pressed))
+        pattern = self.patterns.get(cache_key)
+        if pattern is None:
+            codes = {self.key_codes[key] for key in chain(self.row, MODIFIER_KEYS, pressed)}
+            codes.add(255)
+            pattern = re.compile(b'[' + b''.join(re.escape(bytes([code])) for code in sorted(codes)) + b']')
+            self.patterns[cache_key] = pattern
+        return pattern
+
+    def _replay_tap(self, time: int, key: str, duration: int) -> Optional[Tuple[Tuple[int, str, str, Tuple[str, ...]], ...]]:
+        """Replay a tap; (time offset, kind, value, modifiers) posted if it left the state as it found it."""
+        held = dict(self.held_modifiers)
+        environment = self.environment
+        mark = len(self.output)
+        self.key_down(time, key)
+        self.key_up(time + duration, key)
+        if (self.pending is not None or self.armed is not None or key in self.pressed
+                or self.held_modifiers != held or self.environment != environment):
+            return None
+        return tuple((event[0] - time,) + event[1:] for event in self.output[mark:])
+
+    def _replay(self, events: Iterable[Tuple[int, str, str]]) -> None:
+        """Replay events one by one; used when there are too many trigger keys to code in a byte."""
+        key_down = self.key_down
+        key_up = self.key_up
+        append = self.output.append
+        pressed = self.pressed
+        held_modifiers = self.held_modifiers
+        # Variables may have been set since the last replay
+        self._update_environment()
+        row = self.row
+        modifiers = self.modifiers
+        idle = self.pending is None and self.armed is None
+        for time, kind, value in events:
+            if kind == 'down':
+                # Fast path: nothing waits on this event and no manipulator takes or holds the key
+                if idle and value not in row and value not in MODIFIER_KEYS and value not in pressed:
+                    append(_new_event(OutputEvent, (time, 'down', value, modifiers)))
+                    continue
+                key_down(time, value)
+            elif kind == 'up':
+                if idle and value not in held_modifiers and value not in pressed:
+                    append(_new_event(OutputEvent, (time, 'up', value, modifiers)))
+                    continue
+                key_up(time, value)
+            elif kind == 'app':
+                self.application = value
+                self._update_environment()
+            else:
+                continue
+            # The slow path may change the modifier state or environment or start a wait
+            row = self.row
+            modifiers = self.modifiers
+            idle = self.pending is None and self.armed is None
+
+    def key_down(self, time: int, key: str) -> None:
+        if self.pending is None and self.armed is None and key not in self.row:
+            # Fast path: nothing waits on this event and no manipulator takes the key
+            press = self.pressed.get(key)
+            if press is None or press.released:
+                self._pass_down(time, key)
+            return
+        if self.pending is not None and self._extend_pending(time, key):
+            return
+        press = self.pressed.get(key)
+        if press is not None and not press.released:
+            return  # auto-repeat of a key a manipulator holds
+        self._dispatch(time, key, True)
+
+    def key_up(self, time: int, key: str) -> None:
+        if self.pending is not None:
+            self._end_pending(time)
+        if self.armed is not None:
+            self._check_held_down(time)
+        press = self.pressed.pop(key, None)
+        if press is None:
+            self._pass_up(time, key)
+        elif not press.released:
+            self._release(time, press)
+
+    def finish(self) -> None:
+        """End a simultaneous wait and fire a pending to_if_held_down; keys stay down."""
+        if self.pending is not None:
+            self._end_pending(None)
+        armed = self.armed
+        if armed is not None and armed.action.to_if_held_down:
+            self._check_held_down(armed.time + armed.action.held_threshold)
+
+    def candidates(self, key: str) -> Tuple[Action, ...]:
+        """Actions that may take the key in the current modifier state and environment, in evaluation order."""
+        return self.row.get(key, ())
+
+    def _conditions_hold(self, conditions: Tuple[Tuple[str, Any, Any, bool], ...]) -> bool:
+        for kind, name, value, expected in conditions:
+            if kind == 'variable':
+                actual = self.variables.get(name, 0) == value
+            elif kind == 'application':
+                actual = any(pattern.search(self.application) for pattern in value)
+            else:
+                actual = self.atoms.get(name, False)
+            if actual != expected:
+                return False
+        return True
+
+    def _dispatch(self, time: int, key: str, allow_simultaneous: bool) -> None:
+        if self.armed is not None:
+            self._check_held_down(time)
+            # Another key went down: no to_if_alone or to_if_held_down any more
+            self.armed = None
+        waiting = []
+        for action in self.candidates(key):
+            if action.manipulator.simultaneous:
+                if allow_simultaneous:
+                    waiting.append(action)
+                continue
+            if waiting:
+                break
+            self._activate(time, (key,), action)
+            return
+        if waiting:
+            self.pending = Pending(time, key, waiting)
+            return
+        self._pass_down(time, key)
+
+    def _extend_pending(self, time: int, key: str) -> bool:
+        """Add a key down to the buffered ones; False when the simultaneous wait is over."""
+        pending = self.pending
+        if key not in pending.keys:
+            keys = pending.keys | {key}
+            alive = [action for action in pending.candidates
+                     if keys.issubset(action.manipulator.triggers)
+                     and time - pending.time <= action.simultaneous_threshold]
+            if alive:
+                pending.keys = keys
+                pending.downs.append((time, key))
+                pending.candidates = alive
+                # A later manipulator that is complete waits while an earlier one may still complete
+                if len(alive[0].manipulator.triggers) == len(keys):
+                    self.pending = None
+                    self.armed = None
+                    self._activate(time, tuple(key for _, key in pending.downs), alive[0])
+                return True
+        self._end_pending(time)
+        return False
+
+    def _end_pending(self, time: Optional[int]) -> None:
+        """
+        The simultaneous wait is over at ``time`` (None: when the threshold ends).
+
+        The first complete manipulator fires, at the latest when the earlier
+        one's threshold ran out. Without one the buffered key downs go on past
+        the simultaneous manipulators.
+        """
+        pending = self.pending
+        self.pending = None
+        complete = next((action for action in pending.candidates
+                         if len(action.manipulator.triggers) == len(pending.keys)), None)
+        if complete is not None:
+            expired = pending.time + pending.candidates[0].simultaneous_threshold
+            self.armed = None
+            self._activate(expired if time is None else min(time, expired),
+                           tuple(key for _, key in pending.downs), complete)
+            return
+        for time, key in pending.downs:
+            self._dispatch(time, key, False)
+
+    def _activate(self, time: int, keys: Tuple[str, ...], action: Action) -> None:
+        press = Press(action, time, keys)
+        for key in keys:
+            self.pressed[key] = press
+        self._post(time, action.to, press, True)
+        if action.to_if_alone or action.to_if_held_down:
+            self.armed = press
+
+    def _release(self, time: int, press: Press) -> None:
+        action = press.action
+        if self.armed is press:
+            self._check_held_down(time)
+        press.released = True
+        for event in reversed(press.held):
+            self._post_up(time, event, action.lifted)
+        press.held = []
+        for event in action.to:
+            if event.kind == 'variable' and event.value[2] is not _UNSET:
+                self._set_variable(event.value[0], event.value[2])
+        if self.armed is press:
+            self.armed = None
+            if action.to_if_alone and time - press.time < action.alone_timeout:
+                self._post(time, action.to_if_alone, press, False)
+        if action.to_after_key_up:
+            self._post(time, action.to_after_key_up, press, False)
+
+    def _check_held_down(self, time: int) -> None:
+        press = self.armed
+        action = press.action
+        if action.to_if_held_down and time - press.time >= action.held_threshold:
+            self.armed = None
+            self._post(press.time + action.held_threshold, action.to_if_held_down, press, True)
+
+    def _post(self, time: int, events: Tuple[ToEvent, ...], press: Press, hold_last: bool) -> None:
+        """Post events; with hold_last the last key event stays down until the press is released."""
+        last_key = -1
+        if hold_last:
+            for position, event in enumerate(events):
+                if event.kind == 'key':
+                    last_key = position
+        lifted = press.action.lifted
+        for position, event in enumerate(events):
+            if event.kind == 'key':
+                self._post_down(time, event, lifted)
+                if position == last_key:
+                    press.held.append(event)
+                else:
+                    self._post_up(time, event, lifted)
+            elif event.kind == 'variable':
+                self._set_variable(event.value[0], event.value[1])
+            else:
+                self.output.append(OutputEvent(time, event.kind, event.value, ()))
+
+    def _visible_modifiers(self, event: ToEvent, lifted: FrozenSet[str]) -> Tuple[str, ...]:
+        if not lifted:
+            return self.modifiers
+        return tuple(key for key in self.modifiers if MODIFIER_KEYS[key][0] not in lifted or key in event.modifiers)
+
+    def _post_down(self, time: int, event: ToEvent, lifted: FrozenSet[str]) -> None:
+        if event.modifiers:
+            self._hold(*event.modifiers)
+        self.output.append(_new_event(OutputEvent, (time, 'down', event.value, self._visible_modifiers(event, lifted))))
+        if event.value in MODIFIER_KEYS:
+            self._hold(event.value)
+
+    def _post_up(self, time: int, event: ToEvent, lifted: FrozenSet[str]) -> None:
+        if event.value in MODIFIER_KEYS:
+            self._drop(event.value)
+        self.output.append(_new_event(OutputEvent, (time, 'up', event.value, self._visible_modifiers(event, lifted))))
+        if event.modifiers:
+            self._drop(*event.modifiers)
+
+    def _pass_down(self, time: int, key: str) -> None:
+        self.pressed.pop(key, None)  # a released press of simultaneous keys
+        self.output.append(_new_event(OutputEvent, (time, 'down', key, self.modifiers)))
+        if key in MODIFIER_KEYS:
+            self._hold(key)
+
+    def _pass_up(self, time: int, key: str) -> None:
+        if key in self.held_modifiers:
+            self._drop(key)
+        self.output.append(_new_event(OutputEvent, (time, 'up', key, self.modifiers)))
+
+    def _hold(self, *keys: str) -> None:
+        """Hold modifier keys, updating the state once (Hyper holds four)."""
+        held = self.held_modifiers
+        changed = False
+        for key in keys:
+            count = held.get(key, 0)
+            held[key] = count + 1
+            changed = changed or not count
+        if changed:
+            self._update_state()
+
+    def _drop(self, *keys: str) -> None:
+        held = self.held_modifiers
+        changed = False
+        for key in keys:
+            count = held.get(key, 0)
+            if count > 1:
+                held[key] = count - 1
+            elif count:
+                del held[key]
+                changed = True
+        if changed:
+            self._update_state()
+
+    def _update_state(self) -> None:
+        held = frozenset(self.held_modifiers)
+        cached = self.states.get(held)
+        if cached is None:
+            sides = dict.fromkeys(FAMILY_SHIFT, 0)
+            for key in held:
+                family, side = MODIFIER_KEYS[key]
+                sides[family] |= side
+            state = 0
+            for family, shift in FAMILY_SHIFT.items():
+                side = sides[family]
+                state |= (RELEASED if not side else BOTH if side == LEFT | RIGHT else side) << shift
+            cached = self.states[held] = (state, tuple(sorted(held)))
+        self.state, self.modifiers = cached
+        self._update_row()
+
+    def _set_variable(self, name: str, value: Any) -> None:
+        if self.variables.get(name, _UNSET) != value:
+            self.variables[name] = value
+            self._update_environment()
+
+    def _update_environment(self) -> None:
+        environment = (frozenset(self.variables.items()), self.application)
+        if environment != self.environment:
+            self.environment = environment
+            self._update_row()
+
+    def _update_row(self) -> None:
+        key = (self.state, self.environment)
+        row = self.table.get(key)
+        if row is None:
+            row = self.table[key] = self._build_row()
+        self.row = row
+
+    def _build_row(self) -> Dict[str, Tuple[Action, ...]]:
+        """Trigger key -> actions accepting the state and environment; keys nothing takes are left out."""
+        state = self.state
+        row = {}
+        for key, actions in self.by_trigger.items():
+            accepted = tuple(action for action in actions if action.manipulator.accepts_state(state)
+                             and self._conditions_hold(action.conditions))
+            if accepted:
+                row[key] = accepted
+        return row
+
+EVENT_KINDS = frozenset({'down', 'up', 'app'})
+
+def parse_events(lines: Iterable[str]) -> Iterator[InputEvent]:
+    """Input events of an event file (see the module docstring)."""
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if len(fields) == 3 and fields[1] in EVENT_KINDS and fields[0].isdigit():
+            yield _new_event(InputEvent, (int(fields[0]), fields[1], fields[2]))
+        elif fields and not fields[0].startswith('#'):
+            raise ValueError(f"Line {number}: expected '<time_ms> down|up|app <value>', got {line.strip()!r}")
+
+COLUMNS_MAGIC = b'karabiner-events 1\n'
+COLUMN_KINDS = ('down', 'up', 'app')
+_COLUMN_KIND_CODES = {kind: code for code, kind in enumerate(COLUMN_KINDS)}
+_COLUMNS_HEADER = struct.Struct('<II')  # event count, size of the values
+
+def _little_endian(column: array) -> array:
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+def write_event_columns(events: EventColumns, output: BinaryIO) -> None:
+    """Write events as a binary column file (see the module docstring)."""
+    times, kinds, values = events
+    unknown = set(kinds) - _COLUMN_KIND_CODES.keys()
+    if unknown:
+        raise ValueError(f"Cannot store event kinds {sorted(unknown)}")
+    indexes = {value: index for index, value in enumerate(dict.fromkeys(values))}
+    names = '\n'.join(indexes).encode('utf-8')
+    output.write(COLUMNS_MAGIC)
+    output.write(_COLUMNS_HEADER.pack(len(times), len(names)))
+    output.write(names)
+    output.write(_little_endian(array('q', times)).tobytes())
+    output.write(bytes(map(_COLUMN_KIND_CODES.__getitem__, kinds)))
+    output.write(_little_endian(array('I', map(indexes.__getitem__, values))).tobytes())
+
+def read_event_columns(data: bytes) -> EventColumns:
+    """Events of a binary column file's contents."""
+    if not data.startswith(COLUMNS_MAGIC):
+        raise ValueError('Not a binary event column file')
+    position = len(COLUMNS_MAGIC)
+    count, names_size = _COLUMNS_HEADER.unpack_from(data, position)
+    position += _COLUMNS_HEADER.size
+    names = data[position:position + names_size].decode('utf-8').split('\n')
+    position += names_size
+    if len(data) != position + 13 * count:
+        raise ValueError(f"Binary event file is {len(data)} bytes, expected {position + 13 * count}")
+    times = _little_endian(array('q', data[position:position + 8 * count]))
+    position += 8 * count
+    kinds = data[position:position + count]
+    position += count
+    indexes = _little_endian(array('I', data[position:]))
+    try:
+        return EventColumns(times.tolist(), list(map(COLUMN_KINDS.__getitem__, kinds)),
+                            list(map(names.__getitem__, indexes)))
+    except IndexError:
+        raise ValueError('Binary event file has an unknown kind or value index') from None
+
+def write_events(events: Iterable[OutputEvent], output: TextIO) -> None:
+    output.writelines(
+        f"{event.time} {event.kind} {event.value} {'+'.join(event.modifiers)}\n" if event.modifiers
+        else f"{event.time} {event.kind} {event.value}\n"
+        for event in events)
@@ -0,0 +1,196 @@
+"""
+SQLite export of keyboard binding data.
+
+The flattened binding rows are written to normalized tables, so large
+corpora can be filtered and joined with SQL instead of in a spreadsheet:
+
+    files       one row per YAML data file, with the SHA-256 of its content
+    bindings    binding key, keystroke, system, status, category, action
+    details     ide_action_id, karabiner_code, ideavim_command, notes, ...
+    chord_keys  the extra keys of chord bindings, in order
+    combos      canonical chord spellings (e.g. 'cmd+shift+h'), one per key
+
+``status``, ``system``, ``category``, ``ide_action_id`` and ``combo`` are
+indexed, and ``bindings_fts`` is an FTS5 index over action and notes
+(skipped when the SQLite build lacks FTS5):
+
+    SELECT b.action FROM bindings_fts f JOIN bindings b ON b.id = f.rowid
+    WHERE bindings_fts MATCH 'scroll';
+
+Re-exports are incremental. Files whose content hash is unchanged are left
+alone, and changed or removed files are replaced. The hashes are the ones
+``BindingCache`` computed while loading, so files are not read again. Every write happens in
+one transaction with ``executemany``.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .cache import content_digest
+from .model import ConfigFile, binding_combos
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    digest TEXT NOT NULL,
+    navigation_type TEXT NOT NULL,
+    keys TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bindings (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    binding_key TEXT NOT NULL,
+    modifier TEXT NOT NULL,
+    keystroke TEXT NOT NULL,
+    system TEXT NOT NULL,
+    status TEXT NOT NULL,
+    category TEXT NOT NULL,
+    action TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS details (
+    binding_id INTEGER PRIMARY KEY REFERENCES bindings(id) ON DELETE CASCADE,
+    ide_action_id TEXT NOT NULL,
+    karabiner_code TEXT NOT NULL,
+    ideavim_command TEXT NOT NULL,
+    config_reference TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    timing_ms INTEGER,
+    sequence_type TEXT,
+    press_type TEXT
+);
+CREATE TABLE IF NOT EXISTS chord_keys (
+    binding_id INTEGER NOT NULL REFERENCES bindings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (binding_id, position)
+);
+CREATE TABLE IF NOT EXISTS combos (
+    binding_id INTEGER NOT NULL REFERENCES bindings(id) ON DELETE CASCADE,
+    combo TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bindings_file ON bindings(file_id);
+CREATE INDEX IF NOT EXISTS bindings_status ON bindings(status);
+CREATE INDEX IF NOT EXISTS bindings_system ON bindings(system);
+CREATE INDEX IF NOT EXISTS bindings_category ON bindings(category);
+CREATE INDEX IF NOT EXISTS details_ide_action_id ON details(ide_action_id);
+CREATE INDEX IF NOT EXISTS combos_combo ON combos(combo);
+CREATE INDEX IF NOT EXISTS combos_binding ON combos(binding_id);
+"""
+
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS bindings_fts USING fts5(action, notes)"
+
+class SqliteExportStats(NamedTuple):
+    """What an export changed."""
+    files_written: int
+    files_unchanged: int
+    files_removed: int
+    bindings_written: int
+    full_text: bool  # False when SQLite was built without FTS5
+
+def has_fts5(connection: sqlite3.Connection) -> bool:
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        connection.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def open_database(db_file: Path) -> Tuple[sqlite3.Connection, bool]:
+    """Open (and if needed create) the export database; return it and FTS5 availability."""
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(db_file), isolation_level=None)
+    connection.execute("PRAGMA foreign_keys = ON")
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        # Written by another layout; a full re-export is cheaper than migrating
+        connection.close()
+        db_file.unlink()
+        return open_database(db_file)
+    connection.executescript(SCHEMA)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    full_text = has_fts5(connection)
+    if full_text:
+        connection.execute(FTS_SCHEMA)
+    return connection, full_text
+
+def export_sqlite(configs: Iterable[ConfigFile], db_file: Path,
+                  file_digests: Optional[Sequence[str]] = None) -> SqliteExportStats:
+    """
+    Write the configs to the database, rewriting only files whose content changed.
+
+    ``file_digests`` are the content digests of the configs' files, in the
+    same order (e.g. from ``BindingCache.digest``); without them each file
+    is read and hashed.
+    """
+    configs = list(configs)
+    if file_digests is None:
+        file_digests = [content_digest(Path(config.source).read_bytes()) for config in configs]
+    digests = {config.source: digest for config, digest in zip(configs, file_digests)}
+    connection, full_text = open_database(db_file)
+    try:
+        connection.execute("BEGIN")
+        stored = {path: (file_id, digest) for file_id, path, digest
+                  in connection.execute("SELECT id, path, digest FROM files")}
+        stale = [file_id for path, (file_id, digest) in stored.items() if digests.get(path) != digest]
+        changed = [config for config in configs
+                   if stored.get(config.source, (None, None))[1] != digests[config.source]]
+
+        if full_text and stale:
+            connection.executemany(
+                "DELETE FROM bindings_fts WHERE rowid IN (SELECT id FROM bindings WHERE file_id = ?)",
+                [(file_id,) for file_id in stale])
+        # Bindings, details, chord keys and combos go with their file
+        connection.executemany("DELETE FROM files WHERE id = ?", [(file_id,) for file_id in stale])
+
+        rows = _insert_rows(connection, changed, digests)
+        bindings_written = len(rows['bindings'])
+        connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", rows['files'])
+        connection.executemany("INSERT INTO bindings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows['bindings'])
+        connection.executemany("INSERT INTO details VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows['details'])
+        connection.executemany("INSERT INTO chord_keys VALUES (?, ?, ?)", rows['chord_keys'])
+        connection.executemany("INSERT INTO combos VALUES (?, ?)", rows['combos'])
+        if full_text:
+            connection.executemany("INSERT INTO bindings_fts (rowid, action, notes) VALUES (?, ?, ?)",
+                                   rows['fts'])
+        connection.execute("COMMIT")
+    except BaseException:
+        # BEGIN itself may have failed, or the error may have ended the transaction
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+
+    removed = sum(1 for path in stored if path not in digests)
+    return SqliteExportStats(len(changed), len(configs) - len(changed), removed, bindings_written, full_text)
+
+def _insert_rows(connection: sqlite3.Connection, configs: List[ConfigFile],
+                 digests: Dict[str, str]) -> Dict[str, List[Tuple[Any, ...]]]:
+    """Row tuples for every table, with ids assigned up front so executemany can be used."""
+    next_file = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM files").fetchone()[0]
+    next_binding = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM bindings").fetchone()[0]
+    rows: Dict[str, List[Tuple[Any, ...]]] = {
+        'files': [], 'bindings': [], 'details': [], 'chord_keys': [], 'combos': [], 'fts': []}
+
+    for file_id, config in enumerate(configs, next_file):
+        rows['files'].append((file_id, config.source, digests[config.source], config.navigation_type,
+                              ', '.join(config.keys), config.description))
+        for binding in config.bindings:
+            binding_id = next_binding
+            next_binding += 1
+            rows['bindings'].append((binding_id, file_id, binding.binding_key, binding.modifier,
+                                     binding.keystroke, binding.system, binding.status,
+                                     binding.category, binding.action))
+            rows['details'].append((binding_id, binding.ide_action_id, binding.karabiner_code,
+                                    binding.ideavim_command, binding.config_reference, binding.notes,
+                                    binding.timing_ms, binding.sequence_type, binding.press_type))
+            rows['chord_keys'].extend((binding_id, position, key)
+                                      for position, key in enumerate(binding.chord_keys))
+            rows['combos'].extend((binding_id, combo) for combo in binding_combos(config, binding))
+            rows['fts'].append((binding_id, binding.action, binding.notes))
+    return rows
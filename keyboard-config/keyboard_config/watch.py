@@ -0,0 +1,321 @@
+"""
+Watch mode: keep the binding model resident and regenerate outputs on change.
+
+All YAML files in ``data/``, ``configs/karabiner/karabiner.json``,
+``configs/idea-vim/.ideavimrc``, the WebStorm keymaps in ``configs/webstorm/``
+and the Cocoa key bindings in ``configs/macos/`` are parsed once at startup.
+After that, each change re-parses only the modified file (for a keymap, the
+keymaps that inherit from it) and re-emits KEY-MAP.md, the CSV/TSV exports,
+webstorm-keymap.csv and the conflict report from the in-memory model.
+Outputs whose content did not change are not rewritten.
+
+Changes are detected with inotify on Linux (through ctypes, no extra
+packages) and by polling file stats everywhere else. Bursts of events, such
+as an editor's write-then-rename save, are debounced into one regeneration.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .cache import content_digest
+from .conflicts import (format_conflict_report, group_conflicts, parse_cocoa_keybindings, parse_ideavim_config,
+                        parse_karabiner_config, parse_webstorm_keymap, parse_yaml_bindings)
+from .corpus import discover_yaml_files
+from .csv_export import documented_action_ids, export_bindings, export_keymap
+from .discovery import COCOA_KEYBINDING_FILES
+from .docs import generate_incremental_markdown, write_if_changed
+from .ideavim import DEFAULT_LEADER, read_leader
+from .loader import load_yaml
+from .model import ConfigFile
+from .webstorm import ResolvedKeymap, leaf_keymaps, resolve_keymap
+
+DEBOUNCE_SECONDS = 0.03
+POLL_INTERVAL_SECONDS = 0.05
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+INOTIFY_EVENT = struct.Struct('iIII')
+
+class PollingWatcher:
+    """Detect file changes by comparing stat snapshots of watched directories."""
+
+    def __init__(self, directories: List[Path], is_relevant: Callable[[Path], bool]):
+        self.directories = directories
+        self.is_relevant = is_relevant
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for directory in self.directories:
+            try:
+                entries = os.scandir(directory)
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    path = Path(entry.path)
+                    if self.is_relevant(path):
+                        stat = entry.stat()
+                        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until files change or the timeout expires; return changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(POLL_INTERVAL_SECONDS if deadline is None
+                       else min(POLL_INTERVAL_SECONDS, max(deadline - time.monotonic(), 0)))
+
+    def close(self) -> None:
+        pass
+
+class InotifyWatcher:
+    """Detect file changes with Linux inotify watches on the parent directories."""
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+    def __init__(self, directories: List[Path], is_relevant: Callable[[Path], bool]):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+
+        self.is_relevant = is_relevant
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self._dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until files change or the timeout expires; return changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def _read_events(self) -> Set[Path]:
+        changed = set()
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buffer):
+            wd, _mask, _cookie, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is not None and name:
+                path = directory / os.fsdecode(name)
+                if self.is_relevant(path):
+                    changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+def create_watcher(directories: List[Path], is_relevant: Callable[[Path], bool]):
+    """Return an inotify watcher where supported, otherwise a polling watcher."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directories, is_relevant)
+        except OSError:
+            pass
+    return PollingWatcher(directories, is_relevant)
+
+class BindingModel:
+    """In-memory binding data and derived outputs for the watch loop."""
+
+    def __init__(self, project_root: Path):
+        project_root = project_root.resolve()
+        self.project_root = project_root
+        self.data_dir = project_root / 'data'
+        self.output_dir = project_root / 'generated'
+        self.karabiner_file = project_root.parent / 'configs' / 'karabiner' / 'karabiner.json'
+        self.ideavim_file = project_root.parent / 'configs' / 'idea-vim' / '.ideavimrc'
+        self.webstorm_dir = project_root.parent / 'configs' / 'webstorm'
+        self.cocoa_dir = project_root.parent / 'configs' / 'macos'
+
+        # Per data file: binding model, content digest and conflict bindings
+        self.data: Dict[Path, ConfigFile] = {}
+        self.digests: Dict[Path, str] = {}
+        self.source_bindings: Dict[Path, List[Dict[str, Any]]] = {}
+        # Leaf WebStorm keymaps merged with their parents
+        self.keymaps: Dict[Path, ResolvedKeymap] = {}
+        self.render_state: Dict[str, Any] = {}
+        self.last_report: List[str] = []
+        # Leader of .ideavimrc, used to expand <Leader> in YAML sequences
+        self.leader = DEFAULT_LEADER
+
+    def watched_directories(self) -> List[Path]:
+        return [self.data_dir, self.karabiner_file.parent, self.ideavim_file.parent,
+                self.webstorm_dir, self.cocoa_dir]
+
+    def is_relevant(self, path: Path) -> bool:
+        """Return True for the files this model is built from."""
+        if path == self.karabiner_file or path == self.ideavim_file:
+            return True
+        if path.parent == self.webstorm_dir:
+            return path.suffix == '.xml'
+        if path.parent == self.cocoa_dir:
+            return path.name in COCOA_KEYBINDING_FILES
+        return (path.parent == self.data_dir and path.suffix == '.yaml'
+                and 'schema' not in path.name.lower())
+
+    def load_all(self) -> None:
+        if self.ideavim_file.exists():
+            self.leader = self.read_leader()
+        for yaml_file in discover_yaml_files(self.data_dir):
+            self.update(yaml_file)
+        for config_file in (self.karabiner_file, self.ideavim_file):
+            if config_file.exists():
+                self.update(config_file)
+        self.update_keymaps()
+        for name in sorted(COCOA_KEYBINDING_FILES):
+            if (self.cocoa_dir / name).exists():
+                self.update(self.cocoa_dir / name)
+
+    def update(self, path: Path) -> None:
+        """Re-parse a single changed file, or drop it if it was deleted."""
+        if path.parent == self.webstorm_dir:
+            # A parent keymap is checked through the keymaps that inherit from it
+            self.update_keymaps()
+            return
+
+        if not path.exists():
+            self.data.pop(path, None)
+            self.digests.pop(path, None)
+            self.source_bindings.pop(path, None)
+            return
+
+        if path == self.karabiner_file:
+            self.source_bindings[path] = parse_karabiner_config(path)
+        elif path.parent == self.cocoa_dir:
+            self.source_bindings[path] = parse_cocoa_keybindings(path)
+        elif path == self.ideavim_file:
+            self.source_bindings[path] = parse_ideavim_config(path)
+            leader = self.read_leader()
+            if leader != self.leader:
+                self.leader = leader
+                for yaml_file, config in self.data.items():
+                    self.source_bindings[yaml_file] = parse_yaml_bindings(yaml_file, config, leader)
+        else:
+            content = path.read_bytes()
+            config = ConfigFile.from_data(load_yaml(content), path)
+            self.data[path] = config
+            self.digests[path] = content_digest(content)
+            self.source_bindings[path] = parse_yaml_bindings(path, config, self.leader)
+
+    def update_keymaps(self) -> None:
+        """Re-resolve every leaf WebStorm keymap, dropping the bindings of removed ones."""
+        for path in [path for path in self.source_bindings if path.parent == self.webstorm_dir]:
+            del self.source_bindings[path]
+        self.keymaps = {}
+        for keymap_file in leaf_keymaps(sorted(self.webstorm_dir.glob('*.xml'))):
+            keymap = self.keymaps[keymap_file] = resolve_keymap(keymap_file)
+            self.source_bindings[keymap_file] = parse_webstorm_keymap(keymap_file, keymap=keymap)
+
+    def read_leader(self) -> str:
+        with open(self.ideavim_file, 'r') as f:
+            return read_leader(f)
+
+    def emit(self) -> int:
+        """Write KEY-MAP.md, the CSV exports and webstorm-keymap.csv and refresh the conflict report."""
+        yaml_files = sorted(self.data)
+        configs = [self.data[path] for path in yaml_files]
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        markdown, rerendered = generate_incremental_markdown(
+            configs, [self.digests[path] for path in yaml_files], self.render_state)
+        write_if_changed(self.output_dir / 'KEY-MAP.md', markdown)
+
+        if any(config.bindings for config in configs):
+            export_bindings(configs, self.output_dir / 'bindings.csv', self.output_dir / 'bindings.tsv',
+                            self.output_dir / 'bindings-summary.csv', self.output_dir / 'bindings-pivot.csv')
+        if self.keymaps:
+            documented = documented_action_ids(binding for config in configs for binding in config.bindings)
+            export_keymap(self.keymaps.values(), self.output_dir / 'webstorm-keymap.csv', documented)
+
+        all_bindings = [binding for bindings in self.source_bindings.values() for binding in bindings]
+        conflicts, shadows = group_conflicts(all_bindings)
+        report = format_conflict_report(conflicts, len(all_bindings), shadows)
+        if report != self.last_report:
+            print('\n'.join(report))
+            self.last_report = report
+        return rerendered
+
+def watch(project_root: Path, debounce: float = DEBOUNCE_SECONDS) -> None:
+    """Load the binding model once and regenerate outputs whenever a source changes."""
+    model = BindingModel(project_root)
+    started = time.perf_counter()
+    model.load_all()
+    model.emit()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Loaded {len(model.data)} data files in {elapsed_ms:.0f}ms")
+
+    watcher = create_watcher(model.watched_directories(), model.is_relevant)
+    print(f"Watching for changes ({type(watcher).__name__}), press Ctrl+C to stop...")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            # Collect the rest of the burst before regenerating
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+
+            started = time.perf_counter()
+            for path in sorted(changed):
+                try:
+                    model.update(path)
+                except Exception as e:
+                    # Keep the previous parse; a half-saved file is fixed by the next save
+                    print(f"Error: {path}: {e}", file=sys.stderr)
+            try:
+                rerendered = model.emit()
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            names = ', '.join(path.name for path in sorted(changed))
+            print(f"Regenerated in {elapsed_ms:.0f}ms ({names}; {rerendered} sections re-rendered)")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
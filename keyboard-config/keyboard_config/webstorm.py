@@ -0,0 +1,214 @@
+"""
+Reading WebStorm (IntelliJ) keymap XML files.
+
+A keymap lists only the actions it changes and names the keymap it
+inherits the rest from in ``parent``. An ``<action>`` element replaces the
+parent's shortcuts for that action; an empty element removes them.
+``resolve_keymap`` follows the parent chain through the keymap
+directories and merges it into the full action -> shortcuts table.
+
+Files are streamed with ``iterparse`` and each ``<action>`` is cleared once
+read. Parents are looked up in the keymap's own directory and in the
+directories listed in ``WEBSTORM_KEYMAP_PATH``. To resolve the IDE's
+built-in keymaps such as "Mac OS X 10.5+", export them there. A parent
+that cannot be found ends the chain and is reported in ``missing_parent``;
+``missing_parent_warning`` words it once per parent and process, so
+callers that resolve keymaps repeatedly (watch mode) do not repeat it.
+The built-in keymaps are not bundled, so without them a keymap resolves
+to its own shortcuts only.
+
+Resolved keymaps are cached by the content digest of every file in the
+chain, so an unchanged chain is not re-parsed or re-merged. While a parent
+is missing, the listing of the search directories is part of the key too.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .cache import content_digest, read_pickle, write_pickle
+
+CACHE_VERSION = 1
+
+# (first keystroke, second keystroke or None)
+KeyStrokes = Tuple[str, Optional[str]]
+
+class KeymapShortcut(NamedTuple):
+    """A keyboard shortcut of a resolved keymap."""
+    action_id: str
+    first_keystroke: str
+    second_keystroke: Optional[str]
+    keymap: str  # the keymap in the chain that defines it
+
+class Keymap(NamedTuple):
+    """A single keymap file, before inheritance."""
+    name: str
+    parent: Optional[str]
+    actions: Dict[str, List[KeyStrokes]]
+
+class ResolvedKeymap(NamedTuple):
+    """A keymap merged with all of its parents."""
+    name: str
+    chain: Tuple[str, ...]
+    missing_parent: Optional[str]
+    shortcuts: Tuple[KeymapShortcut, ...]
+
+def read_keymap(path: Path) -> Keymap:
+    """Stream one keymap file into its name, parent and per-action shortcuts."""
+    name = parent = root = None
+    actions: Dict[str, List[KeyStrokes]] = {}
+    action_id = None
+
+    with open(path, 'rb') as f:
+        for event, element in ET.iterparse(f, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == 'keymap':
+                    root = element
+                    name = element.get('name')
+                    parent = element.get('parent')
+                elif tag == 'action':
+                    action_id = element.get('id')
+                    actions[action_id] = []
+            elif tag == 'keyboard-shortcut' and action_id is not None:
+                actions[action_id].append((element.get('first-keystroke', ''), element.get('second-keystroke')))
+            elif tag == 'action':
+                action_id = None
+                # Drop the finished action so memory stays flat on large keymaps
+                root.clear()
+
+    if name is None:
+        raise ValueError(f"{path} is not a keymap file")
+    return Keymap(name, parent, actions)
+
+def read_keymap_header(path: Path) -> Tuple[Optional[str], Optional[str]]:
+    """Return (name, parent) from the root element without reading the actions."""
+    with open(path, 'rb') as f:
+        for _, element in ET.iterparse(f, events=('start',)):
+            if element.tag == 'keymap':
+                return element.get('name'), element.get('parent')
+            break
+    return None, None
+
+def keymap_cache_file(cache_dir: Path) -> Path:
+    """Cache file for resolved keymaps inside a tool's cache directory."""
+    return cache_dir / 'webstorm-keymaps.pickle'
+
+def keymap_search_dirs(keymap_file: Path) -> List[Path]:
+    dirs = [keymap_file.parent]
+    for entry in os.environ.get('WEBSTORM_KEYMAP_PATH', '').split(os.pathsep):
+        if entry:
+            dirs.append(Path(entry))
+    return dirs
+
+def index_keymaps(dirs: Iterable[Path]) -> Dict[str, Path]:
+    """Map keymap names to files for every keymap XML in the given directories."""
+    index: Dict[str, Path] = {}
+    for directory in dirs:
+        try:
+            candidates = sorted(directory.glob('*.xml'))
+        except OSError:
+            continue
+        for path in candidates:
+            try:
+                name, _ = read_keymap_header(path)
+            except (ET.ParseError, OSError):
+                continue
+            if name is not None:
+                # Earlier directories take precedence
+                index.setdefault(name, path)
+    return index
+
+def resolve_keymap(keymap_file: Path, cache_file: Optional[Path] = None) -> ResolvedKeymap:
+    """Merge a keymap with its parent chain, reusing a cached result when no file changed."""
+    keymap_file = keymap_file.resolve()
+    cache = read_pickle(cache_file) if cache_file else None
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        cache = {'version': CACHE_VERSION, 'keymaps': {}}
+
+    entry = cache['keymaps'].get(str(keymap_file))
+    if entry is not None and _entry_is_current(entry, keymap_file):
+        return entry['resolved']
+
+    resolved, chain_files = _resolve_uncached(keymap_file)
+    if cache_file:
+        cache['keymaps'][str(keymap_file)] = {
+            'digests': [(str(path), _digest(path)) for path in chain_files],
+            # A missing parent can turn up when a keymap is added to a search directory
+            'listing': _search_listing(keymap_file) if resolved.missing_parent else None,
+            'resolved': resolved,
+        }
+        write_pickle(cache_file, cache)
+    return resolved
+
+def _entry_is_current(entry, keymap_file: Path) -> bool:
+    if entry['listing'] is not None and entry['listing'] != _search_listing(keymap_file):
+        return False
+    return all(_digest(Path(path)) == digest for path, digest in entry['digests'])
+
+def _search_listing(keymap_file: Path) -> List[Tuple[str, int]]:
+    """Keymap files in the search directories with their mtimes."""
+    listing = []
+    for directory in keymap_search_dirs(keymap_file):
+        try:
+            listing.extend((str(path), path.stat().st_mtime_ns) for path in sorted(directory.glob('*.xml')))
+        except OSError:
+            continue
+    return listing
+
+def _digest(path: Path) -> Optional[str]:
+    try:
+        return content_digest(path.read_bytes())
+    except OSError:
+        return None
+
+def _resolve_uncached(keymap_file: Path) -> Tuple[ResolvedKeymap, List[Path]]:
+    keymaps = [read_keymap(keymap_file)]
+    chain_files = [keymap_file]
+    missing_parent = None
+    index = None
+
+    while keymaps[-1].parent:
+        parent = keymaps[-1].parent
+        if index is None:
+            index = index_keymaps(keymap_search_dirs(keymap_file))
+        parent_file = index.get(parent)
+        if parent_file is None or parent_file.resolve() in chain_files:
+            missing_parent = parent if parent_file is None else None
+            break
+        keymaps.append(read_keymap(parent_file))
+        chain_files.append(parent_file.resolve())
+
+    # Apply from the root down; a child's <action> replaces the parent's shortcuts
+    merged: Dict[str, Tuple[str, List[KeyStrokes]]] = {}
+    for keymap in reversed(keymaps):
+        for action_id, strokes in keymap.actions.items():
+            merged[action_id] = (keymap.name, strokes)
+
+    shortcuts = tuple(
+        KeymapShortcut(action_id, first, second, defined_in)
+        for action_id, (defined_in, strokes) in sorted(merged.items())
+        for first, second in strokes
+        if first
+    )
+    resolved = ResolvedKeymap(keymaps[0].name, tuple(keymap.name for keymap in keymaps),
+                              missing_parent, shortcuts)
+    return resolved, chain_files
+
+_warned_parents: Set[str] = set()
+
+def missing_parent_warning(keymap_file: Path, keymap: ResolvedKeymap) -> Optional[str]:
+    """Warning for a keymap whose parent was not found; None if it has been given for that parent already."""
+    parent = keymap.missing_parent
+    if parent is None or parent in _warned_parents:
+        return None
+    _warned_parents.add(parent)
+    return (f"WebStorm keymap {keymap_file}: parent keymap '{parent}' not found, using only its own "
+            f"shortcuts (export '{parent}' to a directory in WEBSTORM_KEYMAP_PATH to include the inherited ones)")
+
+def leaf_keymaps(keymap_files: Iterable[Path]) -> List[Path]:
+    """Drop keymaps that are the parent of another one in the list (they are resolved through it)."""
+    headers = {path: read_keymap_header(path) for path in keymap_files}
+    parents = {parent for _, parent in headers.values() if parent}
+    return [path for path, (name, _) in headers.items() if name is not None and name not in parents]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Report what each key event costs Karabiner-Elements to dispatch.
+
+Every manipulator of the profile is indexed by its from.key_code (or the
+keys of from.simultaneous) and the modifier states it accepts. For each
+key the report shows how many manipulators are scanned before one matches,
+over all 1024 physical modifier states. It lists manipulators that an
+earlier one shadows, which can never fire, and conditions repeated across
+manipulators.
+
+Usage:
+    python scripts/analyze-karabiner.py [--config FILE] [--profile NAME] [--top N] [--json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.karabiner import load_profile_rules
+from keyboard_config.manipulators import (ManipulatorIndex, describe_condition, find_shadowed, key_costs,
+                                          repeated_conditions)
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', type=Path, help='karabiner.json (default: configs/karabiner/karabiner.json)')
+    parser.add_argument('--profile', help='Profile name (default: the selected profile)')
+    parser.add_argument('--top', type=int, default=20, help='Keys to list, costliest first (0 for all)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    return parser.parse_args()
+
+def main():
+    """Main script execution."""
+    args = parse_args()
+    project_root = Path(__file__).resolve().parent.parent
+    config_file = args.config or project_root.parent / 'configs' / 'karabiner' / 'karabiner.json'
+
+    try:
+        profile, rules = load_profile_rules(config_file, args.profile)
+        index = ManipulatorIndex.from_rules(rules)
+        costs = key_costs(index)
+        shadowed = find_shadowed(index)
+        repeated = repeated_conditions(index.manipulators)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    listed = costs[:args.top] if args.top > 0 else costs
+    if args.json:
+        report = {
+            'profile': profile,
+            'rules': len(rules),
+            'manipulators': len(index.manipulators),
+            'keys': [cost._asdict() for cost in listed],
+            'shadowed': [{'manipulator': later.describe(), 'shadowed_by': earlier.describe()}
+                         for later, earlier in shadowed],
+            'repeated_conditions': [{'condition': json.loads(item.condition),
+                                     'manipulators': [manipulator.index for manipulator in item.manipulators],
+                                     'duplicated_within': [manipulator.index
+                                                           for manipulator in item.duplicated_within]}
+                                    for item in repeated],
+        }
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    print(f"Profile '{profile}': {len(index.manipulators)} manipulators in {len(rules)} rules, "
+          f"{len(costs)} trigger keys")
+    print()
+    print(f"{'Key':<24} {'Cands':>5} {'Cond':>4} {'Chain':>6} {'Worst':>5} {'Plain':>5} {'Mean':>7} {'Unmatched':>9}")
+    for cost in listed:
+        print(f"{cost.trigger[:24]:<24} {cost.candidates:>5} {cost.conditional:>4} "
+              f"{cost.mean_candidate_scans:>6.1f} {cost.worst_candidate_scans:>5} {cost.plain_scans:>5} "
+              f"{cost.mean_scans:>7.1f} {cost.unmatched_states:>9}")
+    print("Chain/Worst: candidates of the key scanned; Plain/Mean: manipulators scanned in profile order")
+
+    print()
+    print(f"Shadowed manipulators: {len(shadowed)}")
+    for later, earlier in shadowed:
+        print(f"  {later.describe()}  <-  {earlier.describe()}")
+
+    print()
+    print(f"Repeated conditions: {len(repeated)}")
+    for item in repeated:
+        rules_used = ', '.join(dict.fromkeys(manipulator.rule for manipulator in item.manipulators))
+        line = f"  {len(item.manipulators):>4}x {describe_condition(item.condition)}  ({rules_used})"
+        if item.duplicated_within:
+            line += f"; listed twice in {len(item.duplicated_within)} manipulator(s)"
+        print(line)
+
+if __name__ == '__main__':
+    main()
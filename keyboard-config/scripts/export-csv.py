@@ -9,255 +9,45 @@ This script converts YAML binding data to CSV format, making it easy to:
 - Generate reports and statistics
 """
 
-import yaml
-import csv
+import argparse
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
 
-def load_yaml_data(file_path: Path) -> Dict[str, Any]:
-    """Load and parse YAML data from file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.cache import BindingCache, default_cache_dir
+from keyboard_config.corpus import discover_yaml_files, load_binding_set
+from keyboard_config.csv_export import documented_action_ids, export_bindings, export_keymap
+from keyboard_config.metrics import Metrics, add_arguments, instrumented
+from keyboard_config.sqlite_export import export_sqlite
+from keyboard_config.webstorm import keymap_cache_file, leaf_keymaps, missing_parent_warning, resolve_keymap
 
-def flatten_binding_data(data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Convert hierarchical YAML binding data to flat CSV-ready format."""
-    flat_data = []
-    
-    navigation_type = data['navigation_type']
-    keys = ', '.join(data['keys'])
-    
-    for binding_key, binding in data['bindings'].items():
-        details = binding['details']
-        
-        row = {
-            'navigation_type': navigation_type,
-            'keys': keys,
-            'binding_key': binding_key,
-            'modifier': binding_key.replace('_', ' ').title() if binding_key != 'none' else 'None',
-            'keystroke': binding['keystroke'],
-            'system': binding['system'],
-            'status': binding['status'],
-            'category': binding['category'],
-            'action': binding['action'],
-            'ide_action_id': details['ide_action_id'],
-            'karabiner_code': details['karabiner_code'],
-            'ideavim_command': details['ideavim_command'],
-            'config_reference': details['config_reference'],
-            'notes': details.get('notes', ''),  # Optional field
-            # New optional fields
-            'timing_ms': details.get('timing_ms', ''),
-            'sequence_type': details.get('sequence_type', ''),
-            'chord_keys': ', '.join(details.get('chord_keys', [])) if details.get('chord_keys') else '',
-            'press_type': details.get('press_type', '')
-        }
-        
-        flat_data.append(row)
-    
-    return flat_data
-
-def generate_combined_csv(h_data: Dict[str, Any], v_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Combine horizontal and vertical binding data into single CSV dataset."""
-    combined_data = []
-    
-    # Add horizontal navigation data
-    combined_data.extend(flatten_binding_data(h_data))
-    
-    # Add vertical navigation data  
-    combined_data.extend(flatten_binding_data(v_data))
-    
-    return combined_data
-
-def generate_multi_config_csv(all_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Combine multiple configuration files into single CSV dataset."""
-    combined_data = []
-    
-    for data in all_data:
-        combined_data.extend(flatten_binding_data(data))
-    
-    return combined_data
-
-def write_csv(data: List[Dict[str, Any]], output_file: Path, delimiter: str = ','):
-    """Write data to CSV file with proper formatting."""
-    if not data:
-        raise ValueError("No data to write")
-    
-    # Define column order for consistent output
-    fieldnames = [
-        'navigation_type',
-        'keys', 
-        'binding_key',
-        'modifier',
-        'keystroke',
-        'system',
-        'status',
-        'category',
-        'action',
-        'ide_action_id',
-        'karabiner_code',
-        'ideavim_command',
-        'config_reference',
-        'notes',
-        # New optional fields
-        'timing_ms',
-        'sequence_type',
-        'chord_keys',
-        'press_type'
-    ]
-    
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=delimiter)
-        
-        # Write header
-        writer.writeheader()
-        
-        # Write data rows
-        for row in data:
-            writer.writerow(row)
-
-def generate_summary_csv(data: List[Dict[str, Any]], output_file: Path):
-    """Generate summary statistics CSV."""
-    summary_data = []
-    
-    # Count by status
-    status_counts = {}
-    system_counts = {}
-    category_counts = {}
-    sequence_type_counts = {}
-    timing_counts = {}
-    press_type_counts = {}
-    
-    for row in data:
-        status = row['status']
-        system = row['system'] 
-        category = row['category']
-        sequence_type = row['sequence_type']
-        timing_ms = row['timing_ms']
-        press_type = row['press_type']
-        
-        status_counts[status] = status_counts.get(status, 0) + 1
-        system_counts[system] = system_counts.get(system, 0) + 1
-        category_counts[category] = category_counts.get(category, 0) + 1
-        
-        if sequence_type:
-            sequence_type_counts[sequence_type] = sequence_type_counts.get(sequence_type, 0) + 1
-        if timing_ms:
-            timing_counts[timing_ms] = timing_counts.get(timing_ms, 0) + 1
-        if press_type:
-            press_type_counts[press_type] = press_type_counts.get(press_type, 0) + 1
-    
-    total = len(data)
-    
-    # Status summary
-    for status, count in sorted(status_counts.items()):
-        summary_data.append({
-            'metric': 'Status',
-            'value': status,
-            'count': count,
-            'percentage': round(count / total * 100, 1)
-        })
-    
-    # System summary
-    for system, count in sorted(system_counts.items()):
-        summary_data.append({
-            'metric': 'System',
-            'value': system,
-            'count': count,
-            'percentage': round(count / total * 100, 1)
-        })
-    
-    # Category summary
-    for category, count in sorted(category_counts.items()):
-        summary_data.append({
-            'metric': 'Category',
-            'value': category,
-            'count': count,
-            'percentage': round(count / total * 100, 1)
-        })
-    
-    # Sequence type summary
-    if sequence_type_counts:
-        for seq_type, count in sorted(sequence_type_counts.items()):
-            summary_data.append({
-                'metric': 'Sequence Type',
-                'value': seq_type,
-                'count': count,
-                'percentage': round(count / total * 100, 1)
-            })
-    
-    # Timing summary
-    if timing_counts:
-        for timing, count in sorted(timing_counts.items()):
-            summary_data.append({
-                'metric': 'Timing (ms)',
-                'value': str(timing),
-                'count': count,
-                'percentage': round(count / total * 100, 1)
-            })
-    
-    # Press type summary
-    if press_type_counts:
-        for press_type, count in sorted(press_type_counts.items()):
-            summary_data.append({
-                'metric': 'Press Type',
-                'value': press_type,
-                'count': count,
-                'percentage': round(count / total * 100, 1)
-            })
-    
-    # Write summary CSV
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['metric', 'value', 'count', 'percentage']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for row in summary_data:
-            writer.writerow(row)
-
-def generate_pivot_ready_csv(data: List[Dict[str, Any]], output_file: Path):
-    """Generate CSV optimized for pivot table analysis."""
-    pivot_data = []
-    
-    for row in data:
-        # Create separate rows for easier pivot analysis
-        pivot_row = {
-            'Navigation': row['navigation_type'].title(),
-            'Keys': row['keys'],
-            'Binding': row['modifier'],
-            'System': row['system'],
-            'Status': row['status'].title(),
-            'Category': row['category'].title(),
-            'HasIdeAction': 'Yes' if row['ide_action_id'] != 'Custom' and row['ide_action_id'] != '-' else 'No',
-            'HasKarabiner': 'Yes' if row['karabiner_code'] != '-' else 'No', 
-            'HasIdeaVim': 'Yes' if row['ideavim_command'] != '-' else 'No',
-            'IsImplemented': 'Yes' if row['status'] == 'implemented' else 'No',
-            'ConfigFile': row['config_reference'].split(':')[0] if ':' in row['config_reference'] else row['config_reference']
-        }
-        
-        pivot_data.append(pivot_row)
-    
-    # Write pivot CSV
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = list(pivot_data[0].keys()) if pivot_data else []
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for row in pivot_data:
-            writer.writerow(row)
-
-def discover_yaml_files(data_dir: Path) -> List[Path]:
-    """Discover all YAML configuration files in the data directory."""
-    yaml_files = []
-    for file_path in data_dir.glob('*.yaml'):
-        # Skip schema files
-        if 'schema' not in file_path.name.lower():
-            yaml_files.append(file_path)
-    return sorted(yaml_files)
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-parse every YAML file and bypass generated/.cache')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes for parsing YAML (default: one per CPU; '
+                             '1 parses serially)')
+    parser.add_argument('--sqlite', nargs='?', type=Path, const=True,
+                        metavar='FILE', help='Also export to a SQLite database, updating only changed '
+                                             'files (default: generated/bindings.sqlite)')
+    add_arguments(parser)
+    return parser.parse_args()
 
 def main():
     """Main script execution."""
+    args = parse_args()
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
+    
+    metrics = Metrics('export-csv')
+    with instrumented(metrics, args):
+        export(args, project_root, metrics)
+    print(f"Timing: {metrics.summary()}")
+
+def export(args: argparse.Namespace, project_root: Path, metrics: Metrics):
+    """Load the corpus and write every CSV export, recording phase timings."""
     data_dir = project_root / 'data'
     
     # Output directory
@@ -269,60 +59,69 @@ def main():
     summary_csv = output_dir / 'bindings-summary.csv'
     pivot_csv = output_dir / 'bindings-pivot.csv'
     tsv_file = output_dir / 'bindings.tsv'  # Tab-separated for different tools
+    keymap_csv = output_dir / 'webstorm-keymap.csv'
+    sqlite_file = output_dir / 'bindings.sqlite' if args.sqlite is True else args.sqlite
+    keymap_dir = project_root.parent / 'configs' / 'webstorm'
     
     # Discover all YAML files
-    yaml_files = discover_yaml_files(data_dir)
+    with metrics.phase('discover'):
+        yaml_files = discover_yaml_files(data_dir)
     
     if not yaml_files:
         print(f"Error: No YAML configuration files found in {data_dir}", file=sys.stderr)
         sys.exit(1)
     
     try:
-        # Load all YAML data
-        all_data = []
-        total_bindings = 0
-        
-        for yaml_file in yaml_files:
-            print(f"Loading {yaml_file}...")
-            data = load_yaml_data(yaml_file)
-            all_data.append(data)
-            total_bindings += len(data['bindings'])
-        
-        # Generate combined dataset
-        print("Processing binding data...")
-        combined_data = generate_multi_config_csv(all_data)
-        
-        # Generate main CSV
-        print(f"Generating {main_csv}...")
-        write_csv(combined_data, main_csv)
-        
-        # Generate TSV version
-        print(f"Generating {tsv_file}...")
-        write_csv(combined_data, tsv_file, delimiter='\t')
-        
-        # Generate summary CSV
-        print(f"Generating {summary_csv}...")
-        generate_summary_csv(combined_data, summary_csv)
-        
-        # Generate pivot-ready CSV
-        print(f"Generating {pivot_csv}...")
-        generate_pivot_ready_csv(combined_data, pivot_csv)
+        # Load all YAML data, reusing cached parses of unchanged files
+        cache = BindingCache(default_cache_dir(project_root), enabled=not args.no_cache)
+        binding_set = load_binding_set(yaml_files, cache, args.jobs, metrics)
+        
+        # Flatten each binding once and stream it to every output; rows are
+        # counted into the summary in the same pass, so this is one 'write' phase
+        print(f"Generating CSV, TSV, summary and pivot exports in {output_dir}...")
+        with metrics.phase('write'):
+            counts = export_bindings(binding_set.configs, main_csv, tsv_file, summary_csv, pivot_csv)
+        outputs = [main_csv, tsv_file, summary_csv, pivot_csv]
+        
+        # WebStorm keymaps, merged with their parent keymaps
+        keymap_cache = keymap_cache_file(default_cache_dir(project_root)) if cache.enabled else None
+        with metrics.phase('load'):
+            keymap_files = leaf_keymaps(sorted(keymap_dir.glob('*.xml')))
+            keymaps = [resolve_keymap(keymap_file, keymap_cache) for keymap_file in keymap_files]
+        for keymap_file, keymap in zip(keymap_files, keymaps):
+            warning = missing_parent_warning(keymap_file, keymap)
+            if warning:
+                print(f"Warning: {warning}", file=sys.stderr)
+        keymap_rows = None
+        if keymaps:
+            with metrics.phase('write'):
+                keymap_rows = export_keymap(keymaps, keymap_csv, documented_action_ids(binding_set))
+            outputs.append(keymap_csv)
+        metrics.count('bytes_written', sum(output.stat().st_size for output in outputs))
+        
+        sqlite_stats = None
+        if sqlite_file:
+            with metrics.phase('write'):
+                sqlite_stats = export_sqlite(binding_set.configs, sqlite_file,
+                                             [cache.digest(config.source) for config in binding_set.configs])
         
         print("\nExport Summary:")
-        print(f"  Main CSV: {main_csv} ({len(combined_data)} rows)")
-        print(f"  TSV: {tsv_file} ({len(combined_data)} rows)")
+        print(f"  Main CSV: {main_csv} ({counts.total} rows)")
+        print(f"  TSV: {tsv_file} ({counts.total} rows)")
         print(f"  Summary: {summary_csv}")
         print(f"  Pivot: {pivot_csv}")
-        print(f"  Total bindings: {len(combined_data)}")
+        if keymap_rows is not None:
+            print(f"  WebStorm keymap: {keymap_csv} ({keymap_rows} rows)")
+        if sqlite_stats is not None:
+            print(f"  SQLite: {sqlite_file} ({sqlite_stats.files_written} files written, "
+                  f"{sqlite_stats.files_unchanged} unchanged, {sqlite_stats.files_removed} removed)")
+            if not sqlite_stats.full_text:
+                print("    SQLite was built without FTS5; bindings_fts was not created")
+        print(f"  Total bindings: {counts.total}")
         
         # Show quick stats
-        status_counts = {}
-        for row in combined_data:
-            status = row['status']
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
         print(f"  Status breakdown:")
-        for status, count in sorted(status_counts.items()):
+        for status, count in sorted(counts['status'].items()):
             print(f"    {status}: {count}")
         
     except Exception as e:
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Rewrite karabiner.json so key events scan fewer manipulators.
+
+Dead (shadowed or self-contradicting) manipulators are removed, repeated
+conditions merged, and manipulators that never compete for an event are
+reordered so frequent trigger keys come first. The rewrite is only written
+when replaying every trigger key in every modifier state and condition
+environment gives the same outcome as the original. The proof report is
+written next to it.
+
+Usage:
+    python scripts/optimize-karabiner.py [--config FILE] [--profile NAME] [--output FILE]
+                                         [--report FILE] [--frequencies FILE] [--dry-run]
+
+--frequencies takes a JSON object of key_code -> press count (default:
+English letter frequencies plus common editing keys).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.karabiner import select_profile
+from keyboard_config.karabiner_optimizer import format_report, optimize_rules, verify_equivalent
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', type=Path, help='karabiner.json (default: configs/karabiner/karabiner.json)')
+    parser.add_argument('--profile', help='Profile name (default: the selected profile)')
+    parser.add_argument('--output', type=Path, help='Rewritten config (default: karabiner.optimized.json beside it)')
+    parser.add_argument('--report', type=Path, help='Proof report (default: the output with .proof.md)')
+    parser.add_argument('--frequencies', type=Path, help='JSON object of key_code -> press count')
+    parser.add_argument('--dry-run', action='store_true', help='Print the report and write nothing')
+    return parser.parse_args()
+
+def main():
+    """Main script execution."""
+    args = parse_args()
+    project_root = Path(__file__).resolve().parent.parent
+    config_file = args.config or project_root.parent / 'configs' / 'karabiner' / 'karabiner.json'
+    output_file = args.output or config_file.with_name('karabiner.optimized.json')
+    report_file = args.report or output_file.with_suffix('.proof.md')
+
+    try:
+        with open(config_file, 'r') as f:
+            data = json.load(f)
+        profile = select_profile(data, args.profile)
+        frequencies = None
+        if args.frequencies:
+            with open(args.frequencies, 'r') as f:
+                frequencies = {key: float(count) for key, count in json.load(f).items()}
+        rules = profile.get('complex_modifications', {}).get('rules', [])
+        optimization = optimize_rules(rules, frequencies)
+        proof = verify_equivalent(rules, optimization.rules)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    report = format_report(optimization, proof, config_file.name, profile.get('name', ''))
+    if args.dry_run or not proof.equivalent:
+        print(report, end='', file=sys.stdout if proof.equivalent else sys.stderr)
+        if not proof.equivalent:
+            print("Rewrite not proven equivalent; nothing written", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    profile['complex_modifications']['rules'] = optimization.rules
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write(report)
+    print(f"Removed {len(optimization.removed)} manipulators, moved {optimization.moved_rules} rules; "
+          f"expected scans {optimization.scans_before:.1f} -> {optimization.scans_after:.1f}")
+    print(f"Proved equivalent over {proof.events} events")
+    print(f"Wrote {output_file} and {report_file}")
+
+if __name__ == '__main__':
+    main()
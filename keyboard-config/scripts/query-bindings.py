@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Look up keyboard bindings by chord, IDE action id, command or action words.
+
+Examples:
+    python scripts/query-bindings.py --chord ⌥⌘J
+    python scripts/query-bindings.py --action-id EditorPreviousWord
+    python scripts/query-bindings.py --command '<Leader>h' --system I
+    python scripts/query-bindings.py --search 'scroll page' --status planned --json
+
+The index is kept in generated/.cache and rebuilt only when a data file
+changes, so repeated lookups do not parse any YAML.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.query import filter_bindings, load_index
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    lookup = parser.add_mutually_exclusive_group(required=True)
+    lookup.add_argument('--chord', help="Chord such as '⌥⌘J', 'alt+cmd+j' or 'meta alt J'")
+    lookup.add_argument('--action-id', help='WebStorm/IntelliJ action id, e.g. EditorPreviousWord')
+    lookup.add_argument('--command', help='Karabiner code or IdeaVim command, e.g. shift+h or <Leader>h')
+    lookup.add_argument('--search', help='Words that must all appear in the action')
+    parser.add_argument('--system', help="Only bindings handled by this system (I, W or K)")
+    parser.add_argument('--status', help='Only bindings with this status')
+    parser.add_argument('--json', action='store_true', help='Print matches as a JSON list of rows')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index even if no file changed')
+    return parser.parse_args()
+
+def main():
+    """Main script execution."""
+    args = parse_args()
+    project_root = Path(__file__).resolve().parent.parent
+
+    try:
+        index = load_index(project_root, rebuild=args.rebuild)
+        if args.chord:
+            matches = index.by_chord(args.chord)
+        elif args.action_id:
+            matches = index.by_action_id(args.action_id)
+        elif args.command:
+            matches = index.by_command(args.command)
+        else:
+            matches = index.search(args.search)
+        matches = filter_bindings(matches, args.system, args.status)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        json.dump([binding.as_row() for binding in matches], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    for binding in matches:
+        print(f"{binding.keystroke:<28} {binding.system:<6} {binding.status:<16} {binding.action}")
+        print(f"  {Path(binding.source).name}: {binding.binding_key}, ide_action_id={binding.ide_action_id}")
+    if not matches:
+        print("No matching bindings")
+
+if __name__ == '__main__':
+    main()
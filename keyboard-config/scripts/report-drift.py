@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Report drift between hjkl-actionid-mapping.yaml and the YAML binding data.
+
+Every modifier combination of the mapping's *_navigation sections is joined
+with the data file of the same navigation type, one row per key of each
+pair. Rows are written as CSV or JSON. By default only the rows that are
+not a match are written.
+
+Usage:
+    python scripts/report-drift.py [--format csv|json] [--output FILE] [--all] [--check]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.cache import BindingCache, default_cache_dir
+from keyboard_config.corpus import discover_yaml_files, load_corpus
+from keyboard_config.drift import (count_statuses, data_action_ids, load_action_mapping, reconcile,
+                                   write_drift_csv, write_drift_json)
+from keyboard_config.model import BindingSet
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mapping', type=Path, help='Mapping file (default: hjkl-actionid-mapping.yaml)')
+    parser.add_argument('--format', choices=('csv', 'json'),
+                        help="Output format (default: from the --output suffix, else csv)")
+    parser.add_argument('--output', type=Path, help='Write the report here instead of stdout')
+    parser.add_argument('--all', action='store_true', help='Include matching rows')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 when anything drifted')
+    return parser.parse_args()
+
+def main():
+    """Main script execution."""
+    args = parse_args()
+    project_root = Path(__file__).resolve().parent.parent
+    mapping_file = args.mapping or project_root / 'hjkl-actionid-mapping.yaml'
+    output_format = args.format or ('json' if args.output and args.output.suffix == '.json' else 'csv')
+
+    try:
+        mapping = load_action_mapping(mapping_file)
+        cache = BindingCache(default_cache_dir(project_root))
+        loaded = load_corpus(discover_yaml_files(project_root / 'data'), cache)
+        cache.save()
+        binding_set = BindingSet.from_documents((item.path, item.data) for item in loaded)
+        data, keys = data_action_ids(binding_set.configs, {navigation_type for navigation_type, _ in mapping})
+        rows = reconcile(mapping, data, keys)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    counts = count_statuses(rows)
+    report = rows if args.all else [row for row in rows if row.status != 'match']
+    write = write_drift_json if output_format == 'json' else write_drift_csv
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            write(report, f)
+    else:
+        write(report, sys.stdout)
+
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"Compared {len(rows)} keys: {summary}", file=sys.stderr)
+    if args.check and any(row.status != 'match' for row in rows):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Replay recorded key events through karabiner.json without a Mac.
+
+The event file has one '<time_ms> down|up <key_code>' line per event (and
+'<time_ms> app <bundle_identifier>' to switch the frontmost application).
+The events Karabiner-Elements would post are written one per line as
+'<time_ms> <kind> <value> [modifiers]'. Diffing the output of two configs
+shows what a change does to the same typing.
+
+EVENTS may also be a binary column file, which loads much faster than
+text; --save-columns FILE converts the events read into one.
+
+Usage:
+    python scripts/simulate-karabiner.py EVENTS [--config FILE] [--profile NAME]
+        [--output FILE] [--variable NAME=VALUE ...] [--save-columns FILE] [--stats]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.karabiner import select_profile
+from keyboard_config.simulator import (COLUMNS_MAGIC, Simulator, event_columns, parse_events, read_event_columns,
+                                       write_event_columns, write_events)
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('events', help="Event file ('-' for stdin)")
+    parser.add_argument('--config', type=Path, help='karabiner.json (default: configs/karabiner/karabiner.json)')
+    parser.add_argument('--profile', help='Profile name (default: the selected profile)')
+    parser.add_argument('--output', type=Path, help='Write posted events here instead of stdout')
+    parser.add_argument('--variable', action='append', default=[], metavar='NAME=VALUE',
+                        help='Initial variable value (JSON value, e.g. mode=1); repeatable')
+    parser.add_argument('--save-columns', type=Path, metavar='FILE',
+                        help='Also write the input events as a binary column file')
+    parser.add_argument('--stats', action='store_true', help='Print event counts and replay speed to stderr')
+    return parser.parse_args()
+
+def parse_variable(text: str):
+    name, _, value = text.partition('=')
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+def main():
+    """Main script execution."""
+    args = parse_args()
+    project_root = Path(__file__).resolve().parent.parent
+    config_file = args.config or project_root.parent / 'configs' / 'karabiner' / 'karabiner.json'
+
+    try:
+        with open(config_file, 'r') as f:
+            simulator = Simulator.from_profile(select_profile(json.load(f), args.profile))
+        simulator.variables.update(parse_variable(text) for text in args.variable)
+        started = time.perf_counter()
+        data = sys.stdin.buffer.read() if args.events == '-' else Path(args.events).read_bytes()
+        if data.startswith(COLUMNS_MAGIC):
+            input_events = read_event_columns(data)
+        else:
+            input_events = event_columns(parse_events(data.decode('utf-8').splitlines()))
+        parsed = time.perf_counter()
+        if args.save_columns:
+            with open(args.save_columns, 'wb') as f:
+                write_event_columns(input_events, f)
+        output = simulator.run(input_events)
+        replayed = time.perf_counter()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            write_events(output, f)
+    else:
+        write_events(output, sys.stdout)
+
+    if args.stats:
+        replay_seconds = replayed - parsed
+        rate = len(input_events.times) / replay_seconds if replay_seconds else 0.0
+        print(f"{len(input_events.times)} events in, {len(output)} out; parsed in {parsed - started:.3f}s, "
+              f"replayed in {replay_seconds:.3f}s ({rate:,.0f} events/s)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""Vim key notation parsing (keyboard_config.chords.parse_vim_keys)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from keyboard_config.chords import format_chord, parse_vim_keys
+
+@pytest.mark.parametrize('lhs, expected', [
+    ('<C-J>', 'ctrl+j'),
+    ('<C-j>', 'ctrl+j'),
+    ('<C-S-J>', 'ctrl+shift+j'),
+    ('<A-J>', 'alt+shift+j'),
+    ('<M-J>', 'alt+shift+j'),
+    ('<D-J>', 'cmd+shift+j'),
+    ('<A-j>', 'alt+j'),
+    ('J', 'shift+j'),
+])
+def test_vim_special_case(lhs, expected):
+    assert [format_chord(chord) for chord in parse_vim_keys(lhs)] == [expected]
@@ -0,0 +1,45 @@
+"""Parity of the libyaml and pure-Python YAML backends (keyboard_config.loader)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from keyboard_config.loader import LOADERS, check_backend_parity, load_yaml, load_yaml_file
+
+DATA_FILES = sorted(path for path in (PROJECT_ROOT / 'data').glob('*.yaml') if 'schema' not in path.name.lower())
+
+# Scalars YAML 1.1 resolves to bool, int, float or null that a 1.2 parser reads differently
+YAML_11_SCALARS = """\
+booleans: [yes, no, on, off, Yes, OFF, y, n]
+octal_like: [0755, 010, 08, 0o17]
+sexagesimal: [1:30, 190:20:30, 1:30.5]
+other: [0x1F, 1_000, .inf, -.Inf, ~, null, 2001-12-14]
+"""
+
+requires_libyaml = pytest.mark.skipif('libyaml' not in LOADERS, reason='PyYAML is built without libyaml')
+
+def test_data_files_found():
+    assert DATA_FILES
+
+@requires_libyaml
+@pytest.mark.parametrize('path', DATA_FILES, ids=lambda path: path.name)
+def test_data_file_parity(path):
+    assert load_yaml_file(path, 'libyaml') == load_yaml_file(path, 'python')
+    assert yaml.load(path.read_bytes(), Loader=yaml.CSafeLoader) == yaml.load(path.read_bytes(), Loader=yaml.SafeLoader)
+
+@requires_libyaml
+def test_check_backend_parity_reports_nothing():
+    assert check_backend_parity(DATA_FILES) == []
+
+@requires_libyaml
+def test_yaml_11_scalar_parity():
+    libyaml = load_yaml(YAML_11_SCALARS, 'libyaml')
+    python = load_yaml(YAML_11_SCALARS, 'python')
+    assert libyaml == python
+    assert libyaml['booleans'] == [True, False, True, False, True, False, 'y', 'n']
+    assert libyaml['octal_like'][:2] == [0o755, 8]
+    assert libyaml['sexagesimal'][:2] == [90, 685230]
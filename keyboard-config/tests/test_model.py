@@ -0,0 +1,27 @@
+"""Binding records (keyboard_config.model)."""
+
+import pickle
+import sys
+from dataclasses import fields
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from keyboard_config.corpus import discover_yaml_files
+from keyboard_config.loader import load_yaml_file
+from keyboard_config.model import Binding, BindingSet
+
+def load_bindings():
+    files = discover_yaml_files(PROJECT_ROOT / 'data')
+    binding_set = BindingSet.from_documents([(path, load_yaml_file(path)) for path in files])
+    return [binding for config in binding_set.configs for binding in config.bindings]
+
+def test_slots_follow_field_order():
+    assert Binding.__slots__ == tuple(field.name for field in fields(Binding))
+
+def test_as_tuple_rebuilds_binding():
+    bindings = load_bindings()
+    assert bindings
+    for binding in bindings:
+        assert Binding(*binding.as_tuple()) == binding
+        assert pickle.loads(pickle.dumps(binding)) == binding